@@ -0,0 +1,105 @@
+#!/bin/sh
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Send a signed reassignment request to hcloud-reassign-relay.
+# Nodes with Python can call 'hcloud-reassign-notify --relay' instead.
+#
+# Usage: inform_relay.sh <relay url> <node> <secret file> <section> <src|dest>
+# e.g. in keepalived.conf:
+#   notify_master "/usr/local/bin/inform_relay.sh http://10.0.0.1:8421 lb-01 /etc/hcloud-reassign/secret floating.web dest"
+
+RELAY_URL=$1
+NODE=$2
+SECRET_FILE=$3
+SECTION=$4
+DIRECTION=$5
+
+if [ -z "$RELAY_URL" ] || [ -z "$NODE" ] || [ -z "$SECRET_FILE" ] || [ -z "$SECTION" ] || [ -z "$DIRECTION" ];
+then
+  echo "Usage: $0 <relay url> <node> <secret file> <section> <src|dest>"
+  exit 2
+fi
+
+for BIN in curl openssl od;
+do
+  if ! command -v "$BIN" > /dev/null;
+  then
+    echo "ERROR: No $BIN detected!"
+    exit 2
+  fi
+done
+
+if [ ! -r "$SECRET_FILE" ];
+then
+  echo "ERROR: Cannot read the secret file $SECRET_FILE."
+  exit 2
+fi
+
+# Print bytes given as hex as printf octal escapes, printf is a shell builtin
+hex_escapes() {
+  REST=$1
+  while [ -n "$REST" ];
+  do
+    printf '\\%03o' $(( 0x$(printf '%.2s' "$REST") ))
+    REST=${REST#??}
+  done
+}
+
+# Print the 64 byte block of the key XORed with a pad byte as printf octal escapes
+key_block() {
+  REST=$KEY_HEX
+  I=0
+  while [ $I -lt 64 ];
+  do
+    BYTE=0
+    if [ -n "$REST" ];
+    then
+      BYTE=$(( 0x$(printf '%.2s' "$REST") ))
+      REST=${REST#??}
+    fi
+    printf '\\%03o' $(( BYTE ^ $1 ))
+    I=$(( I + 1 ))
+  done
+}
+
+# HMAC-SHA256 of stdin built from plain SHA-256, 'openssl dgst -hmac' would show the secret in the process list
+hmac_sha256() {
+  INNER=$( { printf "$(key_block 54)"; cat; } | openssl dgst -sha256 -binary | od -An -v -tx1 | tr -d ' \n')
+  { printf "$(key_block 92)"; printf "$(hex_escapes "$INNER")"; } | openssl dgst -sha256 | sed 's/^.* //'
+}
+
+# Print the secret: the first line that is not blank, without surrounding whitespace, as
+# hcloud_reassign.utils.signing.normalize_secret reads it
+read_secret() {
+  sed -n '/[^[:space:]]/{s/^[[:space:]]*//;s/[[:space:]]*$//;p;q;}' < "$SECRET_FILE" | tr -d '\n'
+}
+
+# The secret is only read from its file and piped, never passed as an argument
+KEY_HEX=$(read_secret | od -An -v -tx1 | tr -d ' \n')
+if [ ${#KEY_HEX} -gt 128 ];
+then
+  # Keys longer than the block size are hashed first
+  KEY_HEX=$(read_secret | openssl dgst -sha256 -binary | od -An -v -tx1 | tr -d ' \n')
+fi
+NONCE=$(od -An -N16 -tx1 /dev/urandom | tr -d ' \n')
+TIMESTAMP=$(date +%s)
+
+BODY=$(printf '{"node": "%s", "section": "%s", "direction": "%s", "timestamp": %s, "nonce": "%s"}' \
+  "$NODE" "$SECTION" "$DIRECTION" "$TIMESTAMP" "$NONCE")
+SIGNATURE=$(printf '%s' "$BODY" | hmac_sha256)
+
+ANSWER=$(curl --silent --max-time 60 \
+  -X POST \
+  -H "Content-Type: application/json" \
+  -H "X-Hcloud-Reassign-Signature: $SIGNATURE" \
+  --data "$BODY" \
+  "${RELAY_URL%/}/reassign")
+
+echo "$ANSWER"
+
+case "$ANSWER" in
+  *'"status": "success"'*|*'"status": "superseded"'*) exit 0 ;;
+  *) exit 2 ;;
+esac
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""HCloud Reassignment daemon.
+
+This script keeps a warm Hetzner Cloud client and resolved resources in memory.
+Reassignments are triggered over a Unix socket, see hcloud-reassign-notify.
+"""
+
+import signal
+import sys
+
+# Import ArgumentParser for command line based configuration
+from argparse import ArgumentParser
+
+# Import getpass for password/token
+from getpass import getpass
+
+try:
+    from ..utils.constants import DAEMON_REFRESH_INTERVAL, DAEMON_SOCKET_PATH, DEFAULT_WORKERS, EVENT_DEBOUNCE
+    from ..core.base import HcloudReassignIni
+    from ..core.telemetry import registry
+    from ..core.daemon import ReassignDaemon
+except ImportError as error:
+    print(error)
+    print("You might need to install hcloud-reassign.")
+    raise error
+
+
+def main():
+    """Call this function when this module is used as a script.
+
+    Returns
+    -------
+    status_code : int
+                  Return status code
+
+    """
+    parser = ArgumentParser(
+        prog="hcloud-reassignd", description="Keep a warm Hetzner Cloud client and reassign on socket commands."
+    )
+    parser.add_argument(
+        "-c", "--config", action="store", dest="config", required=True, help="Path to configuration file"
+    )
+    parser.add_argument(
+        "-t",
+        "--token",
+        action="store_true",
+        dest="token",
+        help="API token for manual use. If defined, the 'token' in the configuration file will be ignored.",
+    )
+    parser.add_argument(
+        "-s",
+        "--socket",
+        action="store",
+        dest="socket",
+        default=DAEMON_SOCKET_PATH,
+        help=f"Path of the Unix socket. Default: {DAEMON_SOCKET_PATH}",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        action="store",
+        type=int,
+        default=DEFAULT_WORKERS,
+        dest="workers",
+        help=f"Number of HTTPS connections kept open. Default: {DEFAULT_WORKERS}",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store",
+        type=float,
+        default=DAEMON_REFRESH_INTERVAL,
+        dest="refresh",
+        help=f"Seconds between refreshing resolved resources. Default: {DAEMON_REFRESH_INTERVAL}",
+    )
+
+    parser.add_argument(
+        "--debounce",
+        action="store",
+        type=float,
+        default=EVENT_DEBOUNCE,
+        dest="debounce",
+        help=f"Seconds a section waits for further commands before it is reassigned. Default: {EVENT_DEBOUNCE}",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        action="store",
+        type=int,
+        dest="metrics_port",
+        help="Serve reassignment and API latencies in the OpenMetrics text format on this TCP port.",
+    )
+
+    cli_args = parser.parse_args()
+
+    token = None
+    if cli_args.token:
+        token = getpass(prompt="Password or Token: ")
+
+    if cli_args.metrics_port is not None:
+        registry.serve(port=cli_args.metrics_port)
+
+    config = HcloudReassignIni(path=cli_args.config, api_token=token)
+    daemon = ReassignDaemon(
+        config=config,
+        socket_path=cli_args.socket,
+        workers=cli_args.workers,
+        refresh_interval=cli_args.refresh,
+        debounce=cli_args.debounce,
+    )
+
+    # Leave serve_forever on SIGTERM, so the socket gets removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,23 +9,41 @@ This script provides an easy-to-use command line api for the Hetzner HCloud modu
 You can easily reassign Hetzner Cloud network resources to different machines.
 """
 
+import json
+import os
 import sys
 
+# Import redirect_stdout to keep machine-readable output apart from messages
+from contextlib import nullcontext, redirect_stdout
+
 # Import ArgumentParser for command line based configuration
 from argparse import ArgumentParser
 
 # Import getpass for password/token
 from getpass import getpass
 
+# Import timers to measure startup time
+from time import perf_counter, process_time
+
+# Only import light modules here. The hcloud SDK gets loaded by
+# hcloud_reassign.core once a reassignment actually runs.
 try:
-    from ..utils.structures import hcloud_functions, status_message
-    from ..utils.constants import EnvironmentalInfo
-    from ..core.base import HcloudReassignIni
+    from ..utils.structures import status_message
+    from ..utils.constants import (
+        EnvironmentalInfo,
+        CONFIG_OPTION_DEADLINE,
+        DEFAULT_PROJECT_WORKERS,
+        DEFAULT_WORKERS,
+        REASSIGN_DEADLINE,
+    )
 except ImportError as error:
     print(error)
     print("You might need to install hcloud-reassign.")
     raise error
 
+# Formats of reassignment results
+OUTPUT_FORMATS = ("text", "ndjson", "json")
+
 
 def main():
     """Call this function when this module is used as a script.
@@ -40,7 +58,14 @@ def main():
     parser = ArgumentParser(
         prog="hcloud-reassign", description="Reassign Hetzner Cloud network resources to different machines."
     )
-    parser.add_argument("-c", "--config", action="store", dest="config", help="Path to configuration file")
+    parser.add_argument(
+        "-c",
+        "--config",
+        nargs="+",
+        action="store",
+        dest="config",
+        help="Path to configuration file. Give several files or a directory of '*.ini' files to reassign many projects.",
+    )
     parser.add_argument(
         "-t",
         "--token",
@@ -54,7 +79,15 @@ def main():
         nargs="*",
         action="store",
         dest="resource",
-        help="Resource to reassign. This matches the section name in the INI file.",
+        help="Resource to reassign. This matches the section name in the INI file, shell-style patterns like "
+        "'floating.web-*' select several sections.",
+    )
+    parser.add_argument(
+        "--tag",
+        nargs="+",
+        action="store",
+        dest="tags",
+        help="Reassign only sections carrying one of these tags in their 'tags' option.",
     )
     parser.add_argument(
         "-d",
@@ -74,6 +107,84 @@ def main():
         dest="destination",
         help="Destination to reassign, alternative to destination in INI file",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        action="store",
+        type=int,
+        default=DEFAULT_WORKERS,
+        dest="workers",
+        help=f"Number of resources reassigned at the same time. Use 1 for serial execution. Default: {DEFAULT_WORKERS}",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        action="store",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        dest="format",
+        help=(
+            "Output format of results. 'ndjson' writes one JSON record per resource as soon as it is done "
+            "and a summary record, 'json' one document at the end. Messages go to stderr. Default: text"
+        ),
+    )
+    parser.add_argument(
+        "--projects",
+        action="store",
+        type=int,
+        default=DEFAULT_PROJECT_WORKERS,
+        dest="projects",
+        help=f"Number of projects reassigned at the same time. Default: {DEFAULT_PROJECT_WORKERS}",
+    )
+    parser.add_argument(
+        "--deadline",
+        action="store",
+        type=float,
+        dest="deadline",
+        help=(
+            "Seconds a resource may take to reassign, it times out afterwards. 0 disables the deadline. "
+            f"Default: 'deadline' of the client section or {REASSIGN_DEADLINE}"
+        ),
+    )
+    moves = parser.add_mutually_exclusive_group()
+    moves.add_argument(
+        "--drain",
+        action="store",
+        dest="drain",
+        metavar="SERVER",
+        help="Move all floating IPs of a server to the peers with the fewest floating IPs.",
+    )
+    moves.add_argument(
+        "--rebalance",
+        action="store_true",
+        dest="rebalance",
+        help="Move floating IPs between peers until their numbers differ by at most one.",
+    )
+    parser.add_argument(
+        "--peers",
+        nargs="*",
+        action="store",
+        dest="peers",
+        help="Servers for --drain and --rebalance. Default: all sources and destinations in the INI file.",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        dest="plan",
+        help="Dry run. Print which resources would change and an estimate of API calls.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        dest="timings",
+        help="Print the CPU time needed to start and the time to load the Hetzner Cloud modules to stderr.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        action="store",
+        dest="metrics_file",
+        help="Write reassignment and API latencies to this file in the OpenMetrics text format.",
+    )
     parser.add_argument(
         "--version", action="store_true", dest="version", help="Display version and environment information."
     )
@@ -92,31 +203,252 @@ def main():
 
         return 0
 
+    if cli_args.timings:
+        # CPU time of this process includes interpreter start and imports
+        print(f"startup: {process_time() * 1000:.1f} ms", file=sys.stderr)
+
     token = None
     if cli_args.token:
         token = getpass(prompt="Password or Token: ")
 
     status = 0
 
+    if cli_args.config and (len(cli_args.config) > 1 or os.path.isdir(cli_args.config[0])):
+        if token or cli_args.drain or cli_args.rebalance or cli_args.source or cli_args.destination:
+            print("--token, --drain, --rebalance, --source and --destination need a single configuration file.")
+            return 2
+        return reassign_projects(cli_args=cli_args)
+
+    if cli_args.config:
+        cli_args.config = cli_args.config[0]
+
+    if cli_args.config and (cli_args.drain or cli_args.rebalance):
+        return move_floating_ips(cli_args=cli_args, token=token)
+
     if cli_args.config and not (cli_args.source or cli_args.destination):
+        import_begin = perf_counter()
+        from ..core.base import HcloudReassignIni
+        from ..core.executor import plan_resources, reassign_records
+
+        if cli_args.timings:
+            print(f"import: {(perf_counter() - import_begin) * 1000:.1f} ms", file=sys.stderr)
+
         config = HcloudReassignIni(path=cli_args.config, api_token=token)
+        if cli_args.deadline is not None:
+            config.client_section_dict[CONFIG_OPTION_DEADLINE] = cli_args.deadline
+
+        # Do all resources if neither --resource nor --tag is defined,
+        # else do the sections they select. Only selected sections are converted.
+        try:
+            resources = config.select(patterns=cli_args.resource, tags=cli_args.tags, strict=True)
+        except LookupError as err:
+            print(err)
+            return 2
 
-        # Do all resources if --resource is not defined
-        # else do resources defined in --resource
-        if cli_args.resource:
-            resources = cli_args.resource
+        if cli_args.plan:
+            print(plan_resources(config=config, resources=resources, direction=cli_args.machine).describe())
+            return status
+
+        # Reassign all resources at once, statuses are printed as they finish.
+        # Keep the worst status as return code.
+        writer = ResultWriter(output_format=cli_args.format)
+        with writer.messages():
+            for result in reassign_records(
+                config=config, resources=resources, direction=cli_args.machine, workers=cli_args.workers
+            ):
+                status = max(status, result.status)
+                writer.write(result)
+        writer.close(status)
+
+        if cli_args.metrics_file:
+            from ..core.telemetry import registry
+
+            registry.write_textfile(cli_args.metrics_file)
+
+    return status
+
+
+class ResultWriter:
+    """This class writes reassignment results as text, NDJSON or one JSON document."""
+
+    def __init__(self, output_format: str = "text", stream=None) -> None:
+        """Initialize a writer.
+
+        Parameters
+        ----------
+        output_format : str, optional
+                        One of OUTPUT_FORMATS.
+        stream : TextIO, optional
+                 Stream to write results to. Default: stdout
+        """
+        self.output_format = output_format
+        self.stream = stream or sys.stdout
+        self.records: list[dict] = []
+        self.counts: dict[str, int] = {}
+
+    def messages(self):
+        """Send messages printed while reassigning to stderr, unless the output is text."""
+        return nullcontext() if self.output_format == "text" else redirect_stdout(sys.stderr)
+
+    def write(self, result) -> None:
+        """Write the result of a section as soon as it is done.
+
+        Parameters
+        ----------
+        result : ResourceResult
+                 Result of a section, see hcloud_reassign.core.executor.
+        """
+        if result.section:
+            self.counts[status_message[result.status]] = self.counts.get(status_message[result.status], 0) + 1
+
+        if self.output_format == "ndjson":
+            self.stream.write(json.dumps(result.to_dict()) + "\n")
+            self.stream.flush()
+        elif self.output_format == "json":
+            self.records.append(result.to_dict())
+        elif result.section:
+            name = f"{result.project}/{result.section}" if result.project else result.section
+            print(f"{name}: {status_message[result.status]}", file=self.stream)
+
+    def close(self, status: int, projects=None) -> None:
+        """Write the summary.
+
+        Parameters
+        ----------
+        status : int
+                 Worst status of all sections, the exit code.
+        projects : FanoutReport, optional
+                   Report of many projects, see hcloud_reassign.core.fanout.
+        """
+        summary = {"status": status_message[status], "code": status, "resources": sum(self.counts.values())}
+        summary["statuses"] = self.counts
+        if projects is not None:
+            summary["projects"] = {name: status_message[project.status] for name, project in projects.projects.items()}
+
+        if self.output_format == "ndjson":
+            self.stream.write(json.dumps({"summary": summary}) + "\n")
+        elif self.output_format == "json":
+            self.stream.write(json.dumps({"results": self.records, "summary": summary}, indent=2) + "\n")
+        elif projects is not None:
+            print(projects.describe(), file=self.stream)
+        self.stream.flush()
+
+
+def reassign_projects(cli_args) -> int:
+    """Reassign resources of many projects, one configuration file each.
+
+    Parameters
+    ----------
+    cli_args : Namespace
+               Parsed command line arguments.
+
+    Returns
+    -------
+    status_code : int
+                  Worst status of all projects.
+    """
+    import_begin = perf_counter()
+    from ..core import fanout
+
+    if cli_args.timings:
+        print(f"import: {(perf_counter() - import_begin) * 1000:.1f} ms", file=sys.stderr)
+
+    try:
+        paths = fanout.config_paths(cli_args.config)
+    except FileNotFoundError as err:
+        print(err)
+        return 2
+
+    if cli_args.plan:
+        status = 0
+        for project, plan, error in fanout.plan_projects(
+            paths=paths,
+            direction=cli_args.machine,
+            resources=cli_args.resource,
+            tags=cli_args.tags,
+            projects=cli_args.projects,
+        ):
+            print(f"[{project}]")
+            if error is not None:
+                print(error)
+                status = 2
+            else:
+                print(plan.describe())
+        return status
+
+    report = fanout.FanoutReport()
+    writer = ResultWriter(output_format=cli_args.format)
+    with writer.messages():
+        for result in fanout.reassign_projects(
+            paths=paths,
+            direction=cli_args.machine,
+            resources=cli_args.resource,
+            tags=cli_args.tags,
+            workers=cli_args.workers,
+            projects=cli_args.projects,
+            deadline=cli_args.deadline,
+            report=report,
+        ):
+            writer.write(result)
+    writer.close(report.status, projects=report)
+
+    if cli_args.metrics_file:
+        from ..core.telemetry import registry
+
+        registry.write_textfile(cli_args.metrics_file)
+
+    return report.status
+
+
+def move_floating_ips(cli_args, token: str | None) -> int:
+    """Drain a server or rebalance floating IPs across servers.
+
+    Parameters
+    ----------
+    cli_args : Namespace
+               Parsed command line arguments.
+    token : str | None
+            API token given on the command line.
+
+    Returns
+    -------
+    status_code : int
+                  Worst status of all moves.
+    """
+    from ..core.base import HcloudReassignIni
+    from ..core.drain import DRAIN_SNAPSHOT_KINDS, apply_moves, configured_servers, plan_drain, plan_rebalance
+    from ..core.executor import make_shared_client
+    from ..core.snapshot import ProjectSnapshot
+
+    config = HcloudReassignIni(path=cli_args.config, api_token=token)
+    peers = cli_args.peers or configured_servers(config)
+    hclient = make_shared_client(config=config, workers=cli_args.workers)
+    snapshot = ProjectSnapshot(hclient=hclient, kinds=DRAIN_SNAPSHOT_KINDS).refresh()
+
+    try:
+        if cli_args.drain:
+            moves = plan_drain(snapshot=snapshot, server=cli_args.drain, peers=peers)
         else:
-            resources = config.resource_sections
+            moves = plan_rebalance(snapshot=snapshot, servers=peers)
+    except (LookupError, ValueError) as err:
+        print(err)
+        return 2
+
+    if cli_args.plan:
+        for move in moves:
+            print(move.describe())
+        print(f"API calls: {len(DRAIN_SNAPSHOT_KINDS)} lookups, {len(moves)} changes")
+        return 0
+
+    status = 0
+    for move, move_status in apply_moves(hclient=hclient, snapshot=snapshot, moves=moves, workers=cli_args.workers):
+        status = max(status, move_status)
+        print(f"{move.describe()}: {status_message[move_status]}")
 
-        # Iterate through all the resources
-        for resource in resources:
-            reassignment_function = hcloud_functions[config.resource_section_dict[resource]["type"]]
-            reassignment = reassignment_function(
-                section=config.resource_section_dict[resource], client=config.client_section_dict
-            )
-            status = reassignment.reassign(direction=cli_args.machine)
+    if cli_args.metrics_file:
+        from ..core.telemetry import registry
 
-            print(f"{resource}: {status_message[status]}")
+        registry.write_textfile(cli_args.metrics_file)
 
     return status
 
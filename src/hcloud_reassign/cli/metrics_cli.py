@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""HCloud metrics script.
+
+This script streams metrics of Hetzner Cloud servers as NDJSON, CSV or
+columnar binary frames. Servers are either named on the command line or
+taken from the source and destination of metrics enabled sections.
+"""
+
+import sys
+
+# Import ArgumentParser for command line based configuration
+from argparse import ArgumentParser
+
+# Import getpass for password/token
+from getpass import getpass
+
+# Only import light modules here. The hcloud SDK gets loaded once metrics are fetched.
+try:
+    from ..utils.constants import DEFAULT_WORKERS
+    from ..utils.structures import server_names
+except ImportError as error:
+    print(error)
+    print("You might need to install hcloud-reassign.")
+    raise error
+
+# Output formats, columnar frames are binary
+OUTPUT_FORMATS = ("ndjson", "csv", "columnar")
+
+
+def section_servers(config, resources: list[str] | None = None) -> list[str]:
+    """Get source and destination servers of resource sections.
+
+    Parameters
+    ----------
+    config : HcloudReassignIni
+             Parsed configuration file.
+    resources : list[str] | None, optional
+                Section names. Sections with 'metrics' enabled if omitted.
+
+    Returns
+    -------
+    list[str]: Server names without duplicates and gateway IP addresses.
+    """
+    if not resources:
+        resources = [name for name, section in config.resource_section_dict.items() if section.get("metrics")]
+
+    servers = []
+    for resource in resources:
+        section = config.resource_section_dict[resource]
+        for option in ("source", "destination"):
+            servers.extend(server_names(section.get(option)))
+
+    return list(dict.fromkeys(servers))
+
+
+def main():
+    """Call this function when this module is used as a script.
+
+    Returns
+    -------
+    status_code : int
+                  Return status code
+
+    """
+    parser = ArgumentParser(prog="hcloud-metrics", description="Stream metrics of Hetzner Cloud servers.")
+    parser.add_argument(
+        "-c", "--config", action="store", dest="config", required=True, help="Path to configuration file"
+    )
+    parser.add_argument(
+        "-t",
+        "--token",
+        action="store_true",
+        dest="token",
+        help="API token for manual use. If defined, the 'token' in the configuration file will be ignored.",
+    )
+    parser.add_argument(
+        "-r",
+        "--resource",
+        nargs="*",
+        action="store",
+        dest="resource",
+        help="Sections whose source and destination servers are queried. Default: sections with metrics=true",
+    )
+    parser.add_argument(
+        "-s", "--server", nargs="*", action="store", dest="server", help="Server names, instead of sections."
+    )
+    parser.add_argument(
+        "-m",
+        "--metric",
+        nargs="*",
+        action="store",
+        choices=["cpu", "disk", "network"],
+        default=["cpu"],
+        dest="metric",
+        help="Metric types to query. Default: cpu",
+    )
+    parser.add_argument("--start", action="store", dest="start", help="ISO8601 start time. Default: 30 minutes ago")
+    parser.add_argument("--end", action="store", dest="end", help="ISO8601 end time. Default: now")
+    parser.add_argument(
+        "--step", action="store", type=float, default=60, dest="step", help="Resolution in seconds. Default: 60"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        action="store",
+        choices=OUTPUT_FORMATS,
+        default="ndjson",
+        dest="format",
+        help="Output format. 'columnar' writes binary float64 frames for bulk loading. Default: ndjson",
+    )
+    parser.add_argument("-o", "--output", action="store", dest="output", help="Output file. Default: stdout")
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        dest="follow",
+        help="Keep polling every step and only write new samples.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        action="store",
+        type=int,
+        default=DEFAULT_WORKERS,
+        dest="workers",
+        help=f"Number of servers queried at the same time. Default: {DEFAULT_WORKERS}",
+    )
+
+    cli_args = parser.parse_args()
+
+    if bool(cli_args.start) != bool(cli_args.end):
+        parser.error("--start and --end must be given together")
+
+    token = None
+    if cli_args.token:
+        token = getpass(prompt="Password or Token: ")
+
+    from ..core.base import HcloudReassignIni
+    from ..monitor.collector import MetricsCollector
+    from ..monitor.export import writers
+
+    config = HcloudReassignIni(path=cli_args.config, api_token=token)
+    servers = cli_args.server or section_servers(config, cli_args.resource)
+    collector = MetricsCollector.from_config(config=config, workers=cli_args.workers)
+
+    if cli_args.follow:
+        results = collector.follow(servers, cli_args.metric, step=cli_args.step)
+    else:
+        interval = (cli_args.start, cli_args.end) if cli_args.start else "now"
+        results = collector.collect(servers, cli_args.metric, interval=interval, step=cli_args.step)
+
+    binary = cli_args.format == "columnar"
+    if cli_args.output:
+        stream = open(cli_args.output, "wb" if binary else "w", encoding=None if binary else "utf-8")
+    else:
+        stream = sys.stdout.buffer if binary else sys.stdout
+
+    status = 0
+    try:
+        writer = writers[cli_args.format](stream)
+        for result in results:
+            if not result.ok:
+                print(f"{result.server}: {result.error}", file=sys.stderr)
+                status = 2
+                continue
+            writer.write(result)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cli_args.output:
+            stream.close()
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""HCloud Reassignment notify client.
+
+This script sends a reassignment command to hcloud-reassignd, or with
+--relay a signed request to hcloud-reassign-relay on another host.
+It is small on purpose, so keepalived notify scripts can call it without
+loading the Hetzner Cloud modules.
+"""
+
+import json
+import socket
+import sys
+
+# Import urllib for requests to the relay
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+# Import ArgumentParser for command line based configuration
+from argparse import ArgumentParser
+
+try:
+    from ..utils.constants import (
+        DAEMON_ANSWER_SUPERSEDED,
+        DAEMON_COMMAND_REASSIGN,
+        DAEMON_SOCKET_PATH,
+        RELAY_PATH,
+        RELAY_SIGNATURE_HEADER,
+    )
+    from ..utils.signing import normalize_secret, relay_request
+except ImportError as error:
+    print(error)
+    print("You might need to install hcloud-reassign.")
+    raise error
+
+
+def send_command(command: str, socket_path: str = DAEMON_SOCKET_PATH, timeout: float | None = 60) -> str:
+    """Send a command line to the daemon and return its answer.
+
+    Parameters
+    ----------
+    command : str
+              Command line without the trailing newline.
+    socket_path : str, optional
+                  Path of the daemon's Unix socket.
+    timeout : float | None, optional
+              Seconds to wait for the answer.
+
+    Returns
+    -------
+    str: Answer line without the trailing newline.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(f"{command}\n".encode())
+        with sock.makefile("rb") as answer:
+            return answer.readline().decode("utf-8").strip()
+
+
+def send_relay(url: str, node: str, secret: bytes, resource: str, direction: str, timeout: float | None = 60) -> str:
+    """Send a signed reassignment request to the relay and return its answer.
+
+    Parameters
+    ----------
+    url : str
+          Base URL of the relay, e.g. 'http://10.0.0.1:8421'.
+    node : str
+           Name of this node in the nodes file of the relay.
+    secret : bytes
+             Secret of this node.
+    resource : str
+               Section to reassign.
+    direction : str
+                Either 'src' or 'dest'.
+    timeout : float | None, optional
+              Seconds to wait for the answer.
+
+    Returns
+    -------
+    str: Answer line like the one of the daemon.
+    """
+    body, signed = relay_request(node=node, section=resource, direction=direction, secret=secret)
+    request = Request(
+        url=url.rstrip("/") + RELAY_PATH,
+        data=body,
+        method="POST",
+        headers={"Content-Type": "application/json", RELAY_SIGNATURE_HEADER: signed},
+    )
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            answer = json.loads(response.read())
+    except HTTPError as err:
+        return f"error: {json.loads(err.read() or b'{}').get('error', err.reason)}"
+
+    return f"{answer['section']}: {answer['status']}"
+
+
+def main():
+    """Call this function when this module is used as a script.
+
+    Returns
+    -------
+    status_code : int
+                  Return status code
+
+    """
+    parser = ArgumentParser(prog="hcloud-reassign-notify", description="Trigger a reassignment in hcloud-reassignd.")
+    parser.add_argument("resource", help="Resource to reassign. This matches the section name in the INI file.")
+    parser.add_argument("direction", choices=["dest", "src"], help="Choose assignment destination.")
+    parser.add_argument(
+        "-s",
+        "--socket",
+        action="store",
+        dest="socket",
+        default=DAEMON_SOCKET_PATH,
+        help=f"Path of the Unix socket. Default: {DAEMON_SOCKET_PATH}",
+    )
+
+    parser.add_argument(
+        "--relay", action="store", dest="relay", help="URL of hcloud-reassign-relay, used instead of the socket."
+    )
+    parser.add_argument("--node", action="store", dest="node", help="Name of this node at the relay.")
+    parser.add_argument(
+        "--secret-file", action="store", dest="secret_file", help="Path to the file holding the secret of this node."
+    )
+
+    cli_args = parser.parse_args()
+
+    if cli_args.relay:
+        if not (cli_args.node and cli_args.secret_file):
+            parser.error("--relay needs --node and --secret-file.")
+        with open(cli_args.secret_file, "rb") as secret_file:
+            secret = normalize_secret(secret_file.read())
+        try:
+            answer = send_relay(cli_args.relay, cli_args.node, secret, cli_args.resource, cli_args.direction)
+        except (OSError, ValueError, KeyError) as err:
+            print(f"Cannot reach hcloud-reassign-relay at {cli_args.relay}: {err}")
+            return 2
+    else:
+        try:
+            answer = send_command(
+                f"{DAEMON_COMMAND_REASSIGN} {cli_args.resource} {cli_args.direction}", cli_args.socket
+            )
+        except OSError as err:
+            print(f"Cannot reach hcloud-reassignd at {cli_args.socket}: {err}")
+            return 2
+
+    print(answer)
+
+    # A superseded command was overtaken by a newer state, which is not a failure
+    return 0 if answer.endswith((": success", f": {DAEMON_ANSWER_SUPERSEDED}")) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
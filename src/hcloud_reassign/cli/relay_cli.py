@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""HCloud Reassignment relay.
+
+This script holds the API token on a trusted host and reassigns sections
+on HMAC-signed requests of nodes, which do not need the token themselves.
+"""
+
+import signal
+import sys
+
+# Import ArgumentParser for command line based configuration
+from argparse import ArgumentParser
+
+# Import getpass for password/token
+from getpass import getpass
+
+try:
+    from ..utils.constants import DAEMON_REFRESH_INTERVAL, DEFAULT_WORKERS, EVENT_DEBOUNCE, RELAY_DEFAULT_PORT
+    from ..core.base import HcloudReassignIni
+    from ..core.telemetry import registry
+    from ..core.daemon import ReassignDaemon
+    from ..core.relay import ReassignRelay, load_nodes
+except ImportError as error:
+    print(error)
+    print("You might need to install hcloud-reassign.")
+    raise error
+
+
+def main():
+    """Call this function when this module is used as a script.
+
+    Returns
+    -------
+    status_code : int
+                  Return status code
+
+    """
+    parser = ArgumentParser(
+        prog="hcloud-reassign-relay", description="Reassign resources on signed requests of nodes without API tokens."
+    )
+    parser.add_argument(
+        "-c", "--config", action="store", dest="config", required=True, help="Path to configuration file"
+    )
+    parser.add_argument(
+        "-t",
+        "--token",
+        action="store_true",
+        dest="token",
+        help="API token for manual use. If defined, the 'token' in the configuration file will be ignored.",
+    )
+    parser.add_argument(
+        "-n",
+        "--nodes",
+        action="store",
+        dest="nodes",
+        required=True,
+        help="Path to the INI file of nodes, their secrets and the sections they may reassign",
+    )
+    parser.add_argument(
+        "-a", "--address", action="store", dest="address", default="", help="Address to listen on. Default: all"
+    )
+    parser.add_argument(
+        "-p",
+        "--port",
+        action="store",
+        type=int,
+        default=RELAY_DEFAULT_PORT,
+        dest="port",
+        help=f"TCP port to listen on. Default: {RELAY_DEFAULT_PORT}",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        action="store",
+        type=int,
+        default=DEFAULT_WORKERS,
+        dest="workers",
+        help=f"Number of HTTPS connections kept open. Default: {DEFAULT_WORKERS}",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store",
+        type=float,
+        default=DAEMON_REFRESH_INTERVAL,
+        dest="refresh",
+        help=f"Seconds between refreshing resolved resources. Default: {DAEMON_REFRESH_INTERVAL}",
+    )
+    parser.add_argument(
+        "--debounce",
+        action="store",
+        type=float,
+        default=EVENT_DEBOUNCE,
+        dest="debounce",
+        help=f"Seconds a section waits for further requests before it is reassigned. Default: {EVENT_DEBOUNCE}",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        action="store",
+        type=int,
+        dest="metrics_port",
+        help="Serve reassignment and API latencies in the OpenMetrics text format on this TCP port.",
+    )
+
+    cli_args = parser.parse_args()
+
+    try:
+        nodes = load_nodes(cli_args.nodes)
+    except ValueError as err:
+        parser.error(str(err))
+    if not nodes:
+        parser.error(f"No nodes defined in {cli_args.nodes}.")
+
+    token = None
+    if cli_args.token:
+        token = getpass(prompt="Password or Token: ")
+
+    if cli_args.metrics_port is not None:
+        registry.serve(port=cli_args.metrics_port)
+
+    config = HcloudReassignIni(path=cli_args.config, api_token=token)
+    daemon = ReassignDaemon(
+        config=config, workers=cli_args.workers, refresh_interval=cli_args.refresh, debounce=cli_args.debounce
+    )
+    daemon.start_refresh()
+    server = ReassignRelay(daemon=daemon, nodes=nodes).serve(port=cli_args.port, address=cli_args.address)
+
+    # Leave serve_forever on SIGTERM
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""HCloud Reassignment watch script.
+
+This script polls metrics of the source servers of sections and reassigns
+sections to their destination as soon as a watch rule is breached.
+"""
+
+import signal
+import sys
+
+# Import ArgumentParser for command line based configuration
+from argparse import ArgumentParser
+
+# Import getpass for password/token
+from getpass import getpass
+
+# Import chain to report reassignments still running after a single poll
+from itertools import chain
+
+try:
+    from ..utils.constants import DEFAULT_WORKERS, WATCH_DEFAULT_INTERVAL, WATCH_DEFAULT_STEP
+    from ..utils.structures import status_message
+    from ..core.base import HcloudReassignIni
+    from ..core.telemetry import registry
+    from ..monitor.watch import Watcher, parse_rules
+except ImportError as error:
+    print(error)
+    print("You might need to install hcloud-reassign.")
+    raise error
+
+
+def main():
+    """Call this function when this module is used as a script.
+
+    Returns
+    -------
+    status_code : int
+                  Return status code
+
+    """
+    parser = ArgumentParser(
+        prog="hcloud-reassign-watch", description="Reassign resources when metrics of their source degrade."
+    )
+    parser.add_argument(
+        "-c", "--config", action="store", dest="config", required=True, help="Path to configuration file"
+    )
+    parser.add_argument(
+        "-t",
+        "--token",
+        action="store_true",
+        dest="token",
+        help="API token for manual use. If defined, the 'token' in the configuration file will be ignored.",
+    )
+    parser.add_argument(
+        "-r",
+        "--resource",
+        nargs="*",
+        action="store",
+        dest="resource",
+        help="Resources to watch. This matches the section name in the INI file.",
+    )
+    parser.add_argument(
+        "--rule",
+        action="append",
+        dest="rule",
+        help="Rule like 'cpu > 95 for 3', replaces the 'watch' options of the INI file. Can be repeated.",
+    )
+    parser.add_argument(
+        "--interval",
+        action="store",
+        type=float,
+        default=WATCH_DEFAULT_INTERVAL,
+        dest="interval",
+        help=f"Seconds between two polls of a server. Default: {WATCH_DEFAULT_INTERVAL}",
+    )
+    parser.add_argument(
+        "--step",
+        action="store",
+        type=float,
+        default=WATCH_DEFAULT_STEP,
+        dest="step",
+        help=f"Resolution of the metrics in seconds. Default: {WATCH_DEFAULT_STEP}",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        action="store",
+        type=int,
+        default=DEFAULT_WORKERS,
+        dest="workers",
+        help=f"Number of servers polled at the same time. Default: {DEFAULT_WORKERS}",
+    )
+    parser.add_argument("--once", action="store_true", dest="once", help="Poll every server once and exit.")
+
+    parser.add_argument(
+        "--metrics-port",
+        action="store",
+        type=int,
+        dest="metrics_port",
+        help="Serve reassignment and API latencies in the OpenMetrics text format on this TCP port.",
+    )
+
+    cli_args = parser.parse_args()
+
+    try:
+        rules = [rule for text in cli_args.rule or [] for rule in parse_rules(text)]
+    except ValueError as err:
+        parser.error(str(err))
+
+    token = None
+    if cli_args.token:
+        token = getpass(prompt="Password or Token: ")
+
+    if cli_args.metrics_port is not None:
+        registry.serve(port=cli_args.metrics_port)
+
+    config = HcloudReassignIni(path=cli_args.config, api_token=token)
+    try:
+        watcher = Watcher(
+            config=config,
+            resources=cli_args.resource,
+            rules=rules or None,
+            interval=cli_args.interval,
+            step=cli_args.step,
+            workers=cli_args.workers,
+        )
+    except ValueError as err:
+        parser.error(str(err))
+    if not watcher.sources:
+        print("No section has watch rules.")
+        return 2
+
+    status = 0
+    if cli_args.once:
+        events = chain(watcher.check(watcher.sources), watcher.finish())
+    else:
+        # Leave the loop on SIGTERM
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        events = watcher.run()
+
+    try:
+        for event in events:
+            status = max(status, event.status)
+            print(f"{event.section}: {event.server} breached '{event.rule}', {status_message[event.status]}")
+    except KeyboardInterrupt:
+        pass
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module waits for many Hetzner Cloud actions at once.
+
+All pending actions are queried with a single list request filtered by ID,
+with exponential backoff, jitter and a wall-clock deadline.
+"""
+
+# Import typing helpers
+from collections.abc import Iterable
+
+# Import random for jitter
+from random import uniform
+
+# Import time functions
+from time import monotonic, sleep
+
+# Import local constants
+from ..utils import constants
+
+# Map action states to status codes
+action_status = {
+    "success": constants.STATUS_SUCCESS,
+    "running": constants.STATUS_RUNNING,
+    "error": constants.STATUS_ERROR,
+}
+
+
+def backoff(attempt: int, base: float = constants.ACTION_POLL_BASE, cap: float = constants.ACTION_POLL_CAP) -> float:
+    """Get a truncated exponential backoff interval with full jitter.
+
+    Parameters
+    ----------
+    attempt : int
+              Number of polls already made.
+    base : float, optional
+           Interval of the first poll in seconds.
+    cap : float, optional
+          Maximum interval in seconds.
+
+    Returns
+    -------
+    float: Seconds to wait.
+    """
+    return uniform(base, min(cap, base * 2**attempt))
+
+
+def fetch_action_states(hclient, action_ids: Iterable[int]) -> dict[int, str]:
+    """Get states of many actions with as few requests as possible.
+
+    Parameters
+    ----------
+    hclient : HcloudClient
+              Client used for the requests.
+    action_ids : Iterable[int]
+                 IDs of the actions.
+
+    Returns
+    -------
+    dict[int, str]: Action state ('running', 'success' or 'error') by ID.
+    """
+    action_ids = list(action_ids)
+    states = {}
+    for i in range(0, len(action_ids), constants.ACTION_POLL_BATCH):
+        batch = action_ids[i : i + constants.ACTION_POLL_BATCH]
+        response = hclient.request(
+            method="GET", url="/actions", params={"id": batch, "per_page": constants.ACTION_POLL_BATCH}
+        )
+        for action in response["actions"]:
+            states[action["id"]] = action["status"]
+
+    return states
+
+
+def wait_for_actions(
+    hclient,
+    actions: Iterable,
+    timeout: float = constants.ACTION_TIMEOUT,
+    base: float = constants.ACTION_POLL_BASE,
+    cap: float = constants.ACTION_POLL_CAP,
+) -> dict[int, int]:
+    """Wait until all actions finished or the deadline passed.
+
+    Parameters
+    ----------
+    hclient : HcloudClient
+              Client used for the requests.
+    actions : Iterable
+              Action objects as returned by the API calls.
+    timeout : float, optional
+              Seconds until unfinished actions are reported as timed out.
+    base : float, optional
+           Interval of the first poll in seconds.
+    cap : float, optional
+          Maximum interval between polls in seconds.
+
+    Returns
+    -------
+    dict[int, int]: Status code by action ID.
+    """
+    deadline = monotonic() + timeout
+    states = {action.id: action.status for action in actions}
+    statuses = {}
+
+    attempt = 0
+    while True:
+        for action_id, state in list(states.items()):
+            if state != "running":
+                statuses[action_id] = action_status.get(state, constants.STATUS_ERROR)
+                del states[action_id]
+
+        remaining = deadline - monotonic()
+        if not states or remaining <= 0:
+            break
+
+        # Wait a bit, so we do not spam the HCloud API.
+        sleep(min(backoff(attempt, base=base, cap=cap), remaining))
+        attempt += 1
+
+        for action_id, state in fetch_action_states(hclient, states).items():
+            if action_id in states:
+                states[action_id] = state
+
+    for action_id in states:
+        statuses[action_id] = constants.STATUS_TIMEOUT
+
+    return statuses
@@ -9,18 +9,40 @@ from configparser import ConfigParser
 # Import dataclass
 from dataclasses import dataclass
 
-# Import sleep
-from time import sleep
+# Import Mapping for lazily parsed sections
+from collections.abc import Iterable, Iterator, Mapping
+
+# Import fnmatch for section name patterns
+from fnmatch import fnmatchcase
+
+# Import contextmanager for reassignment phases
+from contextlib import contextmanager
 
 # Import warnings
 import warnings
 
+# Import timer for phase durations
+from time import perf_counter
+
 # Provide hcloud Client object
-from hcloud import Client
+from hcloud import APIException, Client, HCloudException
 from hcloud.actions import Action, BoundAction, ResourceActionsClient
+from hcloud.floating_ips import FloatingIP
+from hcloud.networks import Network, NetworkRoute
+from hcloud.primary_ips import PrimaryIP
+from hcloud.servers import Server
+
+# Import HTTPAdapter to size the connection pool of shared clients
+from requests import Session
+from requests.adapters import HTTPAdapter
 
 # Import local constants
 from ..utils import constants
+from . import deadline, telemetry
+from .actions import wait_for_actions
+from .cache import ResolutionCache
+from .planner import PlanItem
+from .snapshot import ProjectSnapshot
 
 # Wrap hcloud.Client and others into our own type,
 # though hcloud does not need to get imported in every module
@@ -28,9 +50,44 @@ HcloudClient = Client
 HcloudAction = Action
 HcloudBoundAction = BoundAction
 HcloudResourceActions = ResourceActionsClient
+HcloudException = HCloudException
+HcloudAPIException = APIException
+HcloudNetworkRoute = NetworkRoute
+
+# Domain classes by client attribute, used to build objects from cached IDs
+hcloud_domains = {
+    "servers": Server,
+    "floating_ips": FloatingIP,
+    "networks": Network,
+    "primary_ips": PrimaryIP,
+}
+
+
+def client_session(hclient: HcloudClient) -> Session:
+    """Get the requests session used by a Hcloud client.
+
+    hcloud moved its session from the client into a base client object,
+    so we look at both places.
+
+    Parameters
+    ----------
+    hclient : hcloud.Client
+              Client object to get the session from.
+
+    Returns
+    -------
+    requests.Session
+    """
+    base_client = getattr(hclient, "_client", None)
+    if isinstance(getattr(base_client, "_session", None), Session):
+        return base_client._session
 
+    return hclient._requests_session
 
-def make_client(token: str | None = None, url: str = constants.CONFIG_OPTION_API_URL) -> HcloudClient:
+
+def make_client(
+    token: str | None = None, url: str = constants.CONFIG_DEFAULT_API_URL, pool_size: int | None = None
+) -> HcloudClient:
     """Create an instance of the Hcloud client.
 
     This is a wrapper around hcloud.Client.
@@ -41,12 +98,67 @@ def make_client(token: str | None = None, url: str = constants.CONFIG_OPTION_API
             API token to authenticate with the Hcloud.
     url : str, optional
           URL of the Hcloud API.
+    pool_size : int | None, optional
+                Number of HTTPS connections kept open by the client.
+                Set this to the number of threads sharing the client.
 
     Returns
     -------
     hcloud.Client
     """
-    return HcloudClient(token=token, api_endpoint=url)
+    hclient = HcloudClient(token=token, api_endpoint=url)
+
+    if pool_size:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        client_session(hclient).mount("https://", adapter)
+        client_session(hclient).mount("http://", adapter)
+
+    return hclient
+
+
+class LazySectionDict(Mapping):
+    """This class turns resource sections into dictionaries when they are first used.
+
+    Large configurations may hold hundreds of sections while a run selects a
+    few of them, so only selected sections are converted.
+    """
+
+    def __init__(self, config: ConfigParser, sections: list[str]) -> None:
+        """Initialize a mapping over parsed sections.
+
+        Parameters
+        ----------
+        config : ConfigParser
+                 Parsed configuration file.
+        sections : list[str]
+                   Names of the resource sections.
+        """
+        self.__config = config
+        self.__sections = sections
+        self.__converted: dict[str, dict] = {}
+
+    def __getitem__(self, section: str) -> dict:
+        """Get the options of a section, converted on first use."""
+        if section not in self.__converted:
+            if section not in self.__sections:
+                raise KeyError(section)
+            options = {}
+            for option in self.__config.options(section):
+                if option == "metrics":
+                    options[option] = self.__config.getboolean(section, option)
+                else:
+                    options[option] = self.__config.get(section, option)
+            self.__converted[section] = options
+
+        return self.__converted[section]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over section names in configured order."""
+        return iter(self.__sections)
+
+    def __len__(self) -> int:
+        """Count resource sections."""
+        return len(self.__sections)
 
 
 @dataclass
@@ -91,17 +203,50 @@ class HcloudReassignIni:
         self.__resource_section2dict()
 
     def __resource_section2dict(self):
-        """Create a dictionary from resource sections."""
-        # Create empty dictionary
-        self.resource_section_dict = {}
-        # Fill out resource dictionary with sub dictionaries made by sections.
-        for section in self.resource_sections:
-            self.resource_section_dict[section] = {}
-            for option in self.config.options(section):
-                if option == "metrics":
-                    self.resource_section_dict[section][option] = self.config.getboolean(section, option)
-                else:
-                    self.resource_section_dict[section][option] = self.config.get(section, option)
+        """Create a dictionary from resource sections, sections are converted when used."""
+        self.resource_section_dict = LazySectionDict(config=self.config, sections=self.resource_sections)
+
+    def tags(self, section: str) -> set[str]:
+        """Get the tags of a section, a comma separated list in its 'tags' option."""
+        value = self.config.get(section, constants.CONFIG_OPTION_TAGS, fallback="")
+        return {tag.strip() for tag in value.split(",") if tag.strip()}
+
+    def select(
+        self, patterns: Iterable[str] | None = None, tags: Iterable[str] | None = None, strict: bool = False
+    ) -> list[str]:
+        """Select resource sections by name and tag without converting them.
+
+        Parameters
+        ----------
+        patterns : Iterable[str] | None, optional
+                   Section names or shell-style patterns like 'floating.web-*', all sections if omitted.
+        tags : Iterable[str] | None, optional
+               Select only sections carrying at least one of these tags.
+        strict : bool, optional
+                 Raise an error if a pattern matches no section.
+
+        Returns
+        -------
+        list[str]: Section names in configured order.
+
+        Raises
+        ------
+        LookupError: A pattern matches no section and strict is set.
+        """
+        patterns = list(patterns or [])
+        tags = set(tags or [])
+
+        if strict:
+            for pattern in patterns:
+                if not any(fnmatchcase(section, pattern) for section in self.resource_sections):
+                    raise LookupError(f"No section matches '{pattern}'.")
+
+        return [
+            section
+            for section in self.resource_sections
+            if (not patterns or any(fnmatchcase(section, pattern) for pattern in patterns))
+            and (not tags or tags & self.tags(section))
+        ]
 
     def __client_section2dict(self):
         """Create a dictionary from client sections."""
@@ -122,8 +267,16 @@ class HcloudClassBase:
     status_success = constants.STATUS_SUCCESS
     status_running = constants.STATUS_RUNNING
     status_error = constants.STATUS_ERROR
-
-    def __init__(self, section: dict, client: dict, hclient: HcloudClient | None = None) -> None:
+    status_timeout = constants.STATUS_TIMEOUT
+
+    def __init__(
+        self,
+        section: dict,
+        client: dict,
+        hclient: HcloudClient | None = None,
+        cache: ResolutionCache | None = None,
+        snapshot: ProjectSnapshot | None = None,
+    ) -> None:
         """Initialize HcloudClassBase.
 
         Parameters
@@ -134,6 +287,10 @@ class HcloudClassBase:
                  Dictionary of client section information
         hclient : Client|None, optional
                   hcloud.Client object. Use when to reassign multiple resources.
+        cache : ResolutionCache | None, optional
+                Persistent name to ID cache shared by sections.
+        snapshot : ProjectSnapshot | None, optional
+                   Listed project resources shared by sections.
         """
         # Assign section
         self.section = section
@@ -145,13 +302,177 @@ class HcloudClassBase:
         # In case of multiple actions, we do not want too much
         # API connections and client objects because of rate limits.
         if not hclient:
-            self.hclient = HcloudClient(
+            self.hclient = make_client(
                 token=self.client[constants.CONFIG_OPTION_API_TKN],
-                api_endpoint=self.client[constants.CONFIG_OPTION_API_URL],
+                url=self.client[constants.CONFIG_OPTION_API_URL],
             )
         else:
             self.hclient = hclient
 
+        # Resolved API objects by (client attribute, resource name)
+        self.resolved: dict[tuple[str, str], object] = {}
+        self.cache = cache
+        self.snapshot = snapshot
+        # Resolved objects only known by their cached ID
+        self.id_only: set[tuple[str, str]] = set()
+
+        # Seconds a reassignment may take, None if unbounded
+        deadline_option = str(self.client.get(constants.CONFIG_OPTION_DEADLINE, "")).strip()
+        self.deadline_seconds: float | None = float(deadline_option or constants.REASSIGN_DEADLINE) or None
+
+        # Details of the last reassignment: desired server or gateway, IDs of the
+        # actions waited for and seconds spent per phase
+        self.target: str | None = None
+        self.action_ids: list[int] = []
+        self.phase_timings: dict[str, float] = {}
+        # The last reassignment was skipped, the resource already was on its target
+        self.unchanged = False
+
+    def prefetch_resources(self) -> list[tuple[str, str]]:
+        """List resources a section needs to resolve before reassigning.
+
+        Returns
+        -------
+        list[tuple[str, str]]: Pairs of client attribute (e.g. 'servers') and resource name.
+        """
+        return []
+
+    def plan(self, direction: str) -> PlanItem | None:
+        """Compare the desired and the current assignment of this section.
+
+        Parameters
+        ----------
+        direction : str
+                    Either 'src' or 'dest'.
+
+        Returns
+        -------
+        PlanItem | None: None if this section type cannot be planned.
+        """
+        return None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a phase of a reassignment and bound it by its share of the deadline.
+
+        Parameters
+        ----------
+        name : str
+               Phase, e.g. 'resolve', 'assign' or 'action_wait'.
+        """
+        begin = perf_counter()
+        try:
+            with telemetry.phase_seconds.time(type=self.section_type, phase=name), deadline.phase(name):
+                yield
+        finally:
+            self.phase_timings[name] = self.phase_timings.get(name, 0.0) + perf_counter() - begin
+
+    def reassign_within(self, direction: str, seconds: float | None = None, skip_unchanged: bool = False) -> int:
+        """Reassign this section by direction within a deadline.
+
+        Calls the reassign method of the section type. The deadline is split
+        across resolving resources, the calls creating actions and waiting for
+        them, see DEADLINE_SHARES. Planning whether the section is unchanged
+        is part of resolving.
+
+        Parameters
+        ----------
+        direction : str
+                    Either 'src' or 'dest'.
+        seconds : float | None, optional
+                  Deadline in seconds, the 'deadline' option of the client section if omitted.
+        skip_unchanged : bool, optional
+                         Do not reassign if the resource already is on the desired server, see unchanged.
+
+        Returns
+        -------
+        int: Status code, 'timeout' (3) if the deadline passed.
+        """
+        self.target = None
+        self.action_ids = []
+        self.phase_timings = {}
+        self.unchanged = False
+
+        seconds = seconds or self.deadline_seconds
+        try:
+            with deadline.scope(deadline.Deadline(seconds) if seconds else None):
+                if skip_unchanged:
+                    with self.phase("resolve"):
+                        item = self.plan(direction=direction)
+                    if item is not None and not item.changed:
+                        self.target, self.unchanged = item.desired, True
+                        return self.status_success
+                return self.reassign(direction=direction)
+        except deadline.DeadlineExceeded as err:
+            print(f"{self.section_type}: {err}")
+            telemetry.deadlines_exceeded.inc(type=self.section_type)
+            return self.status_timeout
+
+    def prefetch(self) -> None:
+        """Resolve all resources of this section ahead of a reassignment.
+
+        Resources are taken from the snapshot if there is one, otherwise
+        they are looked up at the API.
+        """
+        for kind, name in self.prefetch_resources():
+            self.resolved.pop((kind, name), None)
+            self.resolve(kind=kind, name=name, refresh=not (self.snapshot and self.snapshot.has(kind)))
+
+    def resolve(self, kind: str, name: str, refresh: bool = False) -> object | None:
+        """Resolve a resource name to an API object.
+
+        Previously resolved objects are used first, then the snapshot if it
+        lists this type, then the persistent cache which only knows the ID,
+        then the API. Resources missing in the snapshot, e.g. created after
+        it was taken, are looked up at the API.
+
+        Parameters
+        ----------
+        kind : str
+               Name of the client attribute, e.g. 'servers' or 'floating_ips'.
+        name : str
+               Name of the resource.
+        refresh : bool, optional
+                  Ignore previously resolved objects, snapshot and cache and ask the API.
+
+        Returns
+        -------
+        object | None: Bound API object or None if it does not exist.
+        """
+        key = (kind, name)
+        if not refresh and key in self.resolved:
+            return self.resolved[key]
+
+        listed = not refresh and self.snapshot and self.snapshot.has(kind)
+        if listed:
+            resource = self.snapshot.get(kind, name)
+            if resource is not None:
+                self.id_only.discard(key)
+                self.resolved[key] = resource
+                return resource
+
+        # The cache is older than a snapshot missing the resource
+        if not refresh and not listed and self.cache and kind in hcloud_domains:
+            resource_id = self.cache.get(kind, name)
+            if resource_id is not None:
+                self.resolved[key] = hcloud_domains[kind](id=resource_id, name=name)
+                self.id_only.add(key)
+                return self.resolved[key]
+
+        self.id_only.discard(key)
+        resource = getattr(self.hclient, kind).get_by_name(name)
+        if resource is None:
+            self.resolved.pop(key, None)
+            if self.cache:
+                self.cache.invalidate(kind, name)
+            return None
+
+        self.resolved[key] = resource
+        if self.cache:
+            self.cache.set(kind, name, resource.id)
+
+        return resource
+
     def __check_section(self) -> None:
         """Check if section was defined correctly."""
         if not ("type" in self.section.keys() and self.section["type"]):
@@ -185,31 +506,46 @@ class HcloudClassBase:
                 f"Option '{token}' is not defined or empty. You need an access/api token for authentication!"
             )
 
-    def __check_action_status__(self, response: HcloudBoundAction | HcloudAction, retries: int = 5) -> int:
+    def __check_action_status__(
+        self, response: HcloudBoundAction | HcloudAction, timeout: float = constants.ACTION_TIMEOUT
+    ) -> int:
         """Check status of an action.
 
         Parameters
         ----------
         response : HcloudBoundAction | HcloudAction
                    Action response object.
+        timeout : float, optional
+                  Seconds to wait for the action to finish.
 
         Returns
         -------
-        int:    Status, 0 on success, 1 on timeout, 2 on error.
+        int:    Status, 0 on success, 2 on error, 3 on timeout.
         """
-        retry_count = 0
-        r = response
+        return self.__check_actions_status__(responses=[response], timeout=timeout)[response.id]
 
-        while retry_count < retries and r.status != r.STATUS_SUCCESS:
-            r = HcloudResourceActions(client=self.hclient, resource=None).get_by_id(response.id)
-            retry_count += 1
-            # wait a bit, so we do not spam the HCloud API.
-            sleep(0.1)
+    def __check_actions_status__(
+        self, responses: list[HcloudBoundAction | HcloudAction], timeout: float = constants.ACTION_TIMEOUT
+    ) -> dict[int, int]:
+        """Check status of many actions with batched requests.
 
-        if r.status == r.STATUS_RUNNING:
-            return self.status_running
+        Parameters
+        ----------
+        responses : list[HcloudBoundAction | HcloudAction]
+                    Action response objects.
+        timeout : float, optional
+                  Seconds to wait for all actions to finish.
+
+        Returns
+        -------
+        dict[int, int]: Status by action ID, 0 on success, 2 on error, 3 on timeout.
+        """
+        self.action_ids += [response.id for response in responses]
+        with self.phase("action_wait"):
+            statuses = wait_for_actions(hclient=self.hclient, actions=responses, timeout=deadline.clip(timeout))
 
-        if r.status == r.STATUS_ERROR:
-            return self.status_error
+        timeouts = sum(status == constants.STATUS_TIMEOUT for status in statuses.values())
+        if timeouts:
+            telemetry.action_timeouts.inc(timeouts, type=self.section_type)
 
-        return self.status_success
+        return statuses
@@ -0,0 +1,198 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides a persistent cache mapping resource names to IDs.
+
+Resource names rarely change, so the IDs needed for an assignment can be
+taken from disk instead of asking the API on every reassignment.
+"""
+
+# Import hashlib to derive cache file names
+import hashlib
+
+# Import json for the cache file format
+import json
+
+# Import os for file handling
+import os
+
+# Import tempfile for atomic writes
+import tempfile
+
+# Import warnings
+import warnings
+
+# Import threading for concurrent sections
+from threading import Lock
+
+# Import time for expiry
+from time import time
+
+# Import local constants
+from ..utils import constants
+
+
+def default_cache_dir() -> str:
+    """Get the default cache directory.
+
+    Returns
+    -------
+    str: $XDG_CACHE_HOME/hcloud-reassign or ~/.cache/hcloud-reassign
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "hcloud-reassign")
+
+
+def project_key(token: str, url: str) -> str:
+    """Derive a key for a project and API URL.
+
+    API tokens are bound to a project, so a hash of the token identifies
+    the project without writing the token to disk.
+
+    Parameters
+    ----------
+    token : str
+            API token of the project.
+    url : str
+          URL of the Hcloud API.
+
+    Returns
+    -------
+    str: Hex digest identifying project and API URL.
+    """
+    return hashlib.sha256(f"{url}\n{token}".encode()).hexdigest()
+
+
+class ResolutionCache:
+    """This class maps resource names to IDs and persists them in a JSON file."""
+
+    def __init__(self, path: str, ttl: float = constants.CACHE_DEFAULT_TTL) -> None:
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        path : str
+               Path of the cache file.
+        ttl : float, optional
+              Seconds an entry stays valid.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.__lock = Lock()
+        self.__entries: dict[str, dict] | None = None
+
+    @classmethod
+    def from_client_section(cls, client: dict) -> "ResolutionCache | None":
+        """Create a cache from client section options.
+
+        Parameters
+        ----------
+        client : dict
+                 Dictionary of client section information.
+
+        Returns
+        -------
+        ResolutionCache | None: None if the cache is disabled by a ttl of 0.
+        """
+        ttl = float(client.get(constants.CONFIG_OPTION_CACHE_TTL) or constants.CACHE_DEFAULT_TTL)
+        if ttl <= 0:
+            return None
+
+        key = project_key(
+            token=client.get(constants.CONFIG_OPTION_API_TKN) or "",
+            url=client.get(constants.CONFIG_OPTION_API_URL) or constants.CONFIG_DEFAULT_API_URL,
+        )
+        directory = client.get(constants.CONFIG_OPTION_CACHE_PATH) or default_cache_dir()
+
+        return cls(path=os.path.join(directory, f"{key}.json"), ttl=ttl)
+
+    def __load(self) -> dict[str, dict]:
+        """Load entries from disk once."""
+        if self.__entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as cache_file:
+                    self.__entries = json.load(cache_file)
+            except (OSError, ValueError):
+                self.__entries = {}
+
+        return self.__entries
+
+    def __save(self) -> None:
+        """Write entries to disk atomically."""
+        try:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                json.dump(self.__entries, cache_file)
+            os.replace(tmp_path, self.path)
+        except OSError as err:
+            warnings.warn(f"Cannot write resolution cache '{self.path}': {err}", stacklevel=2)
+
+    def get(self, kind: str, name: str) -> int | None:
+        """Get a cached ID.
+
+        Parameters
+        ----------
+        kind : str
+               Name of the client attribute, e.g. 'servers' or 'floating_ips'.
+        name : str
+               Name of the resource.
+
+        Returns
+        -------
+        int | None: ID of the resource or None if unknown or expired.
+        """
+        with self.__lock:
+            entry = self.__load().get(f"{kind}/{name}")
+
+        if entry is None or time() - entry["time"] > self.ttl:
+            return None
+
+        return entry["id"]
+
+    def set(self, kind: str, name: str, resource_id: int) -> None:
+        """Store an ID.
+
+        Parameters
+        ----------
+        kind : str
+               Name of the client attribute, e.g. 'servers' or 'floating_ips'.
+        name : str
+               Name of the resource.
+        resource_id : int
+                      ID of the resource.
+        """
+        with self.__lock:
+            self.__load()[f"{kind}/{name}"] = {"id": resource_id, "time": time()}
+            self.__save()
+
+    def set_many(self, kind: str, resource_ids: dict[str, int]) -> None:
+        """Store many IDs with a single write.
+
+        Parameters
+        ----------
+        kind : str
+               Name of the client attribute, e.g. 'servers' or 'floating_ips'.
+        resource_ids : dict[str, int]
+                       IDs by resource name.
+        """
+        now = time()
+        with self.__lock:
+            entries = self.__load()
+            for name, resource_id in resource_ids.items():
+                entries[f"{kind}/{name}"] = {"id": resource_id, "time": now}
+            self.__save()
+
+    def invalidate(self, kind: str, name: str) -> None:
+        """Remove an ID, e.g. after the API reported it as not found.
+
+        Parameters
+        ----------
+        kind : str
+               Name of the client attribute, e.g. 'servers' or 'floating_ips'.
+        name : str
+               Name of the resource.
+        """
+        with self.__lock:
+            if self.__load().pop(f"{kind}/{name}", None) is not None:
+                self.__save()
@@ -0,0 +1,194 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides a resident reassignment daemon listening on a Unix socket.
+
+The daemon keeps one warm client, pre-resolved resources and open HTTPS
+connections, so a reassignment does not need to import modules, parse the
+configuration or connect to the API first.
+
+Commands are single lines, answered by a single line:
+
+    reassign <section> <src|dest>   ->  <section>: <status>
+    ping                            ->  pong
+
+Reassign commands go through a coalescing queue: a burst of commands for
+one section is applied once, in the latest direction. Commands overtaken
+by another direction are answered with '<section>: superseded'.
+"""
+
+# Import os for socket handling
+import os
+
+# Import socketserver for the Unix socket
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+
+# Import threading for the refresh loop and section locks
+from threading import Event, Lock, Thread
+
+# Import local utilities
+from ..utils import constants
+from ..utils.structures import status_message
+from .base import HcloudClassBase, HcloudException, HcloudReassignIni
+from .cache import ResolutionCache
+from .events import CoalescingQueue
+from .executor import reassign_one, attach_snapshot, make_sections, make_shared_client
+
+
+class ReassignDaemon:
+    """This class holds warm section objects and dispatches socket commands to them."""
+
+    def __init__(
+        self,
+        config: HcloudReassignIni,
+        socket_path: str = constants.DAEMON_SOCKET_PATH,
+        workers: int = constants.DEFAULT_WORKERS,
+        refresh_interval: float = constants.DAEMON_REFRESH_INTERVAL,
+        debounce: float = constants.EVENT_DEBOUNCE,
+    ) -> None:
+        """Initialize the daemon.
+
+        Parameters
+        ----------
+        config : HcloudReassignIni
+                 Parsed configuration file.
+        socket_path : str, optional
+                      Path of the Unix socket to listen on.
+        workers : int, optional
+                  Number of HTTPS connections kept open.
+        refresh_interval : float, optional
+                           Seconds between refreshing resolved resources.
+                           This also keeps the HTTPS connections open.
+        debounce : float, optional
+                   Seconds a section waits for further commands before it is reassigned.
+        """
+        self.config = config
+        self.socket_path = socket_path
+        self.refresh_interval = refresh_interval
+
+        self.hclient = make_shared_client(config=config, workers=workers)
+        self.cache = ResolutionCache.from_client_section(config.client_section_dict)
+        self.sections: dict[str, HcloudClassBase] = make_sections(
+            config=config, resources=config.resource_sections, hclient=self.hclient, cache=self.cache
+        )
+        self.snapshot = None
+        # Reassignments of one section must not overlap
+        self.locks = {resource: Lock() for resource in self.sections}
+        self.events = CoalescingQueue(apply=self.apply, debounce=debounce, workers=workers)
+
+        self.server: ThreadingUnixStreamServer | None = None
+        self.__stop = Event()
+
+    def refresh(self) -> None:
+        """List project resources and resolve resources of all sections again."""
+        try:
+            if self.snapshot is None:
+                self.snapshot = attach_snapshot(
+                    sections=self.sections, hclient=self.hclient, cache=self.cache, force=True
+                )
+            else:
+                self.snapshot.refresh()
+        except HcloudException as err:
+            print(f"snapshot refresh failed: {err}")
+
+        for resource, section in self.sections.items():
+            try:
+                section.prefetch()
+            except HcloudException as err:
+                print(f"{resource}: refresh failed: {err}")
+
+    def __refresh_loop(self) -> None:
+        """Refresh resolved resources until the daemon stops."""
+        while not self.__stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def start_refresh(self) -> None:
+        """Resolve all resources now and refresh them in a background thread."""
+        self.refresh()
+        Thread(target=self.__refresh_loop, name="refresh", daemon=True).start()
+
+    def apply(self, resource: str, direction: str) -> int:
+        """Reassign one section, called by the event queue.
+
+        Parameters
+        ----------
+        resource : str
+                   Name of the section.
+        direction : str
+                    Either 'src' or 'dest'.
+
+        Returns
+        -------
+        int: Status code.
+        """
+        with self.locks[resource]:
+            return reassign_one(self.sections[resource], resource, direction, skip_unchanged=False)
+
+    def dispatch(self, command: str) -> str:
+        """Execute a single command line.
+
+        Parameters
+        ----------
+        command : str
+                  Command line without the trailing newline.
+
+        Returns
+        -------
+        str: Answer line without the trailing newline.
+        """
+        words = command.split()
+
+        if words == [constants.DAEMON_COMMAND_PING]:
+            return "pong"
+
+        if len(words) != 3 or words[0] != constants.DAEMON_COMMAND_REASSIGN:
+            return f"error: invalid command, use '{constants.DAEMON_COMMAND_REASSIGN} <section> <src|dest>'"
+
+        _, resource, direction = words
+        if resource not in self.sections:
+            return f"error: unknown section '{resource}'"
+        if direction not in ["src", "dest"]:
+            return f"error: invalid direction '{direction}'"
+
+        status = self.events.submit(resource, direction).result()
+        if status is None:
+            return f"{resource}: {constants.DAEMON_ANSWER_SUPERSEDED}"
+
+        return f"{resource}: {status_message[status]}"
+
+    def serve_forever(self) -> None:
+        """Resolve all resources, open the socket and handle commands."""
+        self.start_refresh()
+
+        daemon = self
+
+        class Handler(StreamRequestHandler):
+            """Handle one command per connection."""
+
+            def handle(self) -> None:
+                """Read a command line and write the answer."""
+                line = self.rfile.readline().decode("utf-8").strip()
+                self.wfile.write(f"{daemon.dispatch(line)}\n".encode())
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+
+        self.server = ThreadingUnixStreamServer(self.socket_path, Handler)
+        self.server.daemon_threads = True
+        # Only the owner and its group may trigger reassignments
+        os.chmod(self.socket_path, 0o660)
+
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self) -> None:
+        """Stop handling commands."""
+        self.__stop.set()
+        if self.server:
+            self.server.shutdown()
+        self.events.close()
@@ -0,0 +1,162 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module bounds the time of a reassignment by a deadline.
+
+A deadline is set for the current thread while a section is reassigned.
+Every phase of the reassignment (resolve, assign, action wait) may use a
+share of the whole budget, see DEADLINE_SHARES, but never more than is
+left. Requests of an installed client get a timeout no longer than their
+phase allows, retries and rate limit waits are cut short, and requests
+are not sent at all once it passed. Action waits end when the deadline
+passes, leaving unfinished actions timed out.
+"""
+
+# Import threading for deadlines per thread
+import threading
+
+# Import typing helpers
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import monotonic
+
+# Import local utilities
+from ..utils import constants
+from . import telemetry
+
+
+class DeadlineExceeded(Exception):
+    """This exception stops a reassignment whose deadline passed."""
+
+
+class Deadline:
+    """This class holds the time left for a reassignment or a phase of it."""
+
+    def __init__(self, seconds: float, parent: "Deadline | None" = None) -> None:
+        """Start a deadline.
+
+        Parameters
+        ----------
+        seconds : float
+                  Budget in seconds.
+        parent : Deadline | None, optional
+                 Deadline of the whole reassignment, limits this one.
+        """
+        self.seconds = seconds
+        self.parent = parent
+        self.expires = monotonic() + seconds
+        if parent is not None:
+            self.expires = min(self.expires, parent.expires)
+
+    def remaining(self) -> float:
+        """Get the seconds left, 0 if the deadline passed."""
+        return max(0.0, self.expires - monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Check if the deadline passed."""
+        return self.remaining() <= 0
+
+    def phase(self, name: str) -> "Deadline":
+        """Get the deadline of a phase.
+
+        Parameters
+        ----------
+        name : str
+               Phase, e.g. 'resolve', 'assign' or 'action_wait'.
+
+        Returns
+        -------
+        Deadline: A share of the whole budget, bound by the time left.
+        """
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        return Deadline(root.seconds * constants.DEADLINE_SHARES.get(name, 1.0), parent=root)
+
+
+# Deadline of the reassignment running in this thread
+_local = threading.local()
+
+
+def current() -> Deadline | None:
+    """Get the deadline of the current thread, None if unbounded."""
+    return getattr(_local, "deadline", None)
+
+
+@contextmanager
+def scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    """Set the deadline of the current thread for a block."""
+    previous = current()
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
+
+
+@contextmanager
+def phase(name: str) -> Iterator[Deadline | None]:
+    """Limit a block to the share of its phase, if a deadline is set."""
+    deadline = current()
+    with scope(deadline.phase(name) if deadline is not None else None) as phase_deadline:
+        yield phase_deadline
+
+
+def clip(timeout: float | None) -> float | None:
+    """Shorten a timeout to the time left.
+
+    Parameters
+    ----------
+    timeout : float | None
+              Timeout in seconds, None for no timeout.
+
+    Returns
+    -------
+    float | None: Timeout, unchanged without deadline.
+    """
+    deadline = current()
+    if deadline is None:
+        return timeout
+    return deadline.remaining() if timeout is None else min(timeout, deadline.remaining())
+
+
+def install(hclient):
+    """Bound requests of a client by the deadline of the calling thread.
+
+    Parameters
+    ----------
+    hclient : HcloudClient
+              Client to bound.
+
+    Returns
+    -------
+    HcloudClient: The same client.
+    """
+    # Import here, base uses this module for action waits
+    from .base import client_session
+
+    session = client_session(hclient)
+    send = session.request
+
+    def request(method, url, *args, **kwargs):
+        deadline = current()
+        if deadline is not None:
+            if deadline.expired:
+                raise DeadlineExceeded(f"Deadline passed before {method} {telemetry.endpoint(url)}.")
+            # requests also takes a tuple of connect and read timeout
+            timeout = kwargs.get("timeout")
+            parts = timeout if isinstance(timeout, tuple) else (timeout,)
+            clipped = tuple(max(constants.DEADLINE_MIN_TIMEOUT, clip(part)) for part in parts)
+            kwargs["timeout"] = clipped if isinstance(timeout, tuple) else clipped[0]
+        return send(method, url, *args, **kwargs)
+
+    session.request = request
+
+    # Retries of the client sleep between attempts, no longer than the deadline allows
+    base_client = getattr(hclient, "_client", None)
+    retry_interval = getattr(base_client, "_retry_interval_func", None)
+    if retry_interval is not None:
+        base_client._retry_interval_func = lambda retries: max(0.0, clip(retry_interval(retries)))
+
+    return hclient
@@ -0,0 +1,210 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module moves floating IPs off a server or evens them out across servers.
+
+Drain and rebalance do not follow the sections of the configuration. The
+floating IPs currently assigned to a server are taken from one snapshot of
+the project, which lists all servers and floating IPs. A drained server's
+floating IPs go to the running peer with the fewest floating IPs, one after
+another. A rebalance moves floating IPs from the fullest to the emptiest
+peer until their counts differ by at most one.
+
+Moves are submitted concurrently and their actions polled together.
+"""
+
+# Import thread pool
+from concurrent.futures import ThreadPoolExecutor
+
+# Import dataclass
+from dataclasses import dataclass
+
+# Import typing helpers
+from collections.abc import Iterable, Iterator
+
+# Import local utilities
+from ..utils import constants
+from ..utils.structures import server_names
+from .actions import wait_for_actions
+from .base import HcloudClient, HcloudException, HcloudReassignIni
+from .placement import Candidate, score_candidates
+from .snapshot import ProjectSnapshot
+
+# Resource types listed for drain and rebalance
+DRAIN_SNAPSHOT_KINDS = ("servers", "floating_ips")
+
+
+@dataclass
+class Move:
+    """This class describes moving one floating IP to another server."""
+
+    floating_ip: str
+    source: str
+    destination: str
+
+    def describe(self) -> str:
+        """Describe this move in one line."""
+        return f"{self.floating_ip}: {self.source} -> {self.destination}"
+
+
+def configured_servers(config: HcloudReassignIni) -> list[str]:
+    """Get all servers named as source or destination in the configuration.
+
+    Parameters
+    ----------
+    config : HcloudReassignIni
+             Parsed configuration file.
+
+    Returns
+    -------
+    list[str]: Server names in order of appearance, without gateway IP addresses.
+    """
+    servers = []
+    for section in config.resource_section_dict.values():
+        for option in ("source", "destination"):
+            servers.extend(server_names(section.get(option)))
+
+    return list(dict.fromkeys(servers))
+
+
+def _candidates(snapshot: ProjectSnapshot, servers: Iterable[str]) -> list[Candidate]:
+    """Describe servers by their number of floating IPs, unknown servers are left out."""
+    candidates = []
+    for name in servers:
+        server = snapshot.get("servers", name)
+        if server is None:
+            print(f"Server resource {name} not found.")
+            continue
+        candidates.append(
+            Candidate(
+                name=name,
+                healthy=getattr(server, "status", None) == constants.SERVER_STATUS_RUNNING,
+                floating_ips=len(snapshot.server_floating_ips(server.id)),
+            )
+        )
+
+    return candidates
+
+
+def plan_drain(snapshot: ProjectSnapshot, server: str, peers: Iterable[str]) -> list[Move]:
+    """Distribute all floating IPs of a server over its peers.
+
+    Parameters
+    ----------
+    snapshot : ProjectSnapshot
+               Refreshed snapshot listing servers and floating IPs.
+    server : str
+             Name of the server to drain.
+    peers : Iterable[str]
+            Names of the servers to move floating IPs to.
+
+    Returns
+    -------
+    list[Move]
+
+    Raises
+    ------
+    LookupError: The server does not exist.
+    ValueError: No peer is running.
+    """
+    drained = snapshot.get("servers", server)
+    if drained is None:
+        raise LookupError(f"Server resource {server} not found.")
+
+    flips = sorted(snapshot.server_floating_ips(drained.id), key=lambda flip: flip.name)
+    candidates = [candidate for candidate in _candidates(snapshot, peers) if candidate.name != server]
+    if flips and not any(candidate.healthy for candidate in candidates):
+        raise ValueError(f"No running peer to drain {server} to.")
+
+    moves = []
+    for flip in flips:
+        target = score_candidates(candidates, use_metrics=False)[0]
+        target.floating_ips += 1
+        moves.append(Move(floating_ip=flip.name, source=server, destination=target.name))
+
+    return moves
+
+
+def plan_rebalance(snapshot: ProjectSnapshot, servers: Iterable[str]) -> list[Move]:
+    """Even out the number of floating IPs across running servers.
+
+    Parameters
+    ----------
+    snapshot : ProjectSnapshot
+               Refreshed snapshot listing servers and floating IPs.
+    servers : Iterable[str]
+              Names of the servers to balance.
+
+    Returns
+    -------
+    list[Move]: Fewest moves leaving counts that differ by at most one.
+    """
+    flips = {}
+    for candidate in _candidates(snapshot, servers):
+        if candidate.healthy:
+            server = snapshot.get("servers", candidate.name)
+            flips[candidate.name] = sorted(
+                (flip.name for flip in snapshot.server_floating_ips(server.id)), reverse=True
+            )
+
+    moves = []
+    while flips:
+        fullest = max(flips, key=lambda name: len(flips[name]))
+        emptiest = min(flips, key=lambda name: len(flips[name]))
+        if len(flips[fullest]) - len(flips[emptiest]) <= 1:
+            break
+        flip = flips[fullest].pop()
+        flips[emptiest].append(flip)
+        moves.append(Move(floating_ip=flip, source=fullest, destination=emptiest))
+
+    return moves
+
+
+def apply_moves(
+    hclient: HcloudClient,
+    snapshot: ProjectSnapshot,
+    moves: list[Move],
+    workers: int = constants.DEFAULT_WORKERS,
+    timeout: float = constants.ACTION_TIMEOUT,
+) -> Iterator[tuple[Move, int]]:
+    """Assign floating IPs concurrently and wait for all actions together.
+
+    Parameters
+    ----------
+    hclient : HcloudClient
+              Client used for the requests.
+    snapshot : ProjectSnapshot
+               Snapshot the moves were planned with.
+    moves : list[Move]
+            Moves to apply.
+    workers : int, optional
+              Number of assign requests sent at the same time.
+    timeout : float, optional
+              Seconds to wait for all actions to finish.
+
+    Yields
+    ------
+    tuple[Move, int]: Move and status code.
+    """
+
+    def assign(move: Move):
+        try:
+            return hclient.floating_ips.assign(
+                floating_ip=snapshot.get("floating_ips", move.floating_ip),
+                server=snapshot.get("servers", move.destination),
+            )
+        except HcloudException as err:
+            print(f"{move.floating_ip}: {err}")
+            return None
+
+    if not moves:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(moves))), thread_name_prefix="drain") as pool:
+        responses = list(pool.map(assign, moves))
+
+    statuses = wait_for_actions(
+        hclient=hclient, actions=[response for response in responses if response is not None], timeout=timeout
+    )
+    for move, response in zip(moves, responses):
+        yield move, constants.STATUS_ERROR if response is None else statuses[response.id]
@@ -0,0 +1,178 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module coalesces bursts of state transitions per resource.
+
+VRRP flaps can notify several transitions per second. Instead of running
+a reassignment for each, transitions of a resource are debounced: only
+the latest desired direction is applied, once no further transition came
+in for the debounce interval. Transitions superseded by another direction
+before their reassignment started are answered as superseded and never
+reach the API. A transition arriving while a reassignment of its resource
+is running is queued and applied afterwards, unless the running
+reassignment already applies the same direction.
+
+Reassignments of one resource never overlap, different resources are
+reassigned concurrently.
+"""
+
+# Import futures for the answers to transitions
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Import dataclass
+from dataclasses import dataclass, field
+
+# Import threading for the scheduler
+from threading import Condition, Thread
+
+# Import monotonic clock for debounce deadlines
+from time import monotonic
+
+# Import typing helpers
+from collections.abc import Callable
+
+# Import local constants
+from ..utils import constants
+
+
+@dataclass
+class _Waiter:
+    """This class holds the answer to one transition."""
+
+    generation: int
+    direction: str
+    future: Future
+
+
+@dataclass
+class _Slot:
+    """This class holds the transitions of one resource."""
+
+    desired: str = ""
+    generation: int = 0
+    due: float = 0.0
+    # A transition is waiting for its reassignment to start
+    pending: bool = False
+    # Generation and direction of the running reassignment
+    running: tuple[int, str] | None = None
+    waiters: list[_Waiter] = field(default_factory=list)
+
+
+class CoalescingQueue:
+    """This class debounces transitions per resource and applies only the latest one."""
+
+    def __init__(
+        self,
+        apply: Callable[[str, str], int],
+        debounce: float = constants.EVENT_DEBOUNCE,
+        workers: int = constants.DEFAULT_WORKERS,
+    ) -> None:
+        """Initialize an idle queue, the scheduler starts with the first transition.
+
+        Parameters
+        ----------
+        apply : Callable[[str, str], int]
+                Function reassigning a resource to a direction, returning a status code.
+        debounce : float, optional
+                   Seconds without further transitions before a resource is reassigned.
+        workers : int, optional
+                  Number of resources reassigned at the same time.
+        """
+        self.apply = apply
+        self.debounce = debounce
+        self.workers = max(1, workers)
+
+        self.__condition = Condition()
+        self.__slots: dict[str, _Slot] = {}
+        self.__pool: ThreadPoolExecutor | None = None
+        self.__closed = False
+
+    def submit(self, resource: str, direction: str) -> Future:
+        """Add a transition.
+
+        Pending transitions of the resource to another direction are answered as superseded.
+
+        Parameters
+        ----------
+        resource : str
+                   Name of the section.
+        direction : str
+                    Either 'src' or 'dest'.
+
+        Returns
+        -------
+        Future: Resolves to the status code of the reassignment, None if superseded.
+        """
+        future = Future()
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("The event queue is closed.")
+            if self.__pool is None:
+                self.__pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="event")
+                Thread(target=self.__schedule, name="events", daemon=True).start()
+
+            slot = self.__slots.setdefault(resource, _Slot())
+            running = slot.running[0] if slot.running else 0
+            for waiter in list(slot.waiters):
+                if waiter.generation > running and waiter.direction != direction:
+                    slot.waiters.remove(waiter)
+                    waiter.future.set_result(None)
+
+            slot.generation += 1
+            slot.desired = direction
+            slot.due = monotonic() + self.debounce
+            # The running reassignment already applies this direction, its status answers this transition
+            covered = slot.running is not None and slot.running[1] == direction
+            slot.pending = not covered
+            slot.waiters.append(
+                _Waiter(generation=running if covered else slot.generation, direction=direction, future=future)
+            )
+
+            self.__condition.notify_all()
+
+        return future
+
+    def __schedule(self) -> None:
+        """Start reassignments of resources whose debounce interval passed."""
+        with self.__condition:
+            while not self.__closed:
+                now = monotonic()
+                idle = [
+                    (slot.due, resource) for resource, slot in self.__slots.items() if slot.pending and not slot.running
+                ]
+                due = [resource for deadline, resource in idle if deadline <= now]
+                for resource in due:
+                    slot = self.__slots[resource]
+                    slot.pending = False
+                    slot.running = (slot.generation, slot.desired)
+                    self.__pool.submit(self.__run, resource, *slot.running)
+
+                timeout = min((deadline - now for deadline, resource in idle if deadline > now), default=None)
+                self.__condition.wait(timeout)
+
+    def __run(self, resource: str, generation: int, direction: str) -> None:
+        """Reassign a resource and answer the transitions it covers."""
+        try:
+            status = self.apply(resource, direction)
+        except Exception as err:
+            print(f"{resource}: {err}")
+            status = constants.STATUS_ERROR
+
+        with self.__condition:
+            slot = self.__slots[resource]
+            slot.running = None
+            for waiter in list(slot.waiters):
+                if waiter.generation <= generation:
+                    slot.waiters.remove(waiter)
+                    waiter.future.set_result(status if waiter.direction == direction else None)
+            self.__condition.notify_all()
+
+    def close(self) -> None:
+        """Stop scheduling, running reassignments are finished."""
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+            pool = self.__pool
+
+        if pool is not None:
+            pool.shutdown(wait=True)
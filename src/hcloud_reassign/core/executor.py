@@ -0,0 +1,390 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module runs reassignments of multiple resources concurrently."""
+
+# Import typing helpers
+from collections.abc import Iterable, Iterator
+
+# Import thread pool
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Import dataclass for reassignment results
+from dataclasses import asdict, dataclass, field
+
+# Import timer for reassignment durations
+from time import perf_counter
+
+# Import connection errors of the API client
+from requests import RequestException
+
+# Import local utilities
+from ..utils import constants
+from ..utils.structures import hcloud_functions, status_message
+from . import deadline, hedging, telemetry
+from .base import HcloudClassBase, HcloudClient, HcloudException, HcloudReassignIni, make_client
+from .cache import ResolutionCache
+from .planner import Plan
+from .ratelimit import RateLimiter
+from .snapshot import ProjectSnapshot
+
+# Resource types whose assignment decides if a section is unchanged
+SNAPSHOT_STATE_KINDS = ("floating_ips", "primary_ips", "networks")
+
+
+def make_shared_client(config: HcloudReassignIni, workers: int = constants.DEFAULT_WORKERS) -> HcloudClient:
+    """Create one client to be shared by all sections of a configuration.
+
+    Requests are scheduled by a rate limiter shared with other processes
+    using the same project, unless it is disabled in the client section.
+    Slow reads are hedged unless 'hedge' is off in the client section, and
+    all requests are bound by the deadline of the reassignment sending them.
+
+    Parameters
+    ----------
+    config : HcloudReassignIni
+             Parsed configuration file.
+    workers : int, optional
+              Number of threads using the client at the same time.
+
+    Returns
+    -------
+    hcloud.Client
+    """
+    hclient = make_client(
+        token=config.client_section_dict.get(constants.CONFIG_OPTION_API_TKN),
+        url=config.client_section_dict.get(constants.CONFIG_OPTION_API_URL) or constants.CONFIG_DEFAULT_API_URL,
+        pool_size=workers,
+    )
+    telemetry.instrument(hclient)
+
+    rate_limiter = RateLimiter.from_client_section(config.client_section_dict)
+    if rate_limiter:
+        rate_limiter.install(hclient)
+
+    hedge = str(config.client_section_dict.get(constants.CONFIG_OPTION_HEDGE, "yes")).strip().lower()
+    if hedge not in ["no", "off", "false", "0"]:
+        hedging.install(hclient, workers=workers)
+    deadline.install(hclient)
+
+    return hclient
+
+
+def make_sections(
+    config: HcloudReassignIni,
+    resources: Iterable[str],
+    hclient: HcloudClient,
+    cache: ResolutionCache | None = None,
+) -> dict[str, HcloudClassBase]:
+    """Create section objects sharing one client and resolution cache.
+
+    Parameters
+    ----------
+    config : HcloudReassignIni
+             Parsed configuration file.
+    resources : Iterable[str]
+                Section names to create objects for.
+    hclient : hcloud.Client
+              Client shared by all sections.
+    cache : ResolutionCache | None, optional
+            Resolution cache shared by all sections.
+            Created from the client section if omitted.
+
+    Returns
+    -------
+    dict[str, HcloudClassBase]: Section objects by section name.
+    """
+    if cache is None:
+        cache = ResolutionCache.from_client_section(config.client_section_dict)
+
+    sections = {}
+    for resource in resources:
+        section = config.resource_section_dict[resource]
+        section_class = hcloud_functions[section["type"]]
+        sections[resource] = section_class(
+            section=section, client=config.client_section_dict, hclient=hclient, cache=cache
+        )
+
+    return sections
+
+
+def _missing(wanted: set[tuple[str, str]], cache: ResolutionCache | None) -> set[tuple[str, str]]:
+    """Get resources the cache cannot resolve."""
+    return {(kind, name) for kind, name in wanted if not cache or cache.get(kind, name) is None}
+
+
+def attach_snapshot(
+    sections: dict[str, HcloudClassBase],
+    hclient: HcloudClient,
+    cache: ResolutionCache | None = None,
+    force: bool = False,
+    state_kinds: Iterable[str] = (),
+) -> ProjectSnapshot | None:
+    """List project resources once and let all sections resolve through it.
+
+    A snapshot costs one list call per resource type. It is only taken if
+    that is cheaper than looking up every resource missing in the cache.
+    Cached IDs carry no state, so state kinds are listed as well if more
+    than one of their resources would have to be looked up again to know
+    where it is assigned.
+
+    Parameters
+    ----------
+    sections : dict[str, HcloudClassBase]
+               Section objects by section name.
+    hclient : hcloud.Client
+              Client shared by all sections.
+    cache : ResolutionCache | None, optional
+            Resolution cache shared by all sections, warmed by the snapshot.
+    force : bool, optional
+            Take a snapshot regardless of the cache.
+    state_kinds : Iterable[str], optional
+                  Resource types whose current assignment is needed, e.g. to skip unchanged sections.
+
+    Returns
+    -------
+    ProjectSnapshot | None: The snapshot or None if per-name lookups are cheaper.
+    """
+    wanted = {resource for section in sections.values() for resource in section.prefetch_resources()}
+    missing = _missing(wanted, cache)
+    kinds = {kind for kind, _ in (wanted if force else missing)}
+    if not force and len(missing) <= len(kinds):
+        kinds = set()
+
+    cached = wanted - missing
+    for kind in state_kinds:
+        if sum(cached_kind == kind for cached_kind, _ in cached) > 1:
+            kinds.add(kind)
+
+    if not kinds:
+        return None
+
+    snapshot = ProjectSnapshot(hclient=hclient, kinds=sorted(kinds)).refresh()
+    if cache:
+        for kind in kinds:
+            cache.set_many(kind, {name: resource.id for name, resource in snapshot.by_name.get(kind, {}).items()})
+
+    for section in sections.values():
+        section.snapshot = snapshot
+
+    return snapshot
+
+
+@dataclass
+class ResourceResult:
+    """This class describes the reassignment of one section."""
+
+    section: str
+    status: int
+    direction: str = ""
+    type: str = ""
+    # Desired server or gateway
+    target: str | None = None
+    action_ids: list[int] = field(default_factory=list)
+    # Seconds per phase, e.g. 'resolve', 'assign' and 'action_wait'
+    phases: dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+    # The resource already was on its target, nothing was changed
+    unchanged: bool = False
+    error: str | None = None
+    # Project of the section, see fanout
+    project: str = ""
+
+    def to_dict(self) -> dict:
+        """Get this result as a JSON serializable record."""
+        record = asdict(self)
+        record["status"] = status_message[self.status]
+        record["code"] = self.status
+        if not self.project:
+            del record["project"]
+        return record
+
+
+def _reassign_record(
+    section: HcloudClassBase, resource: str, direction: str, skip_unchanged: bool = True
+) -> ResourceResult:
+    """Reassign one section, turn API, connection and deadline errors into a status and record the details."""
+    result = ResourceResult(
+        section=resource, status=constants.STATUS_SUCCESS, direction=direction, type=section.section_type
+    )
+    begin = perf_counter()
+    try:
+        result.status = section.reassign_within(direction=direction, skip_unchanged=skip_unchanged)
+        result.target, result.unchanged = section.target, section.unchanged
+        if not result.unchanged:
+            result.action_ids = list(section.action_ids)
+            result.phases = {phase: round(seconds, 6) for phase, seconds in section.phase_timings.items()}
+    except deadline.DeadlineExceeded as err:
+        print(f"{resource}: {err}")
+        result.status, result.error = constants.STATUS_TIMEOUT, str(err)
+    except (HcloudException, RequestException) as err:
+        # A failing or unreachable request only fails its own resource
+        print(f"{resource}: {err}")
+        result.status, result.error = constants.STATUS_ERROR, str(err)
+
+    result.seconds = round(perf_counter() - begin, 6)
+    if not result.unchanged:
+        telemetry.reassign_seconds.observe(result.seconds, section=resource, status=status_message[result.status])
+
+    return result
+
+
+def reassign_one(section: HcloudClassBase, resource: str, direction: str, skip_unchanged: bool = True) -> int:
+    """Reassign one section and get its status.
+
+    Parameters
+    ----------
+    section : HcloudClassBase
+              Section to reassign.
+    resource : str
+               Name of the section.
+    direction : str
+                Either 'src' or 'dest'.
+    skip_unchanged : bool, optional
+                     Skip the section if its resource already is on the desired server.
+
+    Returns
+    -------
+    int: Status code of the reassignment.
+    """
+    return _reassign_record(section, resource, direction, skip_unchanged).status
+
+
+def reassign_resources(
+    config: HcloudReassignIni,
+    resources: Iterable[str],
+    direction: str,
+    workers: int = constants.DEFAULT_WORKERS,
+    hclient: HcloudClient | None = None,
+    skip_unchanged: bool = True,
+) -> Iterator[tuple[str, int]]:
+    """Reassign resources concurrently.
+
+    All sections share one client with a connection pool as wide as the
+    number of workers and resolve resources through one snapshot of the
+    project if that needs fewer calls than single lookups. Sections whose
+    resource already is on the desired server are skipped. Results are
+    yielded as soon as a resource is done, so the time needed is bound by
+    the slowest resource.
+
+    Parameters
+    ----------
+    config : HcloudReassignIni
+             Parsed configuration file.
+    resources : Iterable[str]
+                Section names to reassign.
+    direction : str
+                Either 'src' or 'dest'.
+    workers : int, optional
+              Number of resources reassigned at the same time.
+    hclient : HcloudClient | None, optional
+              Client to use. A shared client is created if omitted.
+    skip_unchanged : bool, optional
+                     Do not reassign resources already on the desired server.
+
+    Yields
+    ------
+    tuple[str, int]: Section name and status code.
+    """
+    for result in reassign_records(
+        config=config,
+        resources=resources,
+        direction=direction,
+        workers=workers,
+        hclient=hclient,
+        skip_unchanged=skip_unchanged,
+    ):
+        yield result.section, result.status
+
+
+def reassign_records(
+    config: HcloudReassignIni,
+    resources: Iterable[str],
+    direction: str,
+    workers: int = constants.DEFAULT_WORKERS,
+    hclient: HcloudClient | None = None,
+    skip_unchanged: bool = True,
+) -> Iterator[ResourceResult]:
+    """Reassign resources concurrently and describe each as soon as it is done.
+
+    Parameters are the same as for reassign_resources.
+
+    Yields
+    ------
+    ResourceResult: Status, target, action IDs and phase durations of a section.
+    """
+    workers = max(1, workers)
+    if hclient is None:
+        hclient = make_shared_client(config=config, workers=workers)
+
+    cache = ResolutionCache.from_client_section(config.client_section_dict)
+    sections = make_sections(config=config, resources=resources, hclient=hclient, cache=cache)
+
+    # The snapshot is bound like resolving within a section, which falls back to single lookups
+    seconds = next((section.deadline_seconds for section in sections.values()), None)
+    try:
+        with deadline.scope(deadline.Deadline(seconds) if seconds else None), deadline.phase("resolve"):
+            attach_snapshot(
+                sections=sections,
+                hclient=hclient,
+                cache=cache,
+                state_kinds=SNAPSHOT_STATE_KINDS if skip_unchanged else (),
+            )
+    except deadline.DeadlineExceeded as err:
+        print(f"Snapshot skipped: {err}")
+
+    if workers == 1 or len(sections) <= 1:
+        for resource, section in sections.items():
+            yield _reassign_record(section, resource, direction, skip_unchanged)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(sections)), thread_name_prefix="reassign") as pool:
+        futures = [
+            pool.submit(_reassign_record, section, resource, direction, skip_unchanged)
+            for resource, section in sections.items()
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def plan_resources(
+    config: HcloudReassignIni,
+    resources: Iterable[str],
+    direction: str,
+    hclient: HcloudClient | None = None,
+) -> Plan:
+    """Compare desired and current assignments without changing anything.
+
+    Parameters
+    ----------
+    config : HcloudReassignIni
+             Parsed configuration file.
+    resources : Iterable[str]
+                Section names to plan.
+    direction : str
+                Either 'src' or 'dest'.
+    hclient : HcloudClient | None, optional
+              Client to use. A shared client is created if omitted.
+
+    Returns
+    -------
+    Plan: Plan items of all sections that can be planned and an API call estimate.
+    """
+    if hclient is None:
+        hclient = make_shared_client(config=config, workers=1)
+
+    cache = ResolutionCache.from_client_section(config.client_section_dict)
+    sections = make_sections(config=config, resources=resources, hclient=hclient, cache=cache)
+    wanted = {resource for section in sections.values() for resource in section.prefetch_resources()}
+    lookups = len(_missing(wanted, cache))
+
+    snapshot = attach_snapshot(sections=sections, hclient=hclient, cache=cache, state_kinds=SNAPSHOT_STATE_KINDS)
+    plan = Plan(lookup_calls=len(snapshot.kinds) if snapshot else lookups)
+
+    for resource, section in sections.items():
+        item = section.plan(direction=direction)
+        if item is not None:
+            item.section = resource
+            plan.items.append(item)
+
+    return plan
@@ -0,0 +1,273 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module reassigns resources of many projects in one run.
+
+API tokens are bound to a project, so every project has a configuration
+file of its own. Configuration files are given one by one or as
+directories, whose '*.ini' files are read in name order. Every project
+gets its own client and rate limiter, see executor.make_shared_client, so
+a project running into its rate limit does not slow down the others.
+Projects are reassigned concurrently in threads, the resources of each
+project as well. Results of all projects are collected in one report.
+"""
+
+# Import dataclass
+from dataclasses import dataclass, field
+
+# Import os for configuration directories
+import os
+
+# Import queue to pass results of project threads
+from queue import SimpleQueue
+
+# Import thread pool
+from concurrent.futures import ThreadPoolExecutor
+
+# Import timer for project durations
+from time import perf_counter
+
+# Import typing helpers
+from collections.abc import Iterable, Iterator
+
+# Import local utilities
+from ..utils import constants
+from ..utils.structures import status_message
+from .base import HcloudException, HcloudReassignIni
+from .executor import ResourceResult, plan_resources, reassign_records
+from .planner import Plan
+
+
+def config_paths(paths: Iterable[str]) -> list[str]:
+    """Expand directories to the configuration files they contain.
+
+    Parameters
+    ----------
+    paths : Iterable[str]
+            Configuration files and directories.
+
+    Returns
+    -------
+    list[str]: Configuration files in the given order, files of a directory sorted by name.
+
+    Raises
+    ------
+    FileNotFoundError: A path does not exist.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if name.endswith(constants.CONFIG_FILE_SUFFIX) and os.path.isfile(os.path.join(path, name))
+            )
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"Configuration {path} not found.")
+
+    return list(dict.fromkeys(files))
+
+
+def project_names(paths: list[str]) -> dict[str, str]:
+    """Name projects by their configuration file.
+
+    Parameters
+    ----------
+    paths : list[str]
+            Configuration files.
+
+    Returns
+    -------
+    dict[str, str]: Configuration file by project name, the file name without suffix
+                    unless two files share it.
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    return {stem if stems.count(stem) == 1 else path: path for stem, path in zip(stems, paths)}
+
+
+@dataclass
+class ProjectResult:
+    """This class holds the statuses of the resources of one project."""
+
+    name: str
+    statuses: dict[str, int] = field(default_factory=dict)
+    # Reason the project could not be reassigned at all
+    error: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def status(self) -> int:
+        """Get the worst status of the project."""
+        if self.error is not None:
+            return constants.STATUS_ERROR
+        return max(self.statuses.values(), default=constants.STATUS_SUCCESS)
+
+    def describe(self) -> str:
+        """Describe this project in one line."""
+        if self.error is not None:
+            return f"{self.name}: {status_message[self.status]} ({self.error})"
+
+        counts = {}
+        for status in self.statuses.values():
+            counts[status_message[status]] = counts.get(status_message[status], 0) + 1
+        summary = ", ".join(f"{count} {message}" for message, count in counts.items()) or "no resources"
+
+        return f"{self.name}: {status_message[self.status]} ({summary}, {self.seconds:.2f}s)"
+
+
+@dataclass
+class FanoutReport:
+    """This class collects the results of all projects."""
+
+    projects: dict[str, ProjectResult] = field(default_factory=dict)
+
+    def project(self, name: str) -> ProjectResult:
+        """Get the result of a project, created on first use."""
+        return self.projects.setdefault(name, ProjectResult(name=name))
+
+    @property
+    def status(self) -> int:
+        """Get the worst status of all projects."""
+        return max((project.status for project in self.projects.values()), default=constants.STATUS_SUCCESS)
+
+    def describe(self) -> str:
+        """Describe all projects and the number of resources by status."""
+        lines = [project.describe() for project in self.projects.values()]
+        failed = sum(project.status != constants.STATUS_SUCCESS for project in self.projects.values())
+        resources = sum(len(project.statuses) for project in self.projects.values())
+        lines.append(f"projects: {len(self.projects)}, failed: {failed}, resources: {resources}")
+        return "\n".join(lines)
+
+
+def _load(
+    path: str, resources: list[str], tags: list[str], deadline: float | None
+) -> tuple[HcloudReassignIni, list[str]]:
+    """Read a project configuration and select its resources."""
+    config = HcloudReassignIni(path=path)
+    if deadline is not None:
+        config.client_section_dict[constants.CONFIG_OPTION_DEADLINE] = deadline
+
+    # Projects without a selected section have nothing to do
+    return config, config.select(patterns=resources, tags=tags)
+
+
+def reassign_projects(
+    paths: list[str],
+    direction: str,
+    resources: Iterable[str] | None = None,
+    tags: Iterable[str] | None = None,
+    workers: int = constants.DEFAULT_WORKERS,
+    projects: int = constants.DEFAULT_PROJECT_WORKERS,
+    deadline: float | None = None,
+    report: FanoutReport | None = None,
+) -> Iterator[ResourceResult]:
+    """Reassign resources of many projects concurrently.
+
+    Parameters
+    ----------
+    paths : list[str]
+            Configuration files, one per project.
+    direction : str
+                Either 'src' or 'dest'.
+    resources : Iterable[str] | None, optional
+                Section names or patterns to reassign in every project that has them, all sections if omitted.
+    tags : Iterable[str] | None, optional
+           Reassign only sections carrying one of these tags.
+    workers : int, optional
+              Number of resources of one project reassigned at the same time.
+    projects : int, optional
+               Number of projects reassigned at the same time.
+    deadline : float | None, optional
+               Deadline of each resource, overrides the client sections.
+    report : FanoutReport | None, optional
+             Report to collect results and durations in.
+
+    Yields
+    ------
+    ResourceResult: Result of a section with its project as soon as it is done.
+                    The section name is empty if the project failed as a whole.
+    """
+    resources, tags = list(resources or []), list(tags or [])
+    report = report if report is not None else FanoutReport()
+    names = project_names(paths)
+    for name in names:
+        report.project(name)
+
+    results = SimpleQueue()
+
+    def run(name: str, path: str) -> None:
+        begin = perf_counter()
+        try:
+            config, selected = _load(path, resources, tags, deadline)
+            for result in reassign_records(config=config, resources=selected, direction=direction, workers=workers):
+                result.project = name
+                results.put(result)
+        except (HcloudException, KeyError, ValueError, OSError) as err:
+            results.put(
+                ResourceResult(
+                    section="", status=constants.STATUS_ERROR, direction=direction, error=str(err), project=name
+                )
+            )
+        finally:
+            report.project(name).seconds = perf_counter() - begin
+            results.put(None)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(projects, len(names) or 1)), thread_name_prefix="project") as pool:
+        for name, path in names.items():
+            pool.submit(run, name, path)
+
+        running = len(names)
+        while running:
+            result = results.get()
+            if result is None:
+                running -= 1
+                continue
+
+            if result.section:
+                report.project(result.project).statuses[result.section] = result.status
+            else:
+                report.project(result.project).error = result.error
+            yield result
+
+
+def plan_projects(
+    paths: list[str],
+    direction: str,
+    resources: Iterable[str] | None = None,
+    tags: Iterable[str] | None = None,
+    projects: int = constants.DEFAULT_PROJECT_WORKERS,
+) -> Iterator[tuple[str, Plan | None, str | None]]:
+    """Plan reassignments of many projects concurrently.
+
+    Parameters
+    ----------
+    paths : list[str]
+            Configuration files, one per project.
+    direction : str
+                Either 'src' or 'dest'.
+    resources : Iterable[str] | None, optional
+                Section names or patterns to plan in every project that has them, all sections if omitted.
+    tags : Iterable[str] | None, optional
+           Plan only sections carrying one of these tags.
+    projects : int, optional
+               Number of projects planned at the same time.
+
+    Yields
+    ------
+    tuple[str, Plan | None, str | None]: Project name, plan and error in the order of the paths.
+    """
+    resources, tags = list(resources or []), list(tags or [])
+
+    def plan(path: str) -> tuple[Plan | None, str | None]:
+        try:
+            config, selected = _load(path, resources, tags, None)
+            return plan_resources(config=config, resources=selected, direction=direction), None
+        except (HcloudException, KeyError, ValueError, OSError) as err:
+            return None, str(err)
+
+    names = project_names(paths)
+    with ThreadPoolExecutor(max_workers=max(1, min(projects, len(names) or 1)), thread_name_prefix="project") as pool:
+        for name, (project_plan, error) in zip(names, pool.map(plan, names.values())):
+            yield name, project_plan, error
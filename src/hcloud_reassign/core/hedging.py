@@ -0,0 +1,140 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module hedges slow reads with a second request.
+
+Latencies of GET requests are kept per endpoint. Once enough are known, a
+GET taking longer than the HEDGE_PERCENTILE of its endpoint is sent a
+second time and the first answer is used. Only reads are hedged, they can
+be repeated without side effects. As only the slowest requests are sent
+twice, hedging costs a few percent of the rate limit and cuts the tail.
+"""
+
+# Import deque for a window of latencies
+from collections import deque
+
+# Import futures for concurrent attempts
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Import threading for the latency window
+from threading import Lock
+from time import perf_counter
+
+# Import local utilities
+from ..utils import constants
+from . import deadline, telemetry
+
+
+class LatencyTracker:
+    """This class keeps recent latencies per endpoint."""
+
+    def __init__(self, window: int = constants.HEDGE_WINDOW, min_samples: int = constants.HEDGE_MIN_SAMPLES) -> None:
+        """Initialize an empty tracker.
+
+        Parameters
+        ----------
+        window : int, optional
+                 Number of latencies kept per endpoint.
+        min_samples : int, optional
+                      Number of latencies needed for a percentile.
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.__lock = Lock()
+        self.__latencies: dict[str, deque] = {}
+
+    def observe(self, key: str, seconds: float) -> None:
+        """Add a latency of an endpoint."""
+        with self.__lock:
+            self.__latencies.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: str, quantile: float = constants.HEDGE_PERCENTILE) -> float | None:
+        """Get a percentile of the latencies of an endpoint.
+
+        Parameters
+        ----------
+        key : str
+              Endpoint, see telemetry.endpoint.
+        quantile : float, optional
+                   Quantile between 0 and 1.
+
+        Returns
+        -------
+        float | None: Seconds, None if fewer than min_samples latencies are known.
+        """
+        with self.__lock:
+            latencies = sorted(self.__latencies.get(key, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+
+
+def install(
+    hclient,
+    workers: int = constants.DEFAULT_WORKERS,
+    quantile: float = constants.HEDGE_PERCENTILE,
+    tracker: LatencyTracker | None = None,
+):
+    """Hedge slow GET requests of a client.
+
+    Parameters
+    ----------
+    hclient : HcloudClient
+              Client to hedge requests of.
+    workers : int, optional
+              Number of threads using the client at the same time.
+    quantile : float, optional
+               Latency percentile after which a GET is sent again.
+    tracker : LatencyTracker | None, optional
+              Latencies to start with, empty if omitted.
+
+    Returns
+    -------
+    HcloudClient: The same client.
+    """
+    # Import here, base imports modules of this package
+    from .base import client_session
+
+    session = client_session(hclient)
+    send = session.request
+    tracker = tracker or LatencyTracker()
+    # Each request may run as two attempts
+    pool = ThreadPoolExecutor(max_workers=2 * max(1, workers), thread_name_prefix="hedge")
+
+    def request(method, url, *args, **kwargs):
+        key = telemetry.endpoint(url)
+        delay = tracker.percentile(key, quantile) if method.upper() == "GET" else None
+        begin = perf_counter()
+        if delay is None:
+            response = send(method, url, *args, **kwargs)
+            if method.upper() == "GET":
+                tracker.observe(key, perf_counter() - begin)
+            return response
+
+        # Pool threads do not inherit the deadline of this thread
+        bound = deadline.current()
+
+        def attempt():
+            with deadline.scope(bound):
+                return send(method, url, *args, **kwargs)
+
+        attempts = [pool.submit(attempt)]
+        done, _ = wait(attempts, timeout=delay)
+        if not done:
+            telemetry.hedged_requests.inc(endpoint=key)
+            attempts.append(pool.submit(attempt))
+
+        # Use the first answer, an error only if all attempts failed
+        pending = set(attempts)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    tracker.observe(key, perf_counter() - begin)
+                    return attempt.result()
+
+        return attempts[0].result()
+
+    session.request = request
+
+    return hclient
@@ -0,0 +1,122 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module chooses the least loaded server out of several candidates.
+
+Every candidate gets a load per dimension: mean CPU usage, mean network
+and disk bandwidth and the number of floating IPs assigned to it. Loads are
+divided by the highest load of all candidates, so dimensions with different
+units can be weighted against each other. Unknown loads count as highest.
+"""
+
+# Import dataclass
+from dataclasses import dataclass, field
+
+# Import isnan to skip missing samples
+from math import isnan
+
+# Import local constants
+from ..utils import constants
+
+# Dimensions taken from metrics
+METRICS_DIMENSIONS = ("cpu", "network", "disk")
+
+
+def load_from_time_series(time_series: dict[str, dict]) -> dict[str, float]:
+    """Get the mean load per metrics type.
+
+    CPU is the mean of the 'cpu' series. Network and disk are the sums of
+    the means of their bandwidth series, e.g. 'network.0.bandwidth.in'.
+
+    Parameters
+    ----------
+    time_series : dict[str, dict]
+                  Series by name, as returned by the metrics API.
+
+    Returns
+    -------
+    dict[str, float]: Load by metrics type, types without samples are left out.
+    """
+    load = {}
+    for key, data in time_series.items():
+        metrics_type = key.split(".", 1)[0]
+        if key != "cpu" and "bandwidth" not in key:
+            continue
+
+        samples = []
+        for _, value in data.get("values", []):
+            try:
+                sample = float(value)
+            except (TypeError, ValueError):
+                continue
+            if not isnan(sample):
+                samples.append(sample)
+        if samples:
+            load[metrics_type] = load.get(metrics_type, 0.0) + sum(samples) / len(samples)
+
+    return load
+
+
+@dataclass
+class Candidate:
+    """This class describes a server a resource could be moved to."""
+
+    name: str
+    healthy: bool = True
+    floating_ips: int = 0
+    # Mean load by metrics type, missing types are unknown
+    load: dict[str, float] = field(default_factory=dict)
+    score: float | None = None
+
+    def describe(self) -> str:
+        """Describe this candidate in one line."""
+        if not self.healthy:
+            return f"{self.name}: unhealthy"
+
+        loads = ", ".join(f"{key} {value:.1f}" for key, value in sorted(self.load.items()))
+        return f"{self.name}: score {self.score:.2f} ({loads or 'no metrics'}, {self.floating_ips} floating IPs)"
+
+
+def score_candidates(
+    candidates: list[Candidate],
+    weights: dict[str, float] = constants.PLACEMENT_WEIGHTS,
+    use_metrics: bool = True,
+) -> list[Candidate]:
+    """Score healthy candidates, lower is less loaded.
+
+    Parameters
+    ----------
+    candidates : list[Candidate]
+                 Servers to compare.
+    weights : dict[str, float], optional
+              Weight by dimension, including 'floating_ips'.
+    use_metrics : bool, optional
+                  Take CPU, network and disk loads into account.
+
+    Returns
+    -------
+    list[Candidate]: Healthy candidates ordered by score, ties keep their order.
+    """
+    healthy = [candidate for candidate in candidates if candidate.healthy]
+    dimensions = [*METRICS_DIMENSIONS, "floating_ips"] if use_metrics else ["floating_ips"]
+
+    peaks = {}
+    for dimension in dimensions:
+        values = [_load(candidate, dimension) for candidate in healthy]
+        peaks[dimension] = max((value for value in values if value is not None), default=0.0)
+
+    for candidate in healthy:
+        candidate.score = 0.0
+        for dimension in dimensions:
+            value = _load(candidate, dimension)
+            relative = 1.0 if value is None else (value / peaks[dimension] if peaks[dimension] else 0.0)
+            candidate.score += weights.get(dimension, 0.0) * relative
+
+    return sorted(healthy, key=lambda candidate: candidate.score)
+
+
+def _load(candidate: Candidate, dimension: str) -> float | None:
+    """Get the load of a candidate in one dimension or None if it is unknown."""
+    if dimension == "floating_ips":
+        return float(candidate.floating_ips)
+    return candidate.load.get(dimension)
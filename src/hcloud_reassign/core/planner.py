@@ -0,0 +1,77 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module compares desired and current assignments of sections.
+
+A plan lists every selected section, whether it needs a change and how
+many API calls applying it will cost. Unchanged sections are skipped.
+"""
+
+# Import dataclass
+from dataclasses import dataclass, field
+
+# Import ceil for the estimate of action polls
+from math import ceil
+
+# Import local constants
+from ..utils import constants
+
+
+@dataclass
+class PlanItem:
+    """This class describes the desired change of one resource."""
+
+    resource: str
+    desired: str
+    current: str | None = None
+    # False if the current assignment is unknown, e.g. for cached IDs
+    known: bool = True
+    # Calls creating actions, e.g. assign
+    action_calls: int = 1
+    # Name of the configuration section
+    section: str = ""
+
+    @property
+    def changed(self) -> bool:
+        """Check if applying this item issues API calls."""
+        return not self.known or self.current != self.desired
+
+    def describe(self) -> str:
+        """Describe this item in one line."""
+        current = self.current if self.known else "?"
+        if not self.changed:
+            return f"{self.section}: {self.resource} on {current} (unchanged)"
+
+        return f"{self.section}: {self.resource} {current or '-'} -> {self.desired} ({self.action_calls} calls)"
+
+
+@dataclass
+class Plan:
+    """This class collects plan items and estimates API calls."""
+
+    items: list[PlanItem] = field(default_factory=list)
+    lookup_calls: int = 0
+
+    @property
+    def changed(self) -> list[PlanItem]:
+        """Get items that need API calls."""
+        return [item for item in self.items if item.changed]
+
+    @property
+    def action_calls(self) -> int:
+        """Count calls creating actions."""
+        return sum(item.action_calls for item in self.changed)
+
+    @property
+    def poll_calls(self) -> int:
+        """Estimate the minimum of batched action polls."""
+        return ceil(self.action_calls / constants.ACTION_POLL_BATCH)
+
+    def describe(self) -> str:
+        """Describe the plan and its API call estimate."""
+        lines = [item.describe() for item in self.items]
+        lines.append(
+            f"API calls: {self.lookup_calls} lookups, {self.action_calls} changes, "
+            f"at least {self.poll_calls} action polls"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,257 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module schedules API requests within the Hetzner Cloud rate limit.
+
+A token bucket is fed by the RateLimit-Limit, RateLimit-Remaining and
+RateLimit-Reset response headers. It refills so that it is full at the
+reset time, and a request answered with 429 empties it until the API
+refills it. Requests changing resources may use the
+whole budget, while action polls, lookups and metrics queries leave a
+growing reserve for them. The bucket can be shared between processes
+through a lock-protected state file.
+"""
+
+# Import fcntl to lock the state file
+import fcntl
+
+# Import json for the state file format
+import json
+
+# Import os for file handling
+import os
+
+# Import threading for concurrent sections
+from threading import Lock
+
+# Import time functions
+from time import sleep, time
+
+# Import urlparse to classify requests
+from urllib.parse import urlparse
+
+# Import local utilities
+from ..utils import constants
+from .base import HcloudClient, client_session
+from . import deadline
+from .cache import default_cache_dir, project_key
+
+# Tokens each priority has to leave in the bucket
+RATE_LIMIT_RESERVE = {
+    constants.PRIORITY_ACTION: 0,
+    constants.PRIORITY_POLL: 10,
+    constants.PRIORITY_LOOKUP: 50,
+    constants.PRIORITY_METRICS: 200,
+}
+
+
+def request_priority(method: str, url: str) -> int:
+    """Classify a request.
+
+    Parameters
+    ----------
+    method : str
+             HTTP method.
+    url : str
+          Request URL.
+
+    Returns
+    -------
+    int: Request priority, lower numbers are more important.
+    """
+    path = urlparse(url).path.rstrip("/")
+    if method.upper() != "GET":
+        return constants.PRIORITY_ACTION
+    if path.endswith("/actions") or "/actions/" in path:
+        return constants.PRIORITY_POLL
+    if path.endswith("/metrics"):
+        return constants.PRIORITY_METRICS
+
+    return constants.PRIORITY_LOOKUP
+
+
+class RateLimiter:
+    """This class is a token bucket for API requests."""
+
+    def __init__(
+        self,
+        limit: int = constants.RATE_LIMIT_DEFAULT_LIMIT,
+        period: float = constants.RATE_LIMIT_DEFAULT_PERIOD,
+        state_path: str | None = None,
+        reserve: dict[int, float] | None = None,
+    ) -> None:
+        """Initialize a full bucket.
+
+        Parameters
+        ----------
+        limit : int, optional
+                Bucket size, updated from RateLimit-Limit.
+        period : float, optional
+                 Seconds to refill an empty bucket.
+        state_path : str | None, optional
+                     State file shared with other processes.
+        reserve : dict[int, float] | None, optional
+                  Tokens each priority has to leave in the bucket.
+        """
+        self.period = period
+        self.state_path = state_path
+        self.reserve = reserve if reserve is not None else RATE_LIMIT_RESERVE
+        # Reset is the Unix time the API announced the bucket to be full again
+        self.state = {"limit": limit, "tokens": float(limit), "updated": time(), "reset": 0.0}
+        self.__lock = Lock()
+
+    @classmethod
+    def from_client_section(cls, client: dict) -> "RateLimiter | None":
+        """Create a rate limiter from client section options.
+
+        Parameters
+        ----------
+        client : dict
+                 Dictionary of client section information.
+
+        Returns
+        -------
+        RateLimiter | None: None if disabled by 'rate_limit = false'.
+        """
+        if str(client.get(constants.CONFIG_OPTION_RATE_LIMIT, "true")).lower() in ("false", "no", "off", "0"):
+            return None
+
+        state_path = client.get(constants.CONFIG_OPTION_RATE_LIMIT_STATE)
+        if not state_path:
+            key = project_key(
+                token=client.get(constants.CONFIG_OPTION_API_TKN) or "",
+                url=client.get(constants.CONFIG_OPTION_API_URL) or constants.CONFIG_DEFAULT_API_URL,
+            )
+            directory = client.get(constants.CONFIG_OPTION_CACHE_PATH) or default_cache_dir()
+            state_path = os.path.join(directory, f"{key}.ratelimit")
+
+        return cls(state_path=state_path)
+
+    def __rate(self, state: dict) -> float:
+        """Get the tokens added per second, so the bucket is full at the reset time."""
+        reset = state.get("reset") or 0.0
+        if reset > state["updated"] and state["tokens"] < state["limit"]:
+            return (state["limit"] - state["tokens"]) / (reset - state["updated"])
+        return state["limit"] / self.period
+
+    def __refill(self, state: dict, now: float) -> None:
+        """Add tokens for the time passed since the last update."""
+        rate = self.__rate(state)
+        state["tokens"] = min(state["limit"], state["tokens"] + (now - state["updated"]) * rate)
+        state["updated"] = now
+
+    def __transaction(self, change) -> object:
+        """Apply a change to the state, shared with other processes if configured."""
+        with self.__lock:
+            if not self.state_path:
+                return change(self.state)
+
+            os.makedirs(os.path.dirname(self.state_path) or ".", mode=0o700, exist_ok=True)
+            with open(os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o600), "r+", encoding="utf-8") as state_file:
+                fcntl.flock(state_file, fcntl.LOCK_EX)
+                try:
+                    try:
+                        self.state = json.loads(state_file.read() or "null") or self.state
+                    except ValueError:
+                        pass
+                    result = change(self.state)
+                    state_file.seek(0)
+                    state_file.truncate()
+                    state_file.write(json.dumps(self.state))
+                    return result
+                finally:
+                    fcntl.flock(state_file, fcntl.LOCK_UN)
+
+    def try_acquire(self, priority: int = constants.PRIORITY_LOOKUP) -> float:
+        """Take a token if the priority may use the remaining budget.
+
+        Parameters
+        ----------
+        priority : int, optional
+                   Request priority.
+
+        Returns
+        -------
+        float: 0 if a token was taken, otherwise seconds to wait before trying again.
+        """
+
+        def take(state: dict) -> float:
+            self.__refill(state, time())
+            needed = 1 + min(self.reserve.get(priority, 0), state["limit"] - 1)
+            if state["tokens"] >= needed:
+                state["tokens"] -= 1
+                return 0.0
+            return (needed - state["tokens"]) / self.__rate(state)
+
+        return self.__transaction(take)
+
+    def acquire(self, priority: int = constants.PRIORITY_LOOKUP) -> None:
+        """Wait until a token can be taken, at most until the deadline of the calling thread.
+
+        Parameters
+        ----------
+        priority : int, optional
+                   Request priority.
+
+        Raises
+        ------
+        DeadlineExceeded: The deadline passed before a token could be taken.
+        """
+        while True:
+            wait = self.try_acquire(priority)
+            if not wait:
+                return
+            pause = deadline.clip(wait)
+            if pause <= 0:
+                raise deadline.DeadlineExceeded(f"Deadline passed waiting {wait:.1f}s for the rate limit.")
+            sleep(pause)
+
+    def update(self, headers: dict, status: int | None = None) -> None:
+        """Update the bucket from RateLimit response headers.
+
+        Parameters
+        ----------
+        headers : dict
+                  Response headers.
+        status : int | None, optional
+                 HTTP status code, 429 empties the bucket until the reset time.
+        """
+        limited = status == 429
+        if "RateLimit-Remaining" not in headers and not limited:
+            return
+
+        def set_remaining(state: dict) -> None:
+            state["limit"] = int(headers.get("RateLimit-Limit", state["limit"]))
+            state["tokens"] = 0.0 if limited else float(headers.get("RateLimit-Remaining", state["tokens"]))
+            state["updated"] = time()
+            try:
+                state["reset"] = float(headers.get("RateLimit-Reset", 0))
+            except ValueError:
+                state["reset"] = 0.0
+
+        self.__transaction(set_remaining)
+
+    def install(self, hclient: HcloudClient) -> HcloudClient:
+        """Schedule all requests of a client through this rate limiter.
+
+        Parameters
+        ----------
+        hclient : HcloudClient
+                  Client to schedule requests for.
+
+        Returns
+        -------
+        HcloudClient: The same client.
+        """
+        session = client_session(hclient)
+        send = session.request
+
+        def request(method, url, *args, **kwargs):
+            self.acquire(request_priority(method, url))
+            response = send(method, url, *args, **kwargs)
+            self.update(response.headers, response.status_code)
+            return response
+
+        session.request = request
+
+        return hclient
@@ -0,0 +1,312 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides a relay reassigning sections on signed requests of nodes.
+
+The relay runs on a trusted host holding the API token. Nodes, e.g. the
+keepalived instances of a cluster, only hold a secret of their own and may
+only reassign the sections they are permitted to. A request is a signed
+JSON object, see hcloud_reassign.utils.signing, posted to RELAY_PATH.
+
+Requests are rejected if the node is unknown, the signature does not
+match, the timestamp is older than RELAY_MAX_AGE or the nonce was seen
+before. Bodies larger than RELAY_MAX_BODY are rejected before they are
+read. Accepted requests are reassigned right away by a warm daemon,
+which also coalesces flapping requests of a section.
+
+Nodes are configured in an INI file, one section per node. Secrets follow
+the rule of hcloud_reassign.utils.signing.normalize_secret:
+
+    [lb-01]
+    secret=<random string>
+    sections=floating.web, floating.db-*
+"""
+
+# Import ConfigParser for the nodes file
+from configparser import ConfigParser
+
+# Import dataclass
+from dataclasses import dataclass
+
+# Import fnmatch for section patterns
+from fnmatch import fnmatchcase
+
+# Import json for requests and answers
+import json
+
+# Import threading for the nonce cache
+from threading import Lock
+
+# Import time to check request ages
+import time
+
+# Import the HTTP server only for type checking, it is loaded when serving
+from typing import TYPE_CHECKING
+
+# Import local utilities
+from ..utils import constants
+from ..utils.signing import normalize_secret, verify
+from ..utils.structures import status_message
+from .daemon import ReassignDaemon
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+class RelayError(Exception):
+    """This exception rejects a relay request with an HTTP status code."""
+
+    def __init__(self, status: int, message: str) -> None:
+        """Initialize a rejection.
+
+        Parameters
+        ----------
+        status : int
+                 HTTP status code.
+        message : str
+                  Reason sent to the node.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class RelayNode:
+    """This class describes a node and the sections it may reassign."""
+
+    name: str
+    secret: bytes
+    # Section names or shell-style patterns like 'floating.*'
+    sections: tuple[str, ...]
+
+    def allows(self, section: str) -> bool:
+        """Check if the node may reassign a section."""
+        return any(fnmatchcase(section, pattern) for pattern in self.sections)
+
+
+def load_nodes(path: str) -> dict[str, RelayNode]:
+    """Read the nodes file.
+
+    Parameters
+    ----------
+    path : str
+           Path to the INI file, one section per node with 'secret' and 'sections'.
+
+    Returns
+    -------
+    dict[str, RelayNode]: Nodes by name.
+
+    Raises
+    ------
+    ValueError: A node has no secret or no sections.
+    """
+    config = ConfigParser()
+    config.read(filenames=path, encoding="utf-8")
+
+    nodes = {}
+    for name in config.sections():
+        secret = config.get(name, "secret", fallback="")
+        sections = tuple(item.strip() for item in config.get(name, "sections", fallback="").split(",") if item.strip())
+        if not secret or not sections:
+            raise ValueError(f"Node '{name}' needs the options 'secret' and 'sections'.")
+        nodes[name] = RelayNode(name=name, secret=normalize_secret(secret.encode("utf-8")), sections=sections)
+
+    return nodes
+
+
+class NonceCache:
+    """This class remembers nonces as long as their requests are valid."""
+
+    def __init__(self, max_age: float = constants.RELAY_MAX_AGE) -> None:
+        """Initialize an empty cache.
+
+        Parameters
+        ----------
+        max_age : float, optional
+                  Seconds a request stays valid.
+        """
+        self.max_age = max_age
+        self.__lock = Lock()
+        self.__seen: dict[tuple[str, str], float] = {}
+
+    def add(self, node: str, nonce: str, now: float | None = None) -> bool:
+        """Remember a nonce.
+
+        Parameters
+        ----------
+        node : str
+               Name of the node.
+        nonce : str
+                Nonce of the request.
+        now : float | None, optional
+              Unix time, now if omitted.
+
+        Returns
+        -------
+        bool: False if the nonce was seen before.
+        """
+        now = time.time() if now is None else now
+        with self.__lock:
+            self.__seen = {key: seen for key, seen in self.__seen.items() if now - seen <= 2 * self.max_age}
+            if (node, nonce) in self.__seen:
+                return False
+            self.__seen[(node, nonce)] = now
+            return True
+
+
+class ReassignRelay:
+    """This class checks signed requests and passes them to a daemon."""
+
+    def __init__(
+        self, daemon: ReassignDaemon, nodes: dict[str, RelayNode], max_age: float = constants.RELAY_MAX_AGE
+    ) -> None:
+        """Initialize the relay.
+
+        Parameters
+        ----------
+        daemon : ReassignDaemon
+                 Daemon holding the warm client and sections.
+        nodes : dict[str, RelayNode]
+                Permitted nodes by name.
+        max_age : float, optional
+                  Seconds a signed request stays valid.
+        """
+        self.daemon = daemon
+        self.nodes = nodes
+        self.max_age = max_age
+        self.nonces = NonceCache(max_age=max_age)
+
+    def authorize(self, body: bytes, signed: str, now: float | None = None) -> tuple[str, str, str]:
+        """Check a request.
+
+        Parameters
+        ----------
+        body : bytes
+               Exact request body.
+        signed : str
+                 Signature header.
+        now : float | None, optional
+              Unix time, now if omitted.
+
+        Returns
+        -------
+        tuple[str, str, str]: Node, section and direction.
+
+        Raises
+        ------
+        RelayError: The request is rejected.
+        """
+        try:
+            request = json.loads(body)
+            node = self.nodes.get(request["node"])
+        except (ValueError, KeyError, TypeError) as err:
+            raise RelayError(400, "invalid request") from err
+
+        # Nothing in the request is trusted before the signature is checked
+        try:
+            valid = node is not None and verify(node.secret, body, signed)
+        except (TypeError, ValueError) as err:
+            # compare_digest only takes ASCII signatures
+            raise RelayError(403, "invalid signature") from err
+        if not valid:
+            raise RelayError(403, "invalid signature")
+
+        section, direction = request.get("section"), request.get("direction")
+        timestamp, nonce = request.get("timestamp"), request.get("nonce")
+        if not all(isinstance(value, str) for value in (section, nonce)) or not isinstance(timestamp, int):
+            raise RelayError(400, "invalid request")
+        if direction not in ["src", "dest"]:
+            raise RelayError(400, "invalid request")
+
+        now = time.time() if now is None else now
+        if abs(now - timestamp) > self.max_age:
+            raise RelayError(403, "request expired")
+        if not self.nonces.add(node.name, nonce, now=now):
+            raise RelayError(403, "request replayed")
+        if not node.allows(section):
+            raise RelayError(403, f"node '{node.name}' may not reassign '{section}'")
+        if section not in self.daemon.sections:
+            raise RelayError(404, f"unknown section '{section}'")
+
+        return node.name, section, direction
+
+    def handle(self, body: bytes, signed: str) -> tuple[int, dict]:
+        """Check a request and reassign its section.
+
+        Parameters
+        ----------
+        body : bytes
+               Exact request body.
+        signed : str
+                 Signature header.
+
+        Returns
+        -------
+        tuple[int, dict]: HTTP status code and JSON answer.
+        """
+        try:
+            node, section, direction = self.authorize(body=body, signed=signed)
+        except RelayError as err:
+            print(f"relay: rejected request: {err}")
+            return err.status, {"error": str(err)}
+
+        status = self.daemon.events.submit(section, direction).result()
+        answer = constants.DAEMON_ANSWER_SUPERSEDED if status is None else status_message[status]
+        print(f"relay: {node}: {section} {direction}: {answer}")
+
+        return 200, {"section": section, "status": answer}
+
+    def serve(self, port: int = constants.RELAY_DEFAULT_PORT, address: str = "") -> "ThreadingHTTPServer":
+        """Create an HTTP server for signed requests, call its serve_forever to handle them.
+
+        Parameters
+        ----------
+        port : int, optional
+               TCP port, 0 picks a free one.
+        address : str, optional
+                  Address to listen on, all addresses if empty.
+
+        Returns
+        -------
+        ThreadingHTTPServer
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        relay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Pass posted requests to the relay."""
+
+            def do_POST(self) -> None:
+                """Answer a signed request."""
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    length = -1
+
+                if self.path != constants.RELAY_PATH:
+                    status, answer = 404, {"error": "not found"}
+                elif length < 0:
+                    status, answer = 400, {"error": "invalid request"}
+                elif length > constants.RELAY_MAX_BODY:
+                    # Unread bodies must not be taken for the next request on the connection
+                    self.close_connection = True
+                    status, answer = 413, {"error": "request too large"}
+                else:
+                    body = self.rfile.read(length)
+                    status, answer = relay.handle(body, self.headers.get(constants.RELAY_SIGNATURE_HEADER, ""))
+
+                payload = json.dumps(answer).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                """Do not log every request, the relay logs reassignments."""
+
+        server = ThreadingHTTPServer((address, port), Handler)
+        server.daemon_threads = True
+
+        return server
@@ -0,0 +1,123 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides an in-memory snapshot of project resources.
+
+Instead of looking up every server and floating IP by name, the snapshot
+lists all resources of a type with one paginated list call and indexes them.
+"""
+
+# Import typing helpers
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+# Import local utilities only for type checking, base imports this module
+if TYPE_CHECKING:
+    from .base import HcloudClient
+
+# Resource types listed by default
+SNAPSHOT_DEFAULT_KINDS = ("servers", "floating_ips")
+
+
+class ProjectSnapshot:
+    """This class indexes resources of a project by name and ID."""
+
+    def __init__(self, hclient: "HcloudClient", kinds: Iterable[str] = SNAPSHOT_DEFAULT_KINDS) -> None:
+        """Initialize an empty snapshot.
+
+        Parameters
+        ----------
+        hclient : HcloudClient
+                  Client used to list resources.
+        kinds : Iterable[str], optional
+                Client attributes to list, e.g. 'servers' or 'floating_ips'.
+        """
+        self.hclient = hclient
+        self.kinds = tuple(kinds)
+        self.by_name: dict[str, dict[str, object]] = {}
+        self.by_id: dict[str, dict[int, object]] = {}
+        self.floating_ips_by_server: dict[int, list] = {}
+
+    def refresh(self) -> "ProjectSnapshot":
+        """List all resources and rebuild the indexes.
+
+        Returns
+        -------
+        ProjectSnapshot: The snapshot itself.
+        """
+        by_name = {}
+        by_id = {}
+        for kind in self.kinds:
+            resources = getattr(self.hclient, kind).get_all()
+            by_name[kind] = {resource.name: resource for resource in resources}
+            by_id[kind] = {resource.id: resource for resource in resources}
+
+        floating_ips_by_server = {}
+        for flip in by_id.get("floating_ips", {}).values():
+            if flip.server is not None:
+                floating_ips_by_server.setdefault(flip.server.id, []).append(flip)
+
+        # Replace indexes at once, readers in other threads never see a partial snapshot
+        self.by_name, self.by_id, self.floating_ips_by_server = by_name, by_id, floating_ips_by_server
+
+        return self
+
+    def has(self, kind: str) -> bool:
+        """Check if the snapshot lists a resource type.
+
+        Parameters
+        ----------
+        kind : str
+               Name of the client attribute.
+
+        Returns
+        -------
+        bool
+        """
+        return kind in self.by_name
+
+    def get(self, kind: str, name: str) -> object | None:
+        """Get a resource by name.
+
+        Parameters
+        ----------
+        kind : str
+               Name of the client attribute.
+        name : str
+               Name of the resource.
+
+        Returns
+        -------
+        object | None: Bound API object or None if it does not exist.
+        """
+        return self.by_name.get(kind, {}).get(name)
+
+    def get_by_id(self, kind: str, resource_id: int) -> object | None:
+        """Get a resource by ID.
+
+        Parameters
+        ----------
+        kind : str
+               Name of the client attribute.
+        resource_id : int
+                      ID of the resource.
+
+        Returns
+        -------
+        object | None: Bound API object or None if it does not exist.
+        """
+        return self.by_id.get(kind, {}).get(resource_id)
+
+    def server_floating_ips(self, server_id: int) -> list:
+        """Get floating IPs assigned to a server.
+
+        Parameters
+        ----------
+        server_id : int
+                    ID of the server.
+
+        Returns
+        -------
+        list: Bound floating IP objects.
+        """
+        return list(self.floating_ips_by_server.get(server_id, []))
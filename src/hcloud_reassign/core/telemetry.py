@@ -0,0 +1,365 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module records counters and latency histograms of reassignments.
+
+Reassignments are timed as a whole and per phase: resolving resources,
+the assign call and waiting for the action. Every API request is timed by
+method, endpoint and status code once a client is instrumented. Metrics
+are exported in the OpenMetrics text format, either written to a file,
+e.g. for the node exporter textfile collector, or served over HTTP.
+"""
+
+# Import abc for the metric base class
+from abc import ABC, abstractmethod
+
+# Import os for atomic file writes
+import os
+
+# Import re to template endpoints
+import re
+
+# Import threading for concurrent sections
+from threading import Lock, Thread
+
+# Import typing helpers
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from time import perf_counter
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+# Import the HTTP server only for type checking, it is loaded when serving
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Upper bounds of histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+# Content type of the OpenMetrics text format
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Format labels, escaping backslashes, quotes and newlines."""
+    if not labels:
+        return ""
+
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value or bucket bound."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    """This class holds the name, help text and label names of a metric."""
+
+    metric_type = "unknown"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()) -> None:
+        """Initialize a metric.
+
+        Parameters
+        ----------
+        name : str
+               Metric name without suffixes like '_total'.
+        documentation : str
+                        Help text.
+        labels : Iterable[str], optional
+                 Label names.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """Get label values in label name order."""
+        if set(labels) != set(self.labels):
+            raise ValueError(f"Metric '{self.name}' needs the labels {self.labels}, got {tuple(labels)}.")
+        return tuple(str(labels[label]) for label in self.labels)
+
+    @abstractmethod
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Get samples as suffix, labels and value."""
+
+
+class Counter(_Metric):
+    """This class counts events by label values."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()) -> None:
+        """Initialize a counter, see _Metric."""
+        super().__init__(name=name, documentation=documentation, labels=labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter.
+
+        Parameters
+        ----------
+        amount : float, optional
+                 Non-negative increment.
+        **labels : str
+                   Label values.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Get the current value for label values."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Get samples as suffix, labels and value."""
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield "_total", dict(zip(self.labels, key)), value
+
+
+class Histogram(_Metric):
+    """This class counts observations into cumulative buckets by label values."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labels: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> None:
+        """Initialize a histogram.
+
+        Parameters
+        ----------
+        name : str
+               Metric name.
+        documentation : str
+                        Help text.
+        labels : Iterable[str], optional
+                 Label names, 'le' is reserved.
+        buckets : Iterable[float], optional
+                  Ascending upper bounds, '+Inf' is added if missing.
+        """
+        super().__init__(name=name, documentation=documentation, labels=labels)
+        self.buckets = tuple(sorted(set(buckets) | {float("inf")}))
+        self._observations: dict[tuple[str, ...], tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Add an observation.
+
+        Parameters
+        ----------
+        value : float
+                Observed value, usually seconds.
+        **labels : str
+                   Label values.
+        """
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._observations.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._observations[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of a block in seconds."""
+        begin = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - begin, **labels)
+
+    def count(self, **labels: str) -> int:
+        """Get the number of observations for label values."""
+        with self._lock:
+            counts, _ = self._observations.get(self._key(labels), ([0], 0.0))
+            return counts[-1]
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Get samples as suffix, labels and value."""
+        with self._lock:
+            observations = {key: (list(counts), total) for key, (counts, total) in self._observations.items()}
+        for key, (counts, total) in sorted(observations.items()):
+            labels = dict(zip(self.labels, key))
+            for bound, count in zip(self.buckets, counts):
+                yield "_bucket", {**labels, "le": _format_value(bound)}, count
+            yield "_count", labels, counts[-1]
+            yield "_sum", labels, total
+
+
+class Registry:
+    """This class holds metrics and exports them in the OpenMetrics text format."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._lock = Lock()
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        """Add a metric or return the one registered under its name."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Counter:
+        """Get or create a counter, see Counter."""
+        return self._register(Counter(name=name, documentation=documentation, labels=labels))
+
+    def histogram(
+        self, name: str, documentation: str, labels: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram, see Histogram."""
+        return self._register(Histogram(name=name, documentation=documentation, labels=labels, buckets=buckets))
+
+    def expose(self) -> str:
+        """Export all metrics.
+
+        Returns
+        -------
+        str: OpenMetrics text, terminated by '# EOF'.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        lines.append("# EOF")
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Write all metrics to a file, replacing it atomically.
+
+        Parameters
+        ----------
+        path : str
+               Path of the file, e.g. in the textfile directory of the node exporter.
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as textfile:
+            textfile.write(self.expose())
+        os.replace(temp_path, path)
+
+    def serve(self, port: int, address: str = "") -> "ThreadingHTTPServer":
+        """Serve all metrics over HTTP in a background thread.
+
+        Parameters
+        ----------
+        port : int
+               TCP port, 0 picks a free one.
+        address : str, optional
+                  Address to listen on, all addresses if empty.
+
+        Returns
+        -------
+        ThreadingHTTPServer: Running server, call shutdown to stop it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answer every GET request with the metrics."""
+
+            def do_GET(self) -> None:
+                """Write the metrics."""
+                body = registry.expose().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                """Do not log every scrape."""
+
+        server = ThreadingHTTPServer((address, port), Handler)
+        server.daemon_threads = True
+        Thread(target=server.serve_forever, name="telemetry", daemon=True).start()
+
+        return server
+
+
+def endpoint(url: str) -> str:
+    """Get the path of a request with numeric IDs replaced by '{id}'.
+
+    Parameters
+    ----------
+    url : str
+          Request URL.
+
+    Returns
+    -------
+    str: e.g. '/v1/floating_ips/{id}/actions/assign'.
+    """
+    return re.sub(r"/\d+(?=/|$)", "/{id}", urlparse(url).path.rstrip("/"))
+
+
+# Metrics of this package
+registry = Registry()
+reassign_seconds = registry.histogram(
+    "hcloud_reassign_reassign_seconds", "Duration of reassigning a section by status.", ("section", "status")
+)
+phase_seconds = registry.histogram(
+    "hcloud_reassign_phase_seconds", "Duration of reassignment phases by section type.", ("type", "phase")
+)
+api_request_seconds = registry.histogram(
+    "hcloud_reassign_api_request_seconds", "Duration of API requests.", ("method", "endpoint", "code")
+)
+retries = registry.counter("hcloud_reassign_retries", "Requests repeated after an error.", ("reason",))
+hedged_requests = registry.counter("hcloud_reassign_hedged_requests", "Slow reads sent a second time.", ("endpoint",))
+deadlines_exceeded = registry.counter(
+    "hcloud_reassign_deadlines_exceeded", "Reassignments stopped by their deadline.", ("type",)
+)
+action_timeouts = registry.counter(
+    "hcloud_reassign_action_timeouts", "Actions not finished within their timeout.", ("type",)
+)
+
+
+def instrument(hclient):
+    """Time all requests of a client by method, endpoint and status code.
+
+    Parameters
+    ----------
+    hclient : HcloudClient
+              Client to instrument.
+
+    Returns
+    -------
+    HcloudClient: The same client.
+    """
+    # Import here, base records phases of this module
+    from .base import client_session
+
+    session = client_session(hclient)
+    send = session.request
+
+    def request(method, url, *args, **kwargs):
+        begin = perf_counter()
+        code = "error"
+        try:
+            response = send(method, url, *args, **kwargs)
+            code = str(response.status_code)
+            return response
+        finally:
+            api_request_seconds.observe(
+                perf_counter() - begin, method=method.upper(), endpoint=endpoint(url), code=code
+            )
+
+    session.request = request
+
+    return hclient
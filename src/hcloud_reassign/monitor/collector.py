@@ -0,0 +1,256 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module collects metrics of many servers concurrently.
+
+All servers are resolved with one list call. Metrics are then fetched by a
+bounded pool of workers, one request per server covering all metric types,
+and results are streamed back as soon as a server is done.
+"""
+
+# Import time helpers
+import time
+from datetime import datetime, timedelta
+
+# Import typing helpers
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+# Import thread pool
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Import connection errors of the API client
+from requests import RequestException
+
+# Import utilities
+from ..core.base import HcloudClient, HcloudException, HcloudReassignIni
+from ..core.executor import make_shared_client
+from ..core.snapshot import ProjectSnapshot
+from ..utils import constants
+from ..utils.types import TimeNow_t, HcloudMetric_t
+from .metrics import check_timedata, fetch_time_series
+from .store import MetricsStore
+
+# Import columnar series only for type checking, numpy is optional
+if TYPE_CHECKING:
+    from .series import MetricsFrame
+
+
+@dataclass
+class MetricsResult:
+    """Metrics of one server or the error that prevented fetching them."""
+
+    server: str
+    time_series: dict[str, dict] = field(default_factory=dict)
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Check if the metrics were fetched."""
+        return self.error is None
+
+    @property
+    def data(self) -> list:
+        """Get the series as a list, like HCloudMetricsServer returns them."""
+        return list(self.time_series.values())
+
+    def frame(self) -> "MetricsFrame":
+        """Get the series as columnar float64 arrays, needs numpy."""
+        from .series import MetricsFrame
+
+        return MetricsFrame.from_time_series(self.time_series)
+
+
+class MetricsCollector:
+    """This class fetches metrics of many servers with a bounded worker pool."""
+
+    def __init__(
+        self,
+        hclient: HcloudClient,
+        workers: int = constants.DEFAULT_WORKERS,
+        store: MetricsStore | None = None,
+    ) -> None:
+        """Initialize a collector.
+
+        Parameters
+        ----------
+        hclient : HcloudClient
+                  Client shared by all workers. Its connection pool should
+                  be at least as wide as the number of workers.
+        workers : int, optional
+                  Number of servers fetched at the same time.
+        store : MetricsStore | None, optional
+                On-disk store of samples, only missing intervals are fetched.
+        """
+        self.hclient = hclient
+        self.workers = max(1, workers)
+        self.store = store
+
+    @classmethod
+    def from_config(cls, config: HcloudReassignIni, workers: int = constants.DEFAULT_WORKERS) -> "MetricsCollector":
+        """Create a collector from a configuration file.
+
+        Parameters
+        ----------
+        config : HcloudReassignIni
+                 Parsed configuration file.
+        workers : int, optional
+                  Number of servers fetched at the same time.
+
+        Returns
+        -------
+        MetricsCollector
+        """
+        store_path = config.client_section_dict.get(constants.CONFIG_OPTION_METRICS_STORE)
+        return cls(
+            hclient=make_shared_client(config=config, workers=workers),
+            workers=workers,
+            store=MetricsStore(path=store_path) if store_path else None,
+        )
+
+    def resolve(self, servers: Iterable[str]) -> dict[str, object]:
+        """Resolve server names with one list call.
+
+        Parameters
+        ----------
+        servers : Iterable[str]
+                  Names of the servers.
+
+        Returns
+        -------
+        dict[str, object]: Bound server objects by name, unknown names are left out.
+        """
+        snapshot = ProjectSnapshot(hclient=self.hclient, kinds=("servers",)).refresh()
+        return {name: snapshot.get("servers", name) for name in servers if snapshot.get("servers", name) is not None}
+
+    def __fetch(self, name: str, server: object, metrics_types: list[str], start: str, end: str, step: float) -> dict:
+        """Fetch metrics of one server."""
+        return fetch_time_series(
+            hclient=self.hclient,
+            server=server,
+            metrics_types=metrics_types,
+            start=start,
+            end=end,
+            step=step,
+            store=self.store,
+        )
+
+    def collect(
+        self,
+        servers: Iterable[str],
+        metrics_type: HcloudMetric_t | list[HcloudMetric_t],
+        interval: tuple[str, str] | TimeNow_t = "now",
+        step: float = 10,
+        resolved: dict[str, object] | None = None,
+    ) -> Iterator[MetricsResult]:
+        """Fetch metrics of servers concurrently.
+
+        Parameters
+        ----------
+        servers : Iterable[str]
+                  Names of the servers as defined in the Hetzner Cloud Console.
+        metrics_type : HcloudMetric_t | list[HcloudMetric_t]
+                       Word or list of HCloud metrics. Choose between 'cpu',
+                       'network' and 'disk'
+        interval : tuple[str, str] | TimeNow_t, optional
+                   default: 'now'
+                   A tuple containing ISO8601 formatted datetime strings.
+        step : float, optional
+               default: 10 seconds
+               Minimal length of the interval in seconds.
+        resolved : dict[str, object] | None, optional
+                   Bound server objects by name, see resolve.
+                   Servers are listed if omitted.
+
+        Yields
+        ------
+        MetricsResult: Metrics of one server, in order of completion.
+        """
+        start, end = check_timedata(interval=interval, step=step)
+        metrics_types = [metrics_type] if isinstance(metrics_type, str) else list(metrics_type)
+        servers = list(dict.fromkeys(servers))
+        if resolved is None:
+            resolved = self.resolve(servers)
+
+        for name in servers:
+            if name not in resolved:
+                yield MetricsResult(server=name, error=LookupError(f"Server '{name}' does not exist."))
+        resolved = {name: resolved[name] for name in servers if name in resolved}
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(resolved)))) as pool:
+            futures = {
+                pool.submit(self.__fetch, name, server, metrics_types, start, end, step): name
+                for name, server in resolved.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    result = MetricsResult(server=name, time_series=future.result())
+                except (HcloudException, RequestException) as err:
+                    # A failing or unreachable request only loses the metrics of its server
+                    result = MetricsResult(server=name, error=err)
+                yield result
+
+    def follow(
+        self,
+        servers: Iterable[str],
+        metrics_type: HcloudMetric_t | list[HcloudMetric_t],
+        step: float = 10,
+        polls: int | None = None,
+        sleep=time.sleep,
+    ) -> Iterator[MetricsResult]:
+        """Poll metrics of servers and yield only samples not seen before.
+
+        Servers are resolved once. Every step the last 30 minutes are
+        requested again, with a metrics store only the missing tail is
+        fetched from the API.
+
+        Parameters
+        ----------
+        servers : Iterable[str]
+                  Names of the servers as defined in the Hetzner Cloud Console.
+        metrics_type : HcloudMetric_t | list[HcloudMetric_t]
+                       Word or list of HCloud metrics.
+        step : float, optional
+               default: 10 seconds
+               Seconds between polls and resolution of the samples.
+        polls : int | None, optional
+                Number of polls, poll until interrupted if omitted.
+        sleep : Callable, optional
+                Function waiting between polls.
+
+        Yields
+        ------
+        MetricsResult: New samples of one server, in order of completion.
+        """
+        servers = list(dict.fromkeys(servers))
+        resolved = self.resolve(servers)
+        last_seen: dict[tuple[str, str], float] = {}
+
+        poll = 0
+        while polls is None or poll < polls:
+            if poll:
+                sleep(step)
+            poll += 1
+
+            end = datetime.now()
+            start = end - timedelta(seconds=max(1800, step))
+            interval = (start.isoformat(), end.isoformat())
+            for result in self.collect(servers, metrics_type, interval=interval, step=step, resolved=resolved):
+                if result.ok:
+                    result.time_series = {
+                        key: self.__new_samples(result.server, key, data, last_seen)
+                        for key, data in result.time_series.items()
+                    }
+                yield result
+
+    @staticmethod
+    def __new_samples(server: str, key: str, data: dict, last_seen: dict[tuple[str, str], float]) -> dict:
+        """Drop samples up to the last seen timestamp of a series and remember the newest."""
+        seen = last_seen.get((server, key), float("-inf"))
+        values = [sample for sample in data.get("values", []) if float(sample[0]) > seen]
+        if values:
+            last_seen[(server, key)] = max(float(sample[0]) for sample in values)
+
+        return {**data, "values": values}
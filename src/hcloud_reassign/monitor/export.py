@@ -0,0 +1,168 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module writes metrics results as a stream.
+
+Every writer takes one MetricsResult at a time and writes it right away,
+so metrics of many servers never have to be kept in memory at once.
+
+The columnar format is meant for bulk loading. It starts with COLUMNAR_MAGIC
+followed by one frame per series. A frame is a little endian 32 bit length,
+a JSON header of that length with server, series and count, then count
+little endian float64 timestamps followed by count float64 values.
+"""
+
+# Import stream helpers
+import csv
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from typing import BinaryIO, TextIO
+
+# Import utilities
+from .collector import MetricsResult
+
+# Start of a columnar stream, the last byte is the format version
+COLUMNAR_MAGIC = b"HCMETRICS\x01"
+COLUMNAR_LENGTH = struct.Struct("<I")
+
+# Fields of NDJSON and CSV records
+RECORD_FIELDS = ("server", "series", "timestamp", "value")
+
+
+def _value(value) -> float:
+    """Convert a sample value, the API sends them as strings."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def records(result: MetricsResult) -> Iterator[tuple[str, str, float, float]]:
+    """Get one record per sample of a result.
+
+    Parameters
+    ----------
+    result : MetricsResult
+             Metrics of one server.
+
+    Yields
+    ------
+    tuple[str, str, float, float]: Server, series, timestamp and value.
+    """
+    for key, data in result.time_series.items():
+        for timestamp, value in data.get("values", []):
+            yield result.server, key, float(timestamp), _value(value)
+
+
+class NdjsonWriter:
+    """This class writes one JSON object per sample and line."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize a writer on a text stream."""
+        self.stream = stream
+
+    def write(self, result: MetricsResult) -> None:
+        """Write all samples of a result.
+
+        Parameters
+        ----------
+        result : MetricsResult
+                 Metrics of one server.
+        """
+        for record in records(result):
+            self.stream.write(json.dumps(dict(zip(RECORD_FIELDS, record))) + "\n")
+        self.stream.flush()
+
+
+class CsvWriter:
+    """This class writes one CSV row per sample, with a header row first."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize a writer on a text stream."""
+        self.stream = stream
+        self.writer = csv.writer(stream, lineterminator="\n")
+        self.writer.writerow(RECORD_FIELDS)
+
+    def write(self, result: MetricsResult) -> None:
+        """Write all samples of a result.
+
+        Parameters
+        ----------
+        result : MetricsResult
+                 Metrics of one server.
+        """
+        self.writer.writerows(records(result))
+        self.stream.flush()
+
+
+class ColumnarWriter:
+    """This class writes every series as a frame of float64 columns."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Initialize a writer on a binary stream."""
+        self.stream = stream
+        self.stream.write(COLUMNAR_MAGIC)
+
+    @staticmethod
+    def _bytes(column: array) -> bytes:
+        """Get the little endian bytes of a column."""
+        if sys.byteorder == "big":
+            column.byteswap()
+        return column.tobytes()
+
+    def write(self, result: MetricsResult) -> None:
+        """Write one frame per series of a result.
+
+        Parameters
+        ----------
+        result : MetricsResult
+                 Metrics of one server.
+        """
+        for key, data in result.time_series.items():
+            samples = data.get("values", [])
+            timestamps = array("d", (float(timestamp) for timestamp, _ in samples))
+            values = array("d", (_value(value) for _, value in samples))
+            header = json.dumps({"server": result.server, "series": key, "count": len(samples)}).encode("utf-8")
+
+            self.stream.write(COLUMNAR_LENGTH.pack(len(header)) + header)
+            self.stream.write(self._bytes(timestamps))
+            self.stream.write(self._bytes(values))
+        self.stream.flush()
+
+
+def read_columnar(stream: BinaryIO) -> Iterator[tuple[dict, array, array]]:
+    """Read frames written by ColumnarWriter.
+
+    Parameters
+    ----------
+    stream : BinaryIO
+             Binary stream positioned at the magic bytes.
+
+    Yields
+    ------
+    tuple[dict, array, array]: Header, timestamps and values of one series.
+
+    Raises
+    ------
+    ValueError: The stream is not a columnar metrics stream.
+    """
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Stream is not a columnar metrics stream.")
+
+    while length := stream.read(COLUMNAR_LENGTH.size):
+        header = json.loads(stream.read(COLUMNAR_LENGTH.unpack(length)[0]))
+        columns = []
+        for _ in range(2):
+            column = array("d")
+            column.frombytes(stream.read(header["count"] * column.itemsize))
+            if sys.byteorder == "big":
+                column.byteswap()
+            columns.append(column)
+        yield header, columns[0], columns[1]
+
+
+# Writers by output format name
+writers = {"ndjson": NdjsonWriter, "csv": CsvWriter, "columnar": ColumnarWriter}
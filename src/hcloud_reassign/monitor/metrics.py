@@ -6,56 +6,153 @@
 # Import datetime
 from datetime import datetime, timedelta
 
+# Import typing helpers
+from typing import TYPE_CHECKING
+
 # Import utilities
+from ..core import base
 from ..reassign.ip_floating import HCloudFloatingIPSection
-from ..utils.types import TimeNow_t, HcloudMetric_t
+from ..utils import constants
+from ..utils.types import TimeNow_t, HcloudMetric_t, HcloudSectionFloatingIp_t
+from .store import MetricsStore
+
+# Import columnar series only for type checking, numpy is optional
+if TYPE_CHECKING:
+    from .series import MetricsFrame
+
+
+def check_timedata(interval: tuple[str, str] | TimeNow_t, step: float = 1800) -> tuple[str, str]:
+    """Check time formatting.
+
+    Parameters
+    ----------
+    interval : tuple[str, str] | TimeNow_t
+               A list containing ISO8601 formatted datetime strings.
+               interval[0] represents t0, interval[1] represents t1.
+               Use 'now' to get current time string and this string
+               minus five minutes.
+    step : float
+           Minimal length of the interval in seconds.
+
+    Returns
+    -------
+    tuple[str, str]
+
+    Raises
+    ------
+    ValueError: Interval limits must be ISO8601 formatted.
+    ValueError: Interval must be greater or equal to step size
+    """
+    if interval == "now":
+        t1 = datetime.now()
+        t0 = t1 - timedelta(seconds=1800)
+        interval = (t0.isoformat(), t1.isoformat())
+    else:
+        try:
+            t0 = datetime.fromisoformat(interval[0])
+            t1 = datetime.fromisoformat(interval[1])
+
+            dt = (t1 - t0).total_seconds()
+            if dt < step or dt < 1800:
+                raise ValueError("Interval must be greater or equal to step size and bigger than 1800 seconds")
+        except ValueError as err:
+            print(err)
+            raise ValueError("Interval limits must be ISO8601 formatted.") from err
+
+        interval = (interval[0], interval[1])
+
+    return interval
+
+
+def fetch_time_series(
+    hclient: base.HcloudClient,
+    server,
+    metrics_types: list[HcloudMetric_t],
+    start: str,
+    end: str,
+    step: float,
+    store: MetricsStore | None = None,
+) -> dict:
+    """Fetch the time series of a server.
+
+    Parameters
+    ----------
+    hclient : HcloudClient
+              Client used for the requests.
+    server : Server | BoundServer
+             Server to get metrics for.
+    metrics_types : list[HcloudMetric_t]
+                    HCloud metrics, 'cpu', 'network' and 'disk'.
+    start : str
+            ISO8601 formatted start.
+    end : str
+          ISO8601 formatted end.
+    step : float
+           Resolution in seconds.
+    store : MetricsStore | None, optional
+            On-disk store, only the missing tail is fetched if given.
+
+    Returns
+    -------
+    dict: Dictionary of series names to {'values': [[timestamp, value], ...]}.
+    """
+    if store:
+        time_series = store.fetch(
+            hclient=hclient,
+            server=server,
+            metrics_types=metrics_types,
+            start=datetime.fromisoformat(start).timestamp(),
+            end=datetime.fromisoformat(end).timestamp(),
+            step=step,
+        )
+    else:
+        response = hclient.servers.get_metrics(server, type=metrics_types, start=start, end=end, step=step)
+        time_series = response.metrics.time_series
+
+    # Series are named after their type, e.g. 'cpu' or 'disk.0.iops.read'
+    return {key: data for key, data in time_series.items() if key.split(".", 1)[0] in metrics_types}
 
 
 class HCloudMetricsServer(HCloudFloatingIPSection):
     """This class represents a metrics client to gather information about one or more cloud servers."""
 
-    @staticmethod
-    def __check_timedata(interval: tuple[str, str] | TimeNow_t, step: float = 1800) -> tuple[str, str]:
-        """Check time formatting.
+    def __init__(
+        self,
+        section: HcloudSectionFloatingIp_t,
+        client: dict,
+        hclient: base.HcloudClient | None = None,
+        cache: base.ResolutionCache | None = None,
+        snapshot: base.ProjectSnapshot | None = None,
+        store: MetricsStore | None = None,
+    ):
+        """Initialize a metrics object.
 
         Parameters
         ----------
-        interval : tuple[str, str] | TimeNow_t
-                   A list containing ISO8601 formatted datetime strings.
-                   interval[0] represents t0, interval[1] represents t1.
-                   Use 'now' to get current time string and this string
-                   minus five minutes.
-        step : float
-               Minimal length of the interval in seconds.
+        section: HcloudSectionFloatingIp_t
+                 Dictionary with floating_ip section contents.
+        client: dict
+                Dictionary of connection information such as API token and endpoint url.
+        hclient: HcloudClient | None, optional
+                 Shared hcloud.Client object.
+        cache: ResolutionCache | None, optional
+               Persistent name to ID cache shared by sections.
+        snapshot: ProjectSnapshot | None, optional
+                  Listed project resources shared by sections.
+        store: MetricsStore | None, optional
+               On-disk store of samples. Opened from the client option
+               'metrics_store' if omitted.
+        """
+        super().__init__(section=section, client=client, hclient=hclient, cache=cache, snapshot=snapshot)
 
-        Returns
-        -------
-        tuple[str, str]
+        if store is None and client.get(constants.CONFIG_OPTION_METRICS_STORE):
+            store = MetricsStore(path=client[constants.CONFIG_OPTION_METRICS_STORE])
+        self.store = store
 
-        Raises
-        ------
-        ValueError: Interval limits must be ISO8601 formatted.
-        ValueError: Interval must be greater or equal to step size
-        """
-        if isinstance(interval, TimeNow_t):
-            t1 = datetime.now()
-            t0 = t1 - timedelta(seconds=1800)
-            interval = (t0.isoformat(), t1.isoformat())
-        else:
-            try:
-                t0 = datetime.fromisoformat(interval[0])
-                t1 = datetime.fromisoformat(interval[1])
-
-                dt = (t1 - t0).total_seconds()
-                if dt < step or dt < 1800:
-                    raise ValueError("Interval must be greater or equal to step size and bigger than 1800 seconds")
-            except ValueError as err:
-                print(err)
-                raise ValueError("Interval limits must be ISO8601 formatted.") from err
-
-            interval = (interval[0], interval[1])
-
-        return interval
+    @staticmethod
+    def __check_timedata(interval: tuple[str, str] | TimeNow_t, step: float = 1800) -> tuple[str, str]:
+        """Check time formatting, see check_timedata."""
+        return check_timedata(interval=interval, step=step)
 
     def __get_metrics__(
         self,
@@ -63,7 +160,8 @@ class HCloudMetricsServer(HCloudFloatingIPSection):
         metrics_type: HcloudMetric_t | list[HcloudMetric_t],
         interval: tuple[str, str] | TimeNow_t = "now",
         step: float = 10,
-    ) -> list:
+        columnar: bool = False,
+    ) -> "list | MetricsFrame":
         """Get metrics for Hetzner Cloud servers.
 
         Parameters
@@ -80,40 +178,45 @@ class HCloudMetricsServer(HCloudFloatingIPSection):
         step : float, optional
                default: 10 seconds
                Minimal length of the interval in seconds.
+        columnar : bool, optional
+                   default: False
+                   Return a MetricsFrame of float64 arrays instead of lists.
+                   Needs numpy, see hcloud-reassign[metrics].
 
         Returns
         -------
-        list: List of timestamps and corresponding metrics measurements
+        list | MetricsFrame: List of timestamps and corresponding metrics measurements
         """
         start, end = self.__check_timedata(interval=interval, step=step)
 
         # Get server
-        server = self.hclient.servers.get_by_name(name=srv)
-        # Get metrics
-        response = server.get_metrics(type=metrics_type, start=start, end=end, step=step)
+        server = self.resolve("servers", srv)
+        metrics_types = [metrics_type] if isinstance(metrics_type, str) else list(metrics_type)
 
-        if isinstance(metrics_type, HcloudMetric_t):
-            data = [response.metrics.time_series[metrics_type]]
-        else:
-            data = []
-            keys = []
+        time_series = fetch_time_series(
+            hclient=self.hclient,
+            server=server,
+            metrics_types=metrics_types,
+            start=start,
+            end=end,
+            step=step,
+            store=self.store,
+        )
 
-            for metric in metrics_type:
-                for key in response.metrics.keys():
-                    if key.startswith(metric):
-                        keys.append(key)
+        if columnar:
+            from .series import MetricsFrame
 
-            for metric in keys:
-                data.append(response.metrics.time_series[metric])
+            return MetricsFrame.from_time_series(time_series)
 
-        return data
+        return list(time_series.values())
 
     def get_dest(
         self,
         metrics_type: HcloudMetric_t | list[HcloudMetric_t],
         interval: tuple[str, str] | TimeNow_t,
         step: float = 10,
-    ) -> list:
+        columnar: bool = False,
+    ) -> "list | MetricsFrame":
         """Get destination metrics for Hetzner Cloud servers.
 
         Parameters
@@ -128,19 +231,25 @@ class HCloudMetricsServer(HCloudFloatingIPSection):
         step : float, optional
                default: 10 seconds
                Minimal length of the interval in seconds.
+        columnar : bool, optional
+                   default: False
+                   Return a MetricsFrame of float64 arrays instead of lists.
 
         Returns
         -------
-        list: List of timestamps and corresponding metrics measurements
+        list | MetricsFrame: List of timestamps and corresponding metrics measurements
         """
-        return self.__get_metrics__(srv=self.destination, metrics_type=metrics_type, interval=interval, step=step)
+        return self.__get_metrics__(
+            srv=self.destination, metrics_type=metrics_type, interval=interval, step=step, columnar=columnar
+        )
 
     def get_source(
         self,
         metrics_type: HcloudMetric_t | list[HcloudMetric_t],
         interval: tuple[str, str] | TimeNow_t,
         step: float = 10,
-    ) -> list:
+        columnar: bool = False,
+    ) -> "list | MetricsFrame":
         """Get source metrics for Hetzner Cloud servers.
 
         Parameters
@@ -155,9 +264,14 @@ class HCloudMetricsServer(HCloudFloatingIPSection):
         step : float, optional
                default: 10 seconds
                Minimal length of the interval in seconds.
+        columnar : bool, optional
+                   default: False
+                   Return a MetricsFrame of float64 arrays instead of lists.
 
         Returns
         -------
-        list: List of timestamps and corresponding metrics measurements
+        list | MetricsFrame: List of timestamps and corresponding metrics measurements
         """
-        return self.__get_metrics__(srv=self.destination, metrics_type=metrics_type, interval=interval, step=step)
+        return self.__get_metrics__(
+            srv=self.source, metrics_type=metrics_type, interval=interval, step=step, columnar=columnar
+        )
@@ -0,0 +1,217 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides columnar time series for Hetzner Cloud metrics.
+
+The API returns every series as a list of [timestamp, "value"] pairs.
+Here each series is parsed once into float64 arrays of timestamps and
+values, which are sliced without copying.
+"""
+
+# Import typing helpers
+from collections.abc import Iterator, Mapping
+
+try:
+    import numpy as np
+except ImportError as error:
+    print(error)
+    print("You might need to install hcloud-reassign[metrics].")
+    raise error
+
+# Aggregations usable for resampling and rolling windows
+AGGREGATIONS = {
+    "mean": np.nanmean,
+    "min": np.nanmin,
+    "max": np.nanmax,
+    "sum": np.nansum,
+    "median": np.nanmedian,
+}
+
+
+class MetricsSeries:
+    """This class holds one time series as float64 timestamp and value arrays."""
+
+    __slots__ = ("name", "timestamps", "values")
+
+    def __init__(self, name: str, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Initialize a series.
+
+        Parameters
+        ----------
+        name : str
+               Name of the series, e.g. 'cpu' or 'disk.0.iops.read'.
+        timestamps : np.ndarray
+                     Unix timestamps in seconds, ascending.
+        values : np.ndarray
+                 Values belonging to the timestamps.
+        """
+        self.name = name
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.values = np.asarray(values, dtype=np.float64)
+
+    @classmethod
+    def from_pairs(cls, name: str, pairs: list) -> "MetricsSeries":
+        """Parse [timestamp, "value"] pairs as returned by the API.
+
+        Both columns are converted at once and share one contiguous buffer.
+
+        Parameters
+        ----------
+        name : str
+               Name of the series.
+        pairs : list
+                List of [timestamp, value] pairs, values may be strings.
+
+        Returns
+        -------
+        MetricsSeries
+        """
+        if len(pairs) == 0:
+            return cls(name, np.empty(0), np.empty(0))
+
+        columns = np.ascontiguousarray(np.array(pairs, dtype=object).astype(np.float64).T)
+        return cls(name, columns[0], columns[1])
+
+    def __len__(self) -> int:
+        """Count samples."""
+        return len(self.timestamps)
+
+    def __getitem__(self, index: slice) -> "MetricsSeries":
+        """Slice samples by position without copying."""
+        if not isinstance(index, slice):
+            raise TypeError("Series can only be sliced, use .values or .timestamps for single samples.")
+
+        return MetricsSeries(self.name, self.timestamps[index], self.values[index])
+
+    def __repr__(self) -> str:
+        """Describe the series."""
+        return f"MetricsSeries(name={self.name!r}, samples={len(self)})"
+
+    def between(self, start: float, end: float) -> "MetricsSeries":
+        """Slice samples with start <= timestamp < end without copying.
+
+        Parameters
+        ----------
+        start : float
+                First unix timestamp to include.
+        end : float
+              First unix timestamp to exclude.
+
+        Returns
+        -------
+        MetricsSeries
+        """
+        first, last = np.searchsorted(self.timestamps, [start, end], side="left")
+        return self[first:last]
+
+    def resample(self, step: float, how: str = "mean") -> "MetricsSeries":
+        """Aggregate samples into buckets of a fixed step.
+
+        Parameters
+        ----------
+        step : float
+               Bucket size in seconds.
+        how : str, optional
+              One of 'mean', 'min', 'max', 'sum' and 'median'.
+
+        Returns
+        -------
+        MetricsSeries: One sample per non-empty bucket, stamped with the bucket start.
+        """
+        if len(self) == 0:
+            return self
+
+        buckets = np.floor(self.timestamps / step)
+        starts, first = np.unique(buckets, return_index=True)
+        if how in ("mean", "sum"):
+            valid = ~np.isnan(self.values)
+            index = np.searchsorted(starts, buckets)
+            sums = np.bincount(index[valid], weights=self.values[valid], minlength=len(starts))
+            if how == "sum":
+                return MetricsSeries(self.name, starts * step, sums)
+            counts = np.bincount(index[valid], minlength=len(starts))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return MetricsSeries(self.name, starts * step, sums / counts)
+
+        aggregate = AGGREGATIONS[how]
+        groups = np.split(self.values, first[1:])
+        return MetricsSeries(self.name, starts * step, np.array([aggregate(group) for group in groups]))
+
+    def percentile(self, q: float | list[float]) -> float | np.ndarray:
+        """Get percentiles of the values, ignoring missing samples.
+
+        Parameters
+        ----------
+        q : float | list[float]
+            Percentile or percentiles between 0 and 100.
+
+        Returns
+        -------
+        float | np.ndarray
+        """
+        return np.nanpercentile(self.values, q)
+
+    def rolling(self, window: int, how: str = "mean") -> "MetricsSeries":
+        """Aggregate a rolling window of samples.
+
+        Parameters
+        ----------
+        window : int
+                 Number of samples per window.
+        how : str, optional
+              One of 'mean', 'min', 'max', 'sum' and 'median'.
+
+        Returns
+        -------
+        MetricsSeries: One sample per full window, stamped with the window's last timestamp.
+        """
+        if len(self) < window:
+            return MetricsSeries(self.name, np.empty(0), np.empty(0))
+
+        windows = np.lib.stride_tricks.sliding_window_view(self.values, window)
+        return MetricsSeries(self.name, self.timestamps[window - 1 :], AGGREGATIONS[how](windows, axis=1))
+
+
+class MetricsFrame(Mapping):
+    """This class maps series names to columnar series."""
+
+    def __init__(self, series: dict[str, MetricsSeries]) -> None:
+        """Initialize a frame.
+
+        Parameters
+        ----------
+        series : dict[str, MetricsSeries]
+                 Series by name.
+        """
+        self.series = series
+
+    @classmethod
+    def from_time_series(cls, time_series: dict) -> "MetricsFrame":
+        """Parse the time_series attribute of an API metrics response.
+
+        Parameters
+        ----------
+        time_series : dict
+                      Dictionary of series names to {'values': [[timestamp, value], ...]}.
+
+        Returns
+        -------
+        MetricsFrame
+        """
+        return cls({name: MetricsSeries.from_pairs(name, data["values"]) for name, data in time_series.items()})
+
+    def __getitem__(self, name: str) -> MetricsSeries:
+        """Get a series by name."""
+        return self.series[name]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over series names."""
+        return iter(self.series)
+
+    def __len__(self) -> int:
+        """Count series."""
+        return len(self.series)
+
+    def between(self, start: float, end: float) -> "MetricsFrame":
+        """Slice all series by time without copying."""
+        return MetricsFrame({name: series.between(start, end) for name, series in self.series.items()})
@@ -0,0 +1,266 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides an incremental on-disk store for server metrics.
+
+Samples are appended to a SQLite database keyed by server, metric type and
+step. For every key the store remembers which interval it already holds,
+so repeated queries only fetch the missing tail from the API.
+"""
+
+# Import os for file handling
+import os
+
+# Import sqlite3 for the store
+import sqlite3
+
+# Import datetime to talk to the API
+from datetime import datetime, timezone
+
+# Import threading for concurrent collectors
+from threading import Lock
+
+# Import typing helpers
+from collections.abc import Iterable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    server_id INTEGER NOT NULL,
+    series TEXT NOT NULL,
+    step REAL NOT NULL,
+    ts REAL NOT NULL,
+    value TEXT,
+    PRIMARY KEY (server_id, series, step, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    server_id INTEGER NOT NULL,
+    metrics_type TEXT NOT NULL,
+    step REAL NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    PRIMARY KEY (server_id, metrics_type, step)
+) WITHOUT ROWID;
+"""
+
+
+def _iso(timestamp: float) -> str:
+    """Format a unix timestamp for the API."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class MetricsStore:
+    """This class stores metrics samples and fetches only what is missing."""
+
+    def __init__(self, path: str) -> None:
+        """Open or create a store.
+
+        Parameters
+        ----------
+        path : str
+               Path of the SQLite database, ':memory:' for a temporary store.
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+        self.__lock = Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.executescript(SCHEMA)
+
+    def coverage(self, server_id: int, metrics_type: str, step: float) -> tuple[float, float] | None:
+        """Get the interval held for a key.
+
+        Parameters
+        ----------
+        server_id : int
+                    ID of the server.
+        metrics_type : str
+                       Metric type, e.g. 'cpu'.
+        step : float
+               Resolution in seconds.
+
+        Returns
+        -------
+        tuple[float, float] | None: Start and end as unix timestamps.
+        """
+        with self.__lock:
+            row = self.__db.execute(
+                "SELECT start, end FROM coverage WHERE server_id = ? AND metrics_type = ? AND step = ?",
+                (server_id, metrics_type, step),
+            ).fetchone()
+
+        return tuple(row) if row else None
+
+    def missing(self, server_id: int, metrics_type: str, step: float, start: float, end: float) -> float | None:
+        """Get the start of the interval that needs to be fetched.
+
+        Parameters
+        ----------
+        server_id : int
+                    ID of the server.
+        metrics_type : str
+                       Metric type, e.g. 'cpu'.
+        step : float
+               Resolution in seconds.
+        start : float
+                Requested start as unix timestamp.
+        end : float
+                Requested end as unix timestamp.
+
+        Returns
+        -------
+        float | None: Start of the missing tail, or None if nothing is missing.
+        """
+        held = self.coverage(server_id, metrics_type, step)
+        if held is None or start < held[0] or start > held[1]:
+            return start
+        if end <= held[1]:
+            return None
+
+        # The last stored sample may have been incomplete, fetch it again
+        return max(start, held[1] - step)
+
+    def add(self, server_id: int, metrics_type: str, step: float, start: float, end: float, time_series: dict) -> None:
+        """Append fetched samples and extend the held interval up to the last sample returned.
+
+        The API returns recent samples with a delay, so the interval is only
+        held up to the last sample of every series, not to the requested end.
+
+        Parameters
+        ----------
+        server_id : int
+                    ID of the server.
+        metrics_type : str
+                       Metric type the samples were fetched for.
+        step : float
+               Resolution in seconds.
+        start : float
+                Start of the fetched interval.
+        end : float
+              End of the fetched interval.
+        time_series : dict
+                      Series of this type as returned by the API.
+        """
+        rows = [
+            (server_id, series, step, float(ts), value)
+            for series, data in time_series.items()
+            for ts, value in data["values"]
+        ]
+        # Samples after the last one of any series may still arrive
+        last = [max(float(ts) for ts, _ in data["values"]) for data in time_series.values() if data["values"]]
+        end = min([end, *last]) if last else None
+
+        with self.__lock, self.__db:
+            self.__db.executemany("INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?)", rows)
+            held = self.__db.execute(
+                "SELECT start, end FROM coverage WHERE server_id = ? AND metrics_type = ? AND step = ?",
+                (server_id, metrics_type, step),
+            ).fetchone()
+            if held and held[0] <= start <= held[1]:
+                start, end = held[0], max(end or held[1], held[1])
+            elif end is None:
+                # Nothing came back and nothing is held, the interval is fetched again
+                return
+            self.__db.execute(
+                "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?)", (server_id, metrics_type, step, start, end)
+            )
+
+    def read(self, server_id: int, metrics_type: str, step: float, start: float, end: float) -> dict:
+        """Read stored samples in the API's time_series format.
+
+        Parameters
+        ----------
+        server_id : int
+                    ID of the server.
+        metrics_type : str
+                       Metric type, e.g. 'cpu'.
+        step : float
+               Resolution in seconds.
+        start : float
+                First unix timestamp to include.
+        end : float
+              Last unix timestamp to include.
+
+        Returns
+        -------
+        dict: Dictionary of series names to {'values': [[timestamp, value], ...]}.
+        """
+        with self.__lock:
+            rows = self.__db.execute(
+                "SELECT series, ts, value FROM samples WHERE server_id = ? AND step = ? AND ts BETWEEN ? AND ? "
+                "AND (series = ? OR series LIKE ?) ORDER BY series, ts",
+                (server_id, step, start, end, metrics_type, f"{metrics_type}.%"),
+            ).fetchall()
+
+        time_series = {}
+        for series, ts, value in rows:
+            time_series.setdefault(series, {"values": []})["values"].append([ts, value])
+
+        return time_series
+
+    def fetch(self, hclient, server, metrics_types: Iterable[str], start: float, end: float, step: float) -> dict:
+        """Get metrics, asking the API only for intervals not held yet.
+
+        Types missing the same tail are fetched with a single request.
+
+        Parameters
+        ----------
+        hclient : HcloudClient
+                  Client used for the requests.
+        server : Server | BoundServer
+                 Server to get metrics for.
+        metrics_types : Iterable[str]
+                        Metric types, e.g. 'cpu', 'disk' and 'network'.
+        start : float
+                Start as unix timestamp.
+        end : float
+              End as unix timestamp.
+        step : float
+               Resolution in seconds.
+
+        Returns
+        -------
+        dict: Dictionary of series names to {'values': [[timestamp, value], ...]}.
+        """
+        metrics_types = list(metrics_types)
+
+        # Group types by the start of their missing tail
+        requests: dict[float, list[str]] = {}
+        for metrics_type in metrics_types:
+            tail = self.missing(server.id, metrics_type, step, start, end)
+            if tail is not None:
+                requests.setdefault(tail, []).append(metrics_type)
+
+        for tail, types in requests.items():
+            response = hclient.servers.get_metrics(server, type=types, start=_iso(tail), end=_iso(end), step=step)
+            for metrics_type in types:
+                series = {
+                    key: data
+                    for key, data in response.metrics.time_series.items()
+                    if key.split(".", 1)[0] == metrics_type
+                }
+                self.add(server.id, metrics_type, step, tail, end, series)
+
+        time_series = {}
+        for metrics_type in metrics_types:
+            time_series.update(self.read(server.id, metrics_type, step, start, end))
+
+        return time_series
+
+    def prune(self, before: float) -> None:
+        """Delete samples older than a timestamp.
+
+        Parameters
+        ----------
+        before : float
+                 Unix timestamp of the oldest sample to keep.
+        """
+        with self.__lock, self.__db:
+            self.__db.execute("DELETE FROM samples WHERE ts < ?", (before,))
+            self.__db.execute("UPDATE coverage SET start = ? WHERE start < ?", (before, before))
+            self.__db.execute("DELETE FROM coverage WHERE end < start")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self.__lock:
+            self.__db.close()
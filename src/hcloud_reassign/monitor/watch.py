@@ -0,0 +1,449 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module watches the source servers of sections and fails over proactively.
+
+Rules are evaluated on the metrics of every watched source. Once a rule is
+breached, the sections of that source are reassigned to their destination.
+A section is only reassigned again after its source recovered.
+Reassignments run on a worker pool, so polls go on while a section fails
+over, and are reported as they complete.
+
+Rules are written as '<series> [rate] <op> <limit> [for <samples>]', e.g.
+'cpu > 95 for 3' or 'network.0.bandwidth.in rate < -1000'. Threshold rules
+compare the last samples, rate rules the change per second between them.
+Several rules are separated by ';' and any breached rule triggers.
+
+Metrics polls are staggered: servers are split into batches of the size of
+the worker pool and the batches are spread evenly over the poll interval.
+The interval is stretched if polling all servers would need more than
+WATCH_RATE_SHARE of the API rate limit.
+"""
+
+# Import time helpers
+import heapq
+from datetime import datetime, timedelta
+from math import isnan
+from time import monotonic
+
+# Import typing helpers
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from threading import Event
+
+# Import thread pool for reassignments
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+# Import utilities
+from ..core.base import HcloudClassBase, HcloudClient, HcloudReassignIni
+from ..core.cache import ResolutionCache
+from ..core.executor import reassign_one, make_sections, make_shared_client
+from ..utils import constants
+from .collector import MetricsCollector
+from .store import MetricsStore
+
+# Comparison operators of rules
+RULE_OPERATORS: dict[str, Callable[[float, float], bool]] = {
+    ">": lambda value, limit: value > limit,
+    ">=": lambda value, limit: value >= limit,
+    "<": lambda value, limit: value < limit,
+    "<=": lambda value, limit: value <= limit,
+}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """This class describes a condition on one metrics series."""
+
+    series: str
+    operator: str
+    limit: float
+    # Compare the change per second instead of the value
+    rate: bool = False
+    # Number of consecutive samples that must breach the limit
+    samples: int = 1
+
+    @classmethod
+    def parse(cls, text: str) -> "Rule":
+        """Parse a rule like 'cpu > 95 for 3'.
+
+        Parameters
+        ----------
+        text : str
+               Rule in the form '<series> [rate] <op> <limit> [for <samples>]'.
+
+        Returns
+        -------
+        Rule
+
+        Raises
+        ------
+        ValueError: The rule cannot be parsed.
+        """
+        words = text.split()
+        samples = 1
+        try:
+            if len(words) >= 2 and words[-2] == "for":
+                samples = int(words[-1])
+                words = words[:-2]
+
+            rate = len(words) == 4 and words[1] == "rate"
+            if rate:
+                words = [words[0], *words[2:]]
+
+            series, operator, limit = words
+            if operator not in RULE_OPERATORS or samples < 1:
+                raise ValueError
+            return cls(series=series, operator=operator, limit=float(limit), rate=rate, samples=samples)
+        except ValueError as err:
+            raise ValueError(
+                f"Invalid watch rule '{text}'. Use '<series> [rate] <op> <limit> [for <samples>]'."
+            ) from err
+
+    @property
+    def metrics_type(self) -> str:
+        """Get the metrics type to request for this rule, e.g. 'network'."""
+        return self.series.split(".", 1)[0]
+
+    def __str__(self) -> str:
+        """Format the rule the way it is parsed."""
+        rate = " rate" if self.rate else ""
+        return f"{self.series}{rate} {self.operator} {self.limit:g} for {self.samples}"
+
+    def breached(self, time_series: dict[str, dict]) -> bool:
+        """Check if the latest samples breach this rule.
+
+        Parameters
+        ----------
+        time_series : dict[str, dict]
+                      Series by name, as returned by the metrics API.
+
+        Returns
+        -------
+        bool: False if there are not enough samples.
+        """
+        samples = []
+        for timestamp, value in time_series.get(self.series, {}).get("values", []):
+            try:
+                sample = float(value)
+            except (TypeError, ValueError):
+                continue
+            if not isnan(sample):
+                samples.append((float(timestamp), sample))
+
+        if self.rate:
+            window = samples[-(self.samples + 1) :]
+            values = [(v1 - v0) / (t1 - t0) for (t0, v0), (t1, v1) in zip(window, window[1:]) if t1 > t0]
+        else:
+            values = [value for _, value in samples[-self.samples :]]
+
+        compare = RULE_OPERATORS[self.operator]
+        return len(values) == self.samples and all(compare(value, self.limit) for value in values)
+
+
+def parse_rules(text: str | None) -> list[Rule]:
+    """Parse rules separated by ';'.
+
+    Parameters
+    ----------
+    text : str | None
+           Rules, e.g. 'cpu > 95 for 3; network.0.bandwidth.in < 1'.
+
+    Returns
+    -------
+    list[Rule]
+    """
+    return [Rule.parse(rule) for rule in (text or "").split(";") if rule.strip()]
+
+
+class PollScheduler:
+    """This class spreads batches of servers evenly over a poll interval."""
+
+    def __init__(
+        self,
+        servers: Iterable[str],
+        interval: float,
+        batch_size: int = constants.DEFAULT_WORKERS,
+        start: float | None = None,
+    ) -> None:
+        """Initialize a schedule.
+
+        Parameters
+        ----------
+        servers : Iterable[str]
+                  Names of the servers to poll.
+        interval : float
+                   Seconds between two polls of the same server.
+        batch_size : int, optional
+                     Servers polled together.
+        start : float | None, optional
+                Monotonic time the first batch is due, now if omitted.
+        """
+        servers = list(dict.fromkeys(servers))
+        batch_size = max(1, batch_size)
+        batches = [servers[i : i + batch_size] for i in range(0, len(servers), batch_size)]
+        start = monotonic() if start is None else start
+
+        self.interval = interval
+        self.__queue = [(start + interval * i / len(batches), i, batch) for i, batch in enumerate(batches)]
+        heapq.heapify(self.__queue)
+
+    @staticmethod
+    def min_interval(
+        servers: int,
+        limit: int = constants.RATE_LIMIT_DEFAULT_LIMIT,
+        period: float = constants.RATE_LIMIT_DEFAULT_PERIOD,
+        share: float = constants.WATCH_RATE_SHARE,
+    ) -> float:
+        """Get the shortest interval polling servers stays within a share of the rate limit.
+
+        Parameters
+        ----------
+        servers : int
+                  Number of servers, each poll is one request.
+        limit : int, optional
+                Requests allowed per period.
+        period : float, optional
+                 Length of the rate limit period in seconds.
+        share : float, optional
+                Share of the limit used for polls.
+
+        Returns
+        -------
+        float: Seconds.
+        """
+        return servers * period / (limit * share)
+
+    def next_due(self) -> float | None:
+        """Get the monotonic time the next batch is due, None without servers."""
+        return self.__queue[0][0] if self.__queue else None
+
+    def due(self, now: float | None = None) -> list[str]:
+        """Take all servers that are due and schedule their next poll.
+
+        Rounds missed while busy are skipped instead of polled in a burst.
+
+        Parameters
+        ----------
+        now : float | None, optional
+              Monotonic time, now if omitted.
+
+        Returns
+        -------
+        list[str]: Names of the servers to poll.
+        """
+        now = monotonic() if now is None else now
+        servers = []
+        while self.__queue and self.__queue[0][0] <= now:
+            due, index, batch = heapq.heappop(self.__queue)
+            servers.extend(batch)
+
+            missed = int((now - due) // self.interval)
+            heapq.heappush(self.__queue, (due + (missed + 1) * self.interval, index, batch))
+
+        return servers
+
+
+@dataclass
+class WatchEvent:
+    """This class describes a reassignment triggered by a breached rule."""
+
+    section: str
+    server: str
+    rule: Rule
+    status: int
+
+
+class Watcher:
+    """This class polls the sources of sections and reassigns them when rules are breached."""
+
+    def __init__(
+        self,
+        config: HcloudReassignIni,
+        resources: Iterable[str] | None = None,
+        rules: list[Rule] | None = None,
+        interval: float = constants.WATCH_DEFAULT_INTERVAL,
+        step: float = constants.WATCH_DEFAULT_STEP,
+        workers: int = constants.DEFAULT_WORKERS,
+        hclient: HcloudClient | None = None,
+    ) -> None:
+        """Initialize a watcher.
+
+        Parameters
+        ----------
+        config : HcloudReassignIni
+                 Parsed configuration file.
+        resources : Iterable[str] | None, optional
+                    Section names to watch, all sections if omitted.
+        rules : list[Rule] | None, optional
+                Rules for all sections. If omitted, the 'watch' option of each
+                section is used, falling back to the one of the client section.
+        interval : float, optional
+                   Seconds between two polls of the same server.
+        step : float, optional
+               Resolution of the metrics in seconds.
+        workers : int, optional
+                  Servers polled and sections reassigned at the same time.
+        hclient : HcloudClient | None, optional
+                  Client to use. A shared client is created if omitted.
+        """
+        if hclient is None:
+            hclient = make_shared_client(config=config, workers=workers)
+        cache = ResolutionCache.from_client_section(config.client_section_dict)
+        sections = make_sections(
+            config=config, resources=resources or config.resource_sections, hclient=hclient, cache=cache
+        )
+
+        default_rules = self.__section_rules(config.client_section_dict, constants.CONFIG_SECTION_CLIENT)
+        self.sections: dict[str, HcloudClassBase] = {}
+        self.rules: dict[str, list[Rule]] = {}
+        self.sources: dict[str, list[str]] = {}
+        for resource, section in sections.items():
+            section_rules = rules or self.__section_rules(section.section, resource) or default_rules
+            if not section_rules or not getattr(section, "source", None):
+                continue
+            self.sections[resource] = section
+            self.rules[resource] = section_rules
+            self.sources.setdefault(section.source, []).append(resource)
+
+        self.step = step
+        self.interval = max(interval, PollScheduler.min_interval(len(self.sources)))
+        if self.interval > interval:
+            print(
+                f"Polling {len(self.sources)} servers every {interval:g}s exceeds the rate limit, using {self.interval:g}s."
+            )
+
+        store_path = config.client_section_dict.get(constants.CONFIG_OPTION_METRICS_STORE)
+        self.collector = MetricsCollector(
+            hclient=hclient, workers=workers, store=MetricsStore(path=store_path) if store_path else None
+        )
+        self.scheduler = PollScheduler(self.sources, interval=self.interval, batch_size=workers)
+        self.resolved: dict[str, object] | None = None
+        # Sections reassigned since their source breached a rule
+        self.triggered: set[str] = set()
+        # Running reassignments and the section, server and rule that triggered them
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="watch")
+        self.pending: dict[Future, tuple[str, str, Rule]] = {}
+
+    @staticmethod
+    def __section_rules(options: dict, name: str) -> list[Rule]:
+        """Parse the watch option of a section, naming the section in errors."""
+        try:
+            return parse_rules(options.get(constants.CONFIG_OPTION_WATCH))
+        except ValueError as err:
+            raise ValueError(f"Section '{name}': {err}") from err
+
+    def __window(self) -> tuple[str, str]:
+        """Get the interval of samples needed by all rules."""
+        samples = max(rule.samples + 1 for rules in self.rules.values() for rule in rules)
+        end = datetime.now()
+        start = end - timedelta(seconds=max(1800, self.step * samples))
+        return start.isoformat(), end.isoformat()
+
+    def poll(self, now: float | None = None) -> Iterator[WatchEvent]:
+        """Check servers that are due.
+
+        Parameters
+        ----------
+        now : float | None, optional
+              Monotonic time, now if omitted.
+
+        Yields
+        ------
+        WatchEvent: Reassignments triggered by this poll.
+        """
+        servers = self.scheduler.due(now)
+        if servers:
+            yield from self.check(servers)
+
+    def check(self, servers: Iterable[str]) -> Iterator[WatchEvent]:
+        """Fetch metrics of servers and reassign sections of degraded sources.
+
+        Parameters
+        ----------
+        servers : Iterable[str]
+                  Names of watched source servers.
+
+        Yields
+        ------
+        WatchEvent: Reassignments completed meanwhile, the ones triggered now keep running.
+        """
+        if self.resolved is None:
+            self.resolved = self.collector.resolve(self.sources)
+
+        metrics_types = sorted({rule.metrics_type for rules in self.rules.values() for rule in rules})
+        for result in self.collector.collect(
+            servers, metrics_types, interval=self.__window(), step=self.step, resolved=self.resolved
+        ):
+            if not result.ok:
+                print(f"{result.server}: metrics unavailable: {result.error}")
+                if isinstance(result.error, LookupError) or getattr(result.error, "code", None) == "not_found":
+                    # The server is missing or was recreated, resolve all names again on the next check
+                    self.resolved = None
+                continue
+
+            for resource in self.sources[result.server]:
+                breached = [rule for rule in self.rules[resource] if rule.breached(result.time_series)]
+                if not breached:
+                    self.triggered.discard(resource)
+                    continue
+                if resource in self.triggered:
+                    continue
+
+                self.triggered.add(resource)
+                future = self.pool.submit(reassign_one, self.sections[resource], resource, "dest", skip_unchanged=False)
+                self.pending[future] = (resource, result.server, breached[0])
+
+        yield from self.completed()
+
+    def completed(self, timeout: float | None = 0) -> Iterator[WatchEvent]:
+        """Report reassignments that are done.
+
+        Parameters
+        ----------
+        timeout : float | None, optional
+                  Seconds to wait for the first one to complete, None to wait as long as it takes.
+
+        Yields
+        ------
+        WatchEvent: Completed reassignments.
+        """
+        if not self.pending:
+            return
+
+        done, _ = wait(self.pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            resource, server, rule = self.pending.pop(future)
+            yield WatchEvent(section=resource, server=server, rule=rule, status=future.result())
+
+    def finish(self) -> Iterator[WatchEvent]:
+        """Wait for all running reassignments.
+
+        Yields
+        ------
+        WatchEvent: Completed reassignments.
+        """
+        while self.pending:
+            yield from self.completed(timeout=None)
+
+    def run(self, stop: Event | None = None) -> Iterator[WatchEvent]:
+        """Poll until stopped, sleeping until the next batch is due.
+
+        Parameters
+        ----------
+        stop : Event | None, optional
+               Set to stop watching.
+
+        Yields
+        ------
+        WatchEvent: Triggered reassignments.
+        """
+        stop = stop or Event()
+        while self.sources and not stop.is_set():
+            delay = max(0.0, self.scheduler.next_due() - monotonic())
+            if self.pending:
+                # Report reassignments as they complete while waiting for the next batch
+                yield from self.completed(timeout=delay)
+            elif stop.wait(delay):
+                break
+            yield from self.poll()
@@ -3,8 +3,13 @@
 
 """This module provides a class and methods to reassign floating IP address objects."""
 
+# Import monotonic clock for the age of a destination choice
+from time import monotonic
+
 # Import utilities
-from ..core import base
+from ..core import base, telemetry
+from ..core.placement import METRICS_DIMENSIONS, Candidate, load_from_time_series, score_candidates
+from ..utils import constants
 from ..utils.types import HcloudSectionFloatingIp_t
 
 # Model
@@ -14,26 +19,213 @@ ip_floating_section_model = {"resource": str, "source": str, "destination": str,
 class HCloudFloatingIPSection(base.HcloudClassBase):
     """This class represents a Floating IP section and its actions."""
 
-    def __init__(self, section: HcloudSectionFloatingIp_t, client: dict):
+    def __init__(
+        self,
+        section: HcloudSectionFloatingIp_t,
+        client: dict,
+        hclient: base.HcloudClient | None = None,
+        cache: base.ResolutionCache | None = None,
+        snapshot: base.ProjectSnapshot | None = None,
+    ):
         """Initialize a Floating IP section object.
 
         Parameters
         ----------
         section: HcloudSectionFloatingIp_t
-                 Dictionary with floating_ip section contents.
+                 Dictionary with floating_ip section contents. The destination
+                 may list several candidate servers separated by commas.
         client: dict
                 Dictionary of connection information such as API token and endpoint url.
+        hclient: HcloudClient | None, optional
+                 Shared hcloud.Client object. Use when to reassign multiple resources.
+        cache: ResolutionCache | None, optional
+               Persistent name to ID cache shared by sections.
+        snapshot: ProjectSnapshot | None, optional
+                  Listed project resources shared by sections.
         """
         self.section_type = "ip_floating"
         self.section_model = ip_floating_section_model
 
-        super().__init__(section=section, client=client)
+        super().__init__(section=section, client=client, hclient=hclient, cache=cache, snapshot=snapshot)
 
         self.resource: str = section["resource"]
         self.source: str = section["source"]
-        self.destination: str = section["destination"]
+        self.destinations: list[str] = [name.strip() for name in section["destination"].split(",") if name.strip()]
+        if not self.destinations:
+            raise KeyError("Option 'destination' is not defined or empty.")
+        self.destination: str = self.destinations[0]
         self.metrics: bool = section["metrics"]
 
+        # Time and name of the last destination chosen out of several candidates
+        self.__selection: tuple[float, str | None] | None = None
+
+    def prefetch_resources(self) -> list[tuple[str, str]]:
+        """List servers and the floating IP of this section."""
+        return [
+            ("servers", self.source),
+            *(("servers", destination) for destination in self.destinations),
+            ("floating_ips", self.resource),
+        ]
+
+    def candidates(self) -> list[Candidate]:
+        """Describe the load of every candidate destination.
+
+        Candidates are healthy if their server is running. The load is the
+        number of other floating IPs assigned to them and, if metrics are
+        enabled for this section, their recent CPU, network and disk usage.
+
+        Returns
+        -------
+        list[Candidate]: Candidates in configured order, without the source.
+        """
+        servers = {}
+        for name in self.destinations:
+            if name == self.source:
+                continue
+            server = self.resolve("servers", name)
+            # Servers only known by their cached ID have no status
+            if server is not None and ("servers", name) in self.id_only:
+                server = self.resolve("servers", name, refresh=True)
+            servers[name] = server
+
+        healthy = {
+            name: server
+            for name, server in servers.items()
+            if server is not None and getattr(server, "status", None) == constants.SERVER_STATUS_RUNNING
+        }
+        counts = self.__floating_ip_counts()
+        loads = self.__loads(healthy) if self.metrics and healthy else {}
+
+        return [
+            Candidate(
+                name=name,
+                healthy=name in healthy,
+                floating_ips=counts.get(server.id, 0) if server is not None else 0,
+                load=loads.get(name, {}),
+            )
+            for name, server in servers.items()
+        ]
+
+    def __floating_ip_counts(self) -> dict[int, int]:
+        """Count other floating IPs by server ID, with the snapshot or one list call."""
+        if self.snapshot and self.snapshot.has("floating_ips"):
+            flips = [flip for flips in self.snapshot.floating_ips_by_server.values() for flip in flips]
+        else:
+            flips = self.hclient.floating_ips.get_all()
+
+        counts = {}
+        for flip in flips:
+            if flip.server is not None and flip.name != self.resource:
+                counts[flip.server.id] = counts.get(flip.server.id, 0) + 1
+
+        return counts
+
+    def __loads(self, servers: dict[str, object]) -> dict[str, dict[str, float]]:
+        """Get the recent load of servers, fetched concurrently."""
+        # Import here, the metrics modules build on this module
+        from ..monitor.collector import MetricsCollector
+
+        collector = MetricsCollector(hclient=self.hclient, workers=len(servers))
+        loads = {}
+        for result in collector.collect(
+            servers, list(METRICS_DIMENSIONS), step=constants.PLACEMENT_STEP, resolved=servers
+        ):
+            if result.ok:
+                loads[result.server] = load_from_time_series(result.time_series)
+            else:
+                print(f"Metrics of {result.server} unavailable: {result.error}")
+
+        return loads
+
+    def select_destination(self) -> str | None:
+        """Choose the least loaded healthy destination.
+
+        With a single destination it is chosen without any checks. A choice
+        out of several candidates is reused for PLACEMENT_MAX_AGE seconds, so
+        planning and reassigning right after do not fetch metrics twice.
+
+        Returns
+        -------
+        str | None: Name of the server or None if no candidate is healthy.
+        """
+        if len(self.destinations) == 1:
+            return self.destination
+
+        if self.__selection and monotonic() - self.__selection[0] < constants.PLACEMENT_MAX_AGE:
+            return self.__selection[1]
+
+        ranked = score_candidates(self.candidates(), use_metrics=self.metrics)
+        choice = ranked[0].name if ranked else None
+        self.__selection = (monotonic(), choice)
+
+        return choice
+
+    def __floating_ip(self):
+        """Resolve the floating IP with its assignment."""
+        flip = self.resolve("floating_ips", self.resource)
+        # Floating IPs only known by their cached ID have no server
+        if flip is not None and ("floating_ips", self.resource) in self.id_only:
+            flip = self.resolve("floating_ips", self.resource, refresh=True)
+        return flip
+
+    def __current_destination(self) -> str | None:
+        """Get the healthy candidate destination the floating IP is assigned to."""
+        flip = self.__floating_ip()
+        if flip is None or flip.server is None:
+            return None
+
+        for name in self.destinations:
+            server = self.resolve("servers", name)
+            if (
+                server is not None
+                and server.id == flip.server.id
+                and getattr(server, "status", None) == constants.SERVER_STATUS_RUNNING
+            ):
+                return name
+
+        return None
+
+    def __desired_destination(self) -> str | None:
+        """Keep a healthy candidate the floating IP is on, otherwise choose one."""
+        if len(self.destinations) == 1:
+            return self.destination
+
+        return self.__current_destination() or self.select_destination()
+
+    def plan(self, direction: str) -> base.PlanItem | None:
+        """Compare the desired and the current server of the floating IP.
+
+        Parameters
+        ----------
+        direction: str
+                   Either 'src' or 'dest'.
+
+        Returns
+        -------
+        PlanItem | None: None if a resource cannot be resolved, reassigning reports the error.
+        """
+        if direction not in ["src", "dest"]:
+            raise ValueError(f"Invalid destination {direction}! Must be 'src' or 'dest'.")
+
+        desired = self.source if direction == "src" else self.__desired_destination()
+        if desired is None:
+            return None
+        dest_server = self.resolve("servers", desired)
+        flip = self.__floating_ip()
+        if dest_server is None or flip is None:
+            return None
+
+        current = None
+        if flip.server is not None:
+            if flip.server.id == dest_server.id:
+                current = desired
+            elif self.snapshot and self.snapshot.get_by_id("servers", flip.server.id):
+                current = self.snapshot.get_by_id("servers", flip.server.id).name
+            else:
+                current = f"server {flip.server.id}"
+
+        return base.PlanItem(resource=self.resource, desired=desired, current=current)
+
     def reassign_server(self, dest: str) -> int:
         """Reassign floating IP section.
 
@@ -45,29 +237,48 @@ class HCloudFloatingIPSection(base.HcloudClassBase):
         Returns
         -------
         status: int
-                A status code word. Can be 'success' (0), 'running' (1) or 'error' (2).
+                A status code word. Can be 'success' (0), 'error' (2) or 'timeout' (3).
 
         """
-        dest_server = self.hclient.servers.get_by_name(name=dest)
-        if dest_server is None:
-            print(f"Server resource {dest_server} not found.")
-            return self.status_error
+        self.target = dest
+        response = None
+        for refresh in (False, True):
+            with self.phase("resolve"):
+                dest_server = self.resolve("servers", dest, refresh=refresh)
+                flip = self.resolve("floating_ips", self.resource, refresh=refresh)
 
-        flip = self.hclient.floating_ips.get_by_name(self.resource)
-        if flip is None:
-            print(f"Floating IP resource {self.resource} not found.")
-            return self.status_error
+            if dest_server is None:
+                print(f"Server resource {dest} not found.")
+                return self.status_error
+
+            if flip is None:
+                print(f"Floating IP resource {self.resource} not found.")
+                return self.status_error
+
+            # Reassign floating ip to server
+            try:
+                with self.phase("assign"):
+                    response = self.hclient.floating_ips.assign(floating_ip=flip, server=dest_server)
+                break
+            except base.HcloudAPIException as err:
+                # Resolved objects might be outdated, look them up again once.
+                if err.code != "not_found" or refresh:
+                    raise
+                telemetry.retries.inc(reason=err.code)
 
-        # Reassign floating ip to server
-        response = self.hclient.floating_ips.assign(floating_ip=flip, server=dest_server)
         # Check status of reassign action
         status = self.__check_action_status__(response=response)
 
         return status
 
     def __assign_destination(self) -> int:
-        """Assign floating IP section to destination."""
-        return self.reassign_server(dest=self.destination)
+        """Assign floating IP section to the destination or the least loaded candidate."""
+        dest = self.__desired_destination()
+        if dest is None:
+            print(f"No healthy destination for floating IP resource {self.resource}.")
+            return self.status_error
+
+        return self.reassign_server(dest=dest)
 
     def __assign_source(self) -> int:
         """Assign floating IP section to source."""
@@ -0,0 +1,204 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides a class and methods to reassign groups of floating IP address objects.
+
+A group section selects floating IPs by a label selector instead of a name,
+e.g. 'role=web,env=prod'. Its members are listed by the API in one call, so
+a group of any size needs the same number of lookups. All floating IPs not
+on the desired server yet are assigned concurrently and their actions
+polled together.
+"""
+
+# Import thread pool for concurrent assigns
+from concurrent.futures import ThreadPoolExecutor
+
+# Import monotonic clock for the age of the member list
+from time import monotonic
+
+# Import connection errors of the API client
+from requests import RequestException
+
+# Import utilities
+from ..core import base, deadline
+from ..utils import constants
+from ..utils.types import HcloudSectionFloatingIpGroup_t
+
+# Model
+ip_floating_group_section_model = {"selector": str, "source": str, "destination": str}
+
+
+class HCloudFloatingIPGroupSection(base.HcloudClassBase):
+    """This class represents a group of floating IPs selected by labels and its actions."""
+
+    def __init__(
+        self,
+        section: HcloudSectionFloatingIpGroup_t,
+        client: dict,
+        hclient: base.HcloudClient | None = None,
+        cache: base.ResolutionCache | None = None,
+        snapshot: base.ProjectSnapshot | None = None,
+    ):
+        """Initialize a floating IP group section object.
+
+        Parameters
+        ----------
+        section: HcloudSectionFloatingIpGroup_t
+                 Dictionary with ip_floating_group section contents. The selector
+                 uses the label selector syntax of the Hetzner Cloud API.
+        client: dict
+                Dictionary of connection information such as API token and endpoint url.
+        hclient: HcloudClient | None, optional
+                 Shared hcloud.Client object. Use when to reassign multiple resources.
+        cache: ResolutionCache | None, optional
+               Persistent name to ID cache shared by sections.
+        snapshot: ProjectSnapshot | None, optional
+                  Listed project resources shared by sections.
+        """
+        self.section_type = "ip_floating_group"
+        self.section_model = ip_floating_group_section_model
+
+        super().__init__(section=section, client=client, hclient=hclient, cache=cache, snapshot=snapshot)
+
+        self.selector: str = section["selector"]
+        self.resource: str = self.selector
+        self.source: str = section["source"]
+        self.destination: str = section["destination"]
+
+        # Time and floating IPs of the last member list
+        self.__members: tuple[float, list] | None = None
+
+    def prefetch_resources(self) -> list[tuple[str, str]]:
+        """List servers of this section, floating IPs are listed by the selector."""
+        return [("servers", self.source), ("servers", self.destination)]
+
+    def members(self, refresh: bool = False) -> list:
+        """List the floating IPs matching the selector with one list call.
+
+        A list is reused for GROUP_MEMBERS_MAX_AGE seconds, so planning and
+        reassigning right after do not list the group twice.
+
+        Parameters
+        ----------
+        refresh: bool, optional
+                 List the group again regardless of its age.
+
+        Returns
+        -------
+        list[BoundFloatingIP]: Floating IPs sorted by name.
+        """
+        if not refresh and self.__members and monotonic() - self.__members[0] < constants.GROUP_MEMBERS_MAX_AGE:
+            return self.__members[1]
+
+        flips = sorted(self.hclient.floating_ips.get_all(label_selector=self.selector), key=lambda flip: flip.name)
+        self.__members = (monotonic(), flips)
+        if self.cache:
+            self.cache.set_many("floating_ips", {flip.name: flip.id for flip in flips})
+
+        return flips
+
+    def plan(self, direction: str) -> base.PlanItem | None:
+        """Compare the desired and the current server of the floating IPs.
+
+        Parameters
+        ----------
+        direction: str
+                   Either 'src' or 'dest'.
+
+        Returns
+        -------
+        PlanItem | None: None if the server cannot be resolved, reassigning reports the error.
+        """
+        if direction not in ["src", "dest"]:
+            raise ValueError(f"Invalid destination {direction}! Must be 'src' or 'dest'.")
+
+        desired = self.source if direction == "src" else self.destination
+        dest_server = self.resolve("servers", desired)
+        if dest_server is None:
+            return None
+
+        flips = self.members()
+        moving = [flip for flip in flips if flip.server is None or flip.server.id != dest_server.id]
+        current = desired if not moving else f"{len(moving)} of {len(flips)} floating IPs elsewhere"
+
+        return base.PlanItem(resource=self.resource, desired=desired, current=current, action_calls=len(moving))
+
+    def reassign_server(self, dest: str) -> int:
+        """Reassign floating IP group section.
+
+        Parameters
+        ----------
+        dest: str
+              Name of the server object to get assigned.
+
+        Returns
+        -------
+        status: int
+                A status code word. Can be 'success' (0), 'error' (2) or 'timeout' (3).
+
+        """
+        self.target = dest
+        with self.phase("resolve"):
+            dest_server = self.resolve("servers", dest)
+            flips = self.members()
+
+        if dest_server is None:
+            print(f"Server resource {dest} not found.")
+            return self.status_error
+
+        if not flips:
+            print(f"No floating IP matches selector {self.selector}.")
+            return self.status_error
+
+        moving = [flip for flip in flips if flip.server is None or flip.server.id != dest_server.id]
+        if not moving:
+            return self.status_success
+
+        def assign(flip) -> tuple[object | None, int]:
+            """Assign one floating IP, get its action or the status it failed with."""
+            try:
+                with deadline.scope(bound):
+                    return self.hclient.floating_ips.assign(floating_ip=flip, server=dest_server), self.status_success
+            except deadline.DeadlineExceeded as err:
+                print(f"{flip.name}: {err}")
+                return None, self.status_timeout
+            except (base.HcloudException, RequestException) as err:
+                print(f"{flip.name}: {err}")
+                return None, self.status_error
+
+        workers = max(1, min(constants.DEFAULT_WORKERS, len(moving)))
+        with self.phase("assign"), ThreadPoolExecutor(max_workers=workers, thread_name_prefix="group") as pool:
+            # Pool threads do not inherit the deadline of this thread, they get the share of this phase
+            bound = deadline.current()
+            results = list(pool.map(assign, moving))
+
+        # Members changed servers, list them again next time
+        self.__members = None
+
+        # Floating IPs whose assign failed keep their status, the others are waited for
+        submitted = [response for response, _ in results if response is not None]
+        timed_out = any(status == self.status_timeout for _, status in results)
+        statuses = {}
+        if submitted:
+            # Actions already submitted are waited for even if the deadline passed
+            with deadline.scope(None if timed_out else deadline.current()):
+                statuses = self.__check_actions_status__(responses=submitted)
+
+        return max(status if response is None else statuses[response.id] for response, status in results)
+
+    def reassign(self, direction: str) -> int:
+        """Reassign floating IP group section by direction.
+
+        Parameters
+        ----------
+        direction: str
+                   Either 'src' or 'dest'.
+
+        Raises
+        ------
+        ValueError: If 'dest' is not 'src' or 'dest'.
+        """
+        if direction not in ["src", "dest"]:
+            raise ValueError(f"Invalid destination {direction}! Must be 'src' or 'dest'.")
+
+        return self.reassign_server(dest=self.source if direction == "src" else self.destination)
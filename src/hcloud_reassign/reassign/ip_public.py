@@ -0,0 +1,289 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides a class and methods to reassign primary IP address objects.
+
+A primary IP must be unassigned from its server before it can be assigned
+to another one. A section may move several primary IPs, e.g. the IPv4 and
+the IPv6 address of a server. All unassigns are submitted at once and their
+actions polled together, then all assigns, so the time needed is bound by
+two action waits regardless of the number of addresses. Both servers must be
+powered off, and addresses whose assign fails are assigned back to their
+previous server.
+"""
+
+# Import timer for the duration of each step per address
+from time import perf_counter
+
+# Import connection errors of the API client
+from requests import RequestException
+
+# Import utilities
+from ..core import base, deadline
+from ..utils.types import HcloudSectionPrimaryIp_t
+
+# Model
+ip_public_section_model = {"resource": str, "source": str, "destination": str}
+
+
+class HCloudPrimaryIPSection(base.HcloudClassBase):
+    """This class represents a primary IP section and its actions."""
+
+    def __init__(
+        self,
+        section: HcloudSectionPrimaryIp_t,
+        client: dict,
+        hclient: base.HcloudClient | None = None,
+        cache: base.ResolutionCache | None = None,
+        snapshot: base.ProjectSnapshot | None = None,
+    ):
+        """Initialize a primary IP section object.
+
+        Parameters
+        ----------
+        section: HcloudSectionPrimaryIp_t
+                 Dictionary with ip_public section contents. The resource may
+                 list several primary IPs separated by commas.
+        client: dict
+                Dictionary of connection information such as API token and endpoint url.
+        hclient: HcloudClient | None, optional
+                 Shared hcloud.Client object. Use when to reassign multiple resources.
+        cache: ResolutionCache | None, optional
+               Persistent name to ID cache shared by sections.
+        snapshot: ProjectSnapshot | None, optional
+                  Listed project resources shared by sections.
+        """
+        self.section_type = "ip_public"
+        self.section_model = ip_public_section_model
+
+        super().__init__(section=section, client=client, hclient=hclient, cache=cache, snapshot=snapshot)
+
+        self.resources: list[str] = [name.strip() for name in section["resource"].split(",") if name.strip()]
+        self.resource: str = ",".join(self.resources)
+        self.source: str = section["source"]
+        self.destination: str = section["destination"]
+
+        # Seconds of the unassign and assign step by primary IP of the last reassignment
+        self.timings: dict[str, dict[str, float]] = {}
+
+    def prefetch_resources(self) -> list[tuple[str, str]]:
+        """List servers and the primary IPs of this section."""
+        return [
+            ("servers", self.source),
+            ("servers", self.destination),
+            *(("primary_ips", name) for name in self.resources),
+        ]
+
+    def __primary_ips(self, refresh: bool = False) -> dict[str, object | None]:
+        """Resolve all primary IPs with their assignee."""
+        primary_ips = {}
+        for name in self.resources:
+            primary_ip = self.resolve("primary_ips", name, refresh=refresh)
+            # Primary IPs only known by their cached ID have no assignee
+            if primary_ip is not None and ("primary_ips", name) in self.id_only:
+                primary_ip = self.resolve("primary_ips", name, refresh=True)
+            primary_ips[name] = primary_ip
+
+        return primary_ips
+
+    def __running_servers(self) -> list[str] | None:
+        """List the servers of the section that are not powered off, None if one cannot be resolved."""
+        running = []
+        for name in (self.source, self.destination):
+            server = self.resolve("servers", name)
+            # Servers only known by their cached ID have no status
+            if server is not None and ("servers", name) in self.id_only:
+                server = self.resolve("servers", name, refresh=True)
+            if server is None:
+                print(f"Server resource {name} not found.")
+                return None
+            if server.status != "off":
+                running.append(name)
+
+        return running
+
+    def plan(self, direction: str) -> base.PlanItem | None:
+        """Compare the desired and the current server of the primary IPs.
+
+        Parameters
+        ----------
+        direction: str
+                   Either 'src' or 'dest'.
+
+        Returns
+        -------
+        PlanItem | None: None if a resource cannot be resolved, reassigning reports the error.
+        """
+        if direction not in ["src", "dest"]:
+            raise ValueError(f"Invalid destination {direction}! Must be 'src' or 'dest'.")
+
+        desired = self.source if direction == "src" else self.destination
+        dest_server = self.resolve("servers", desired)
+        primary_ips = self.__primary_ips()
+        if dest_server is None or None in primary_ips.values():
+            return None
+
+        moving = [primary_ip for primary_ip in primary_ips.values() if primary_ip.assignee_id != dest_server.id]
+        unassigns = sum(primary_ip.assignee_id is not None for primary_ip in moving)
+        current = desired if not moving else f"{len(moving)} of {len(self.resources)} IPs elsewhere"
+
+        return base.PlanItem(
+            resource=self.resource, desired=desired, current=current, action_calls=unassigns + len(moving)
+        )
+
+    def __step(self, step: str, calls: dict[str, object]) -> tuple[dict[str, int], Exception | None]:
+        """Submit one call per primary IP, then wait for all actions together.
+
+        Parameters
+        ----------
+        step: str
+              Name of the step, 'unassign', 'assign' or 'restore'.
+        calls: dict[str, object]
+               Functions without arguments submitting the step, by primary IP name.
+
+        Returns
+        -------
+        tuple[dict[str, int], Exception | None]: Status by primary IP name and the deadline error that stopped
+                                                 further calls. Failed calls are 'error', calls not sent 'timeout'.
+        """
+        submitted = {}
+        responses = {}
+        failed = {}
+        error = None
+        for name, call in calls.items():
+            if error is not None:
+                failed[name] = self.status_timeout
+                continue
+            submitted[name] = perf_counter()
+            try:
+                with self.phase(step):
+                    responses[name] = call()
+            except deadline.DeadlineExceeded as err:
+                error = err
+                failed[name] = self.status_timeout
+            except (base.HcloudException, RequestException) as err:
+                print(f"Primary IP {name}: {step} failed: {err}")
+                failed[name] = self.status_error
+
+        statuses = {}
+        if responses:
+            # Actions already submitted are waited for even if the deadline passed
+            with deadline.scope(None if error else deadline.current()):
+                statuses = self.__check_actions_status__(responses=list(responses.values()))
+        finished = perf_counter()
+
+        for name in responses:
+            self.timings.setdefault(name, {})[step] = finished - submitted[name]
+
+        return {name: statuses[response.id] for name, response in responses.items()} | failed, error
+
+    def reassign_server(self, dest: str) -> int:
+        """Reassign primary IP section.
+
+        Parameters
+        ----------
+        dest: str
+              Name of the server object to get assigned.
+
+        Returns
+        -------
+        status: int
+                A status code word. Can be 'success' (0), 'error' (2) or 'timeout' (3).
+
+        Raises
+        ------
+        DeadlineExceeded: The deadline passed, after stranded addresses were restored.
+        """
+        self.target = dest
+        self.timings = {}
+        with self.phase("resolve"):
+            dest_server = self.resolve("servers", dest)
+            primary_ips = self.__primary_ips()
+
+        if dest_server is None:
+            print(f"Server resource {dest} not found.")
+            return self.status_error
+
+        for name, primary_ip in primary_ips.items():
+            if primary_ip is None:
+                print(f"Primary IP resource {name} not found.")
+                return self.status_error
+
+        moving = {name: ip for name, ip in primary_ips.items() if ip.assignee_id != dest_server.id}
+        if not moving:
+            return self.status_success
+
+        # The API only moves primary IPs between powered off servers
+        running = self.__running_servers()
+        if running is None:
+            return self.status_error
+        if running:
+            print(f"Server {', '.join(running)} must be powered off to move primary IPs.")
+            return self.status_error
+
+        # Free all addresses first, a primary IP cannot be assigned twice
+        unassigned, error = self.__step(
+            "unassign",
+            {
+                name: (lambda ip=ip: self.hclient.primary_ips.unassign(primary_ip=ip))
+                for name, ip in moving.items()
+                if ip.assignee_id is not None
+            },
+        )
+        statuses = dict(unassigned)
+
+        assigned = {}
+        if error is None:
+            assigned, error = self.__step(
+                "assign",
+                {
+                    name: (lambda ip=ip: self.hclient.primary_ips.assign(primary_ip=ip, assignee_id=dest_server.id))
+                    for name, ip in moving.items()
+                    if unassigned.get(name, self.status_success) == self.status_success
+                },
+            )
+        statuses.update(assigned)
+
+        # Addresses left without a server go back to where they were, even if the deadline passed
+        stranded = {
+            name: moving[name]
+            for name, status in unassigned.items()
+            if status == self.status_success and assigned.get(name) != self.status_success
+        }
+        if stranded:
+            with deadline.scope(None):
+                restored, _ = self.__step(
+                    "restore",
+                    {
+                        name: (lambda ip=ip: self.hclient.primary_ips.assign(primary_ip=ip, assignee_id=ip.assignee_id))
+                        for name, ip in stranded.items()
+                    },
+                )
+            for name, status in restored.items():
+                result = "restored" if status == self.status_success else "could not be restored"
+                print(f"Primary IP {name} {result} on server ID {stranded[name].assignee_id}.")
+
+        for name, steps in self.timings.items():
+            print(f"{name}: " + ", ".join(f"{step} {seconds:.2f}s" for step, seconds in steps.items()))
+
+        if error is not None:
+            raise error
+
+        return max(statuses.values(), default=self.status_success)
+
+    def reassign(self, direction: str) -> int:
+        """Reassign primary IP section by direction.
+
+        Parameters
+        ----------
+        direction: str
+                   Either 'src' or 'dest'.
+
+        Raises
+        ------
+        ValueError: If 'dest' is not 'src' or 'dest'.
+        """
+        if direction not in ["src", "dest"]:
+            raise ValueError(f"Invalid destination {direction}! Must be 'src' or 'dest'.")
+
+        return self.reassign_server(dest=self.source if direction == "src" else self.destination)
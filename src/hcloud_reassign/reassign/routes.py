@@ -0,0 +1,351 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides a class and methods to reassign routes of a private network.
+
+A routes section points a list of destinations of one network at the
+private IP of the source or the destination server. Only routes that do
+not point at the desired gateway yet are changed: their old routes are
+deleted and the new ones added. Every route change locks the network
+until its action finished, so changes are sent one after another and
+retried while the network is locked, as long as the deadline of the
+reassignment or the action timeout allows.
+
+A failing change must not leave destinations without a route: routes
+deleted before the failure are added again with their old gateway,
+unless a new route to their destination was added already.
+"""
+
+# Import ip helpers to compare routes independent of their notation
+from ipaddress import ip_address, ip_network
+
+# Import sleep for the backoff while the network is locked
+from time import monotonic, sleep
+
+# Import utilities
+from ..core import base, deadline, telemetry
+from ..core.actions import backoff
+from ..utils import constants
+from ..utils.types import HcloudSectionRoutes_t
+
+# Model
+routes_section_model = {"resource": str, "source": str, "destination": str, "routes": str}
+
+
+def diff_routes(
+    routes: list, destinations: list[str], gateway: str
+) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """Compute the minimal changes pointing destinations at a gateway.
+
+    Parameters
+    ----------
+    routes : list
+             Current routes of the network, objects with 'destination' and 'gateway'.
+    destinations : list[str]
+                   Destination networks to point at the gateway.
+    gateway : str
+              IP address of the desired gateway.
+
+    Returns
+    -------
+    tuple[list[tuple[str, str]], list[tuple[str, str]]]: Routes to delete and routes to add,
+                                                          as pairs of destination and gateway.
+    """
+    current = {str(ip_network(route.destination, strict=False)): route for route in routes}
+
+    deletes, adds = [], []
+    for destination in destinations:
+        route = current.get(str(ip_network(destination, strict=False)))
+        if route is not None and ip_address(route.gateway) == ip_address(gateway):
+            continue
+        if route is not None:
+            deletes.append((route.destination, route.gateway))
+        adds.append((destination, gateway))
+
+    return deletes, adds
+
+
+class HCloudRoutesSection(base.HcloudClassBase):
+    """This class represents a routes section and its actions."""
+
+    def __init__(
+        self,
+        section: HcloudSectionRoutes_t,
+        client: dict,
+        hclient: base.HcloudClient | None = None,
+        cache: base.ResolutionCache | None = None,
+        snapshot: base.ProjectSnapshot | None = None,
+    ):
+        """Initialize a routes section object.
+
+        Parameters
+        ----------
+        section: HcloudSectionRoutes_t
+                 Dictionary with routes section contents. The resource names the
+                 network, source and destination are server names or gateway IPs,
+                 routes lists destination networks separated by commas.
+        client: dict
+                Dictionary of connection information such as API token and endpoint url.
+        hclient: HcloudClient | None, optional
+                 Shared hcloud.Client object. Use when to reassign multiple resources.
+        cache: ResolutionCache | None, optional
+               Persistent name to ID cache shared by sections.
+        snapshot: ProjectSnapshot | None, optional
+                  Listed project resources shared by sections.
+        """
+        self.section_type = "routes"
+        self.section_model = routes_section_model
+
+        super().__init__(section=section, client=client, hclient=hclient, cache=cache, snapshot=snapshot)
+
+        self.resource: str = section["resource"]
+        self.source: str = section["source"]
+        self.destination: str = section["destination"]
+        self.routes: list[str] = [route.strip() for route in section["routes"].split(",") if route.strip()]
+        for route in self.routes:
+            ip_network(route, strict=False)
+
+    @staticmethod
+    def __is_ip(name: str) -> bool:
+        """Check if a gateway is given as IP address instead of a server name."""
+        try:
+            ip_address(name)
+        except ValueError:
+            return False
+        return True
+
+    def prefetch_resources(self) -> list[tuple[str, str]]:
+        """List the network and the gateway servers of this section."""
+        return [
+            ("networks", self.resource),
+            *(("servers", name) for name in (self.source, self.destination) if not self.__is_ip(name)),
+        ]
+
+    def __network(self):
+        """Resolve the network with its routes."""
+        network = self.resolve("networks", self.resource)
+        # Networks only known by their cached ID have no routes
+        if network is not None and ("networks", self.resource) in self.id_only:
+            network = self.resolve("networks", self.resource, refresh=True)
+        return network
+
+    def gateway(self, name: str, network) -> str | None:
+        """Get the gateway IP of a server or IP on the network.
+
+        Parameters
+        ----------
+        name: str
+              Server name or IP address.
+        network: BoundNetwork
+                 Network of the routes.
+
+        Returns
+        -------
+        str | None: Private IP of the server or None if it is not attached to the network.
+        """
+        if self.__is_ip(name):
+            return name
+
+        server = self.resolve("servers", name)
+        if server is not None and ("servers", name) in self.id_only:
+            server = self.resolve("servers", name, refresh=True)
+        if server is None:
+            return None
+
+        for private_net in getattr(server, "private_net", None) or []:
+            if private_net.network.id == network.id:
+                return private_net.ip
+
+        return None
+
+    def __diff(self, dest: str) -> tuple[list[tuple[str, str]], list[tuple[str, str]]] | None:
+        """Get routes to delete and add, None if the network or gateway is unknown."""
+        network = self.__network()
+        if network is None:
+            print(f"Network resource {self.resource} not found.")
+            return None
+
+        gateway = self.gateway(dest, network)
+        if gateway is None:
+            print(f"Server resource {dest} not found in network {self.resource}.")
+            return None
+
+        return diff_routes(network.routes or [], self.routes, gateway)
+
+    def plan(self, direction: str) -> base.PlanItem | None:
+        """Compare the desired and the current gateway of the routes.
+
+        Parameters
+        ----------
+        direction: str
+                   Either 'src' or 'dest'.
+
+        Returns
+        -------
+        PlanItem | None: None if a resource cannot be resolved, reassigning reports the error.
+        """
+        if direction not in ["src", "dest"]:
+            raise ValueError(f"Invalid destination {direction}! Must be 'src' or 'dest'.")
+
+        desired = self.source if direction == "src" else self.destination
+        diff = self.__diff(desired)
+        if diff is None:
+            return None
+
+        deletes, adds = diff
+        current = desired if not adds else f"{len(adds)} of {len(self.routes)} routes elsewhere"
+
+        return base.PlanItem(
+            resource=self.resource, desired=desired, current=current, action_calls=len(deletes) + len(adds)
+        )
+
+    def __change(self, call, network, destination: str, gateway: str, phase: str, expires: float):
+        """Submit one route change, retrying while the network is locked by another action.
+
+        Parameters
+        ----------
+        call: Callable
+              Either networks.add_route or networks.delete_route.
+        network: BoundNetwork
+                 Network of the routes.
+        destination: str
+                     Destination network of the route.
+        gateway: str
+                 Gateway IP of the route.
+        phase: str
+               Phase the change is timed as.
+        expires: float
+                 Monotonic time retries stop at, unless the deadline ends them earlier.
+
+        Returns
+        -------
+        BoundAction: Action of the change.
+        """
+        route = base.HcloudNetworkRoute(destination=destination, gateway=gateway)
+        attempt = 0
+        while True:
+            try:
+                with self.phase(phase):
+                    return call(network=network, route=route)
+            except base.HcloudAPIException as err:
+                # Another action on the network is still running
+                remaining = deadline.clip(expires - monotonic())
+                if err.code != "locked" or remaining <= 0:
+                    raise
+                telemetry.retries.inc(reason=err.code)
+                sleep(min(backoff(attempt), remaining))
+                attempt += 1
+
+    def __submit(
+        self, call, network, routes: list[tuple[str, str]], phase: str
+    ) -> tuple[dict[tuple[str, str], int], Exception | None]:
+        """Submit route changes one after another and wait for their actions.
+
+        Returns
+        -------
+        tuple[dict[tuple[str, str], int], Exception | None]: Status by submitted route and the error
+                                                             that stopped further changes.
+        """
+        expires = monotonic() + constants.ACTION_TIMEOUT
+        responses = {}
+        error = None
+        for destination, gateway in routes:
+            try:
+                responses[(destination, gateway)] = self.__change(call, network, destination, gateway, phase, expires)
+            except (base.HcloudException, deadline.DeadlineExceeded) as err:
+                error = err
+                break
+
+        if not responses:
+            return {}, error
+
+        # Actions already submitted are waited for even if the deadline passed
+        with deadline.scope(None if error else deadline.current()):
+            statuses = self.__check_actions_status__(responses=list(responses.values()))
+
+        return {route: statuses[response.id] for route, response in responses.items()}, error
+
+    def __restore(self, network, deleted: list[tuple[str, str]], added: list[tuple[str, str]]) -> None:
+        """Add deleted routes again whose destination got no new route."""
+        routed = {str(ip_network(destination, strict=False)) for destination, _ in added}
+        missing = [route for route in deleted if str(ip_network(route[0], strict=False)) not in routed]
+        if not missing:
+            return
+
+        # Restoring routes must not be cut short by the deadline that may have just passed
+        with deadline.scope(None):
+            statuses, error = self.__submit(self.hclient.networks.add_route, network, missing, "restore")
+
+        for (destination, gateway), status in statuses.items():
+            if status == self.status_success:
+                print(f"Route {destination} restored via {gateway}.")
+        for destination, gateway in missing:
+            if statuses.get((destination, gateway)) != self.status_success:
+                print(f"Route {destination} via {gateway} could not be restored: {error or 'action failed'}")
+
+    def reassign_server(self, dest: str) -> int:
+        """Point the routes at a gateway.
+
+        Parameters
+        ----------
+        dest: str
+              Name of the gateway server or its IP address.
+
+        Returns
+        -------
+        status: int
+                A status code word. Can be 'success' (0), 'error' (2) or 'timeout' (3).
+
+        Raises
+        ------
+        HcloudException, DeadlineExceeded: A change failed, after deleted routes were restored.
+        """
+        self.target = dest
+        with self.phase("resolve"):
+            diff = self.__diff(dest)
+        if diff is None:
+            return self.status_error
+
+        deletes, adds = diff
+        network = self.__network()
+
+        # Old routes must be gone before routes to the same destinations are added
+        deleted, added = [], []
+        status, error = self.status_success, None
+        for call, routes, phase in (
+            (self.hclient.networks.delete_route, deletes, "delete"),
+            (self.hclient.networks.add_route, adds, "assign"),
+        ):
+            statuses, error = self.__submit(call, network, routes, phase)
+            status = max(statuses.values(), default=self.status_success)
+            if phase == "delete":
+                # A timed out delete may still remove its route
+                deleted = [route for route, route_status in statuses.items() if route_status != self.status_error]
+            else:
+                added = [route for route, route_status in statuses.items() if route_status == self.status_success]
+            if error is not None or status != self.status_success:
+                break
+
+        if error is not None or status != self.status_success:
+            self.__restore(network, deleted, added)
+        if error is not None:
+            raise error
+
+        return status
+
+    def reassign(self, direction: str) -> int:
+        """Reassign routes section by direction.
+
+        Parameters
+        ----------
+        direction: str
+                   Either 'src' or 'dest'.
+
+        Raises
+        ------
+        ValueError: If 'dest' is not 'src' or 'dest'.
+        """
+        if direction not in ["src", "dest"]:
+            raise ValueError(f"Invalid destination {direction}! Must be 'src' or 'dest'.")
+
+        return self.reassign_server(dest=self.source if direction == "src" else self.destination)
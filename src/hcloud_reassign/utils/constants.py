@@ -36,3 +36,84 @@ STATUS_SUCCESS = 0
 STATUS_RUNNING = 1
 STATUS_ERROR = 2
 STATUS_TIMEOUT = 3
+
+# Number of resources reassigned at the same time
+DEFAULT_WORKERS = 8
+
+# Tags of a section, used to select sections on the command line
+CONFIG_OPTION_TAGS = "tags"
+
+# Seconds the member list of a floating IP group is reused
+GROUP_MEMBERS_MAX_AGE = 5
+
+# Number of projects reassigned at the same time and suffix of configuration files in a directory
+DEFAULT_PROJECT_WORKERS = 8
+CONFIG_FILE_SUFFIX = ".ini"
+
+# Daemon defaults
+DAEMON_SOCKET_PATH = "/run/hcloud-reassign/hcloud-reassign.sock"
+DAEMON_REFRESH_INTERVAL = 60
+DAEMON_COMMAND_REASSIGN = "reassign"
+DAEMON_COMMAND_PING = "ping"
+DAEMON_ANSWER_SUPERSEDED = "superseded"
+
+# Relay defaults, the signature header, the seconds a signed request stays valid and the bytes of its body
+RELAY_DEFAULT_PORT = 8421
+RELAY_PATH = "/reassign"
+RELAY_SIGNATURE_HEADER = "X-Hcloud-Reassign-Signature"
+RELAY_MAX_AGE = 30
+RELAY_MAX_BODY = 4096
+
+# Seconds without further transitions of a resource before it is reassigned
+EVENT_DEBOUNCE = 0.2
+
+# Resolution cache options and defaults
+CONFIG_OPTION_CACHE_PATH = "cache_path"
+CONFIG_OPTION_CACHE_TTL = "cache_ttl"
+CACHE_DEFAULT_TTL = 86400
+
+# Action polling defaults in seconds
+ACTION_TIMEOUT = 30
+ACTION_POLL_BASE = 0.1
+ACTION_POLL_CAP = 2.0
+ACTION_POLL_BATCH = 50
+
+# Deadline of a reassignment in seconds, 0 disables it, and the share of it each phase may use
+CONFIG_OPTION_DEADLINE = "deadline"
+REASSIGN_DEADLINE = 60
+DEADLINE_SHARES = {"resolve": 0.25, "assign": 0.25, "delete": 0.25, "unassign": 0.25, "action_wait": 1.0}
+DEADLINE_MIN_TIMEOUT = 0.01
+
+# Hedging of slow reads, latencies kept per endpoint and needed before hedging
+CONFIG_OPTION_HEDGE = "hedge"
+HEDGE_PERCENTILE = 0.95
+HEDGE_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+
+# Rate limit options and defaults
+CONFIG_OPTION_RATE_LIMIT = "rate_limit"
+CONFIG_OPTION_RATE_LIMIT_STATE = "rate_limit_state"
+RATE_LIMIT_DEFAULT_LIMIT = 3600
+RATE_LIMIT_DEFAULT_PERIOD = 3600
+
+# Request priorities, lower numbers are served first
+PRIORITY_ACTION = 0
+PRIORITY_POLL = 1
+PRIORITY_LOOKUP = 2
+PRIORITY_METRICS = 3
+
+# Metrics store option
+CONFIG_OPTION_METRICS_STORE = "metrics_store"
+
+# Destination placement, weights of the load scores and age of a choice in seconds
+PLACEMENT_WEIGHTS = {"cpu": 1.0, "network": 1.0, "disk": 1.0, "floating_ips": 1.0}
+PLACEMENT_MAX_AGE = 10
+PLACEMENT_STEP = 60
+SERVER_STATUS_RUNNING = "running"
+
+# Watch options and defaults, intervals in seconds
+CONFIG_OPTION_WATCH = "watch"
+WATCH_DEFAULT_INTERVAL = 30
+WATCH_DEFAULT_STEP = 60
+# Share of the rate limit the watch loop may use for metrics
+WATCH_RATE_SHARE = 0.5
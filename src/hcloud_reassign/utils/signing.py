@@ -0,0 +1,109 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module signs and checks relay requests.
+
+A relay request is a JSON object with the node name, section, direction,
+a Unix timestamp and a random nonce. It is signed with HMAC-SHA256 over the
+exact request body using a secret shared by the node and the relay. This
+module only uses the standard library, so nodes can sign requests without
+loading the Hetzner Cloud modules.
+"""
+
+# Import hmac and hashlib for signatures
+import hashlib
+import hmac
+
+# Import json and secrets for request bodies
+import json
+import secrets
+
+# Import time for timestamps
+import time
+
+
+def normalize_secret(raw: bytes) -> bytes:
+    """Get the secret of a secret file or nodes file entry.
+
+    The secret is the first line that is not blank, without surrounding
+    whitespace. helpers/keepalived/inform_relay.sh reads secret files by
+    the same rule, so both clients sign with the same key.
+
+    Parameters
+    ----------
+    raw : bytes
+          Contents of the secret file.
+
+    Returns
+    -------
+    bytes: Secret, empty if there is none.
+    """
+    lines = raw.strip().splitlines()
+    return lines[0].strip() if lines else b""
+
+
+def signature(secret: bytes, body: bytes) -> str:
+    """Get the signature of a request body.
+
+    Parameters
+    ----------
+    secret : bytes
+             Secret shared by the node and the relay.
+    body : bytes
+           Exact request body.
+
+    Returns
+    -------
+    str: Hex encoded HMAC-SHA256.
+    """
+    return hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+def verify(secret: bytes, body: bytes, signed: str) -> bool:
+    """Check the signature of a request body in constant time.
+
+    Parameters
+    ----------
+    secret : bytes
+             Secret shared by the node and the relay.
+    body : bytes
+           Exact request body.
+    signed : str
+             Hex encoded signature sent with the request.
+
+    Returns
+    -------
+    bool
+    """
+    return hmac.compare_digest(signature(secret, body), signed or "")
+
+
+def relay_request(node: str, section: str, direction: str, secret: bytes) -> tuple[bytes, str]:
+    """Create a signed relay request.
+
+    Parameters
+    ----------
+    node : str
+           Name of the node sending the request.
+    section : str
+              Section to reassign.
+    direction : str
+                Either 'src' or 'dest'.
+    secret : bytes
+             Secret of the node.
+
+    Returns
+    -------
+    tuple[bytes, str]: Request body and its signature.
+    """
+    body = json.dumps(
+        {
+            "node": node,
+            "section": section,
+            "direction": direction,
+            "timestamp": int(time.time()),
+            "nonce": secrets.token_hex(16),
+        }
+    ).encode("utf-8")
+
+    return body, signature(secret, body)
@@ -3,15 +3,110 @@
 
 """This module provides structures and function aliases."""
 
+# Import typing helpers
+from collections.abc import Iterator, Mapping
+
+# Import ip_address to skip gateway addresses in the configuration
+from ipaddress import ip_address
+
+# Import importlib to load section classes on demand
+from importlib import import_module
+from importlib.metadata import entry_points
+
+# Import threading to load classes once
+from threading import Lock
+
 # Import utilities
-from ..reassign import ip_floating
 from .constants import STATUS_SUCCESS, STATUS_ERROR, STATUS_RUNNING, STATUS_TIMEOUT
 
-# Enum of Classes to call, mapping to configuration
-# section types.
-hcloud_functions = {
-    "ip_floating": ip_floating.HCloudFloatingIPSection,
-}
+# Entry point group for section types provided by other packages
+SECTION_ENTRY_POINT_GROUP = "hcloud_reassign.sections"
+
+
+class SectionRegistry(Mapping):
+    """This class maps configuration section types to section classes.
+
+    Classes are referenced as 'module:Class' and only imported when a
+    section of this type is used, so the Hetzner Cloud SDK is not loaded
+    by merely importing the command line modules. Unknown types are looked
+    up in the entry point group 'hcloud_reassign.sections'.
+    """
+
+    def __init__(self, targets: dict[str, str], group: str = SECTION_ENTRY_POINT_GROUP) -> None:
+        """Initialize the registry.
+
+        Parameters
+        ----------
+        targets : dict[str, str]
+                  'module:Class' references by section type.
+        group : str, optional
+                Entry point group searched for unknown section types.
+        """
+        self.targets = dict(targets)
+        self.group = group
+        self.__classes: dict[str, type] = {}
+        self.__entry_points_loaded = False
+        self.__lock = Lock()
+
+    def register(self, section_type: str, target: str | type) -> None:
+        """Register a section class.
+
+        Parameters
+        ----------
+        section_type : str
+                       Value of the 'type' option in the configuration.
+        target : str | type
+                 Section class or 'module:Class' reference.
+        """
+        with self.__lock:
+            self.__classes.pop(section_type, None)
+            if isinstance(target, str):
+                self.targets[section_type] = target
+            else:
+                self.targets[section_type] = f"{target.__module__}:{target.__qualname__}"
+                self.__classes[section_type] = target
+
+    def __load_entry_points(self) -> None:
+        """Add section types of installed plugins."""
+        if self.__entry_points_loaded:
+            return
+        for entry_point in entry_points(group=self.group):
+            self.targets.setdefault(entry_point.name, entry_point.value)
+        self.__entry_points_loaded = True
+
+    def __getitem__(self, section_type: str) -> type:
+        """Get the section class, importing it on first use."""
+        with self.__lock:
+            if section_type not in self.__classes:
+                if section_type not in self.targets:
+                    self.__load_entry_points()
+                module_name, _, class_name = self.targets[section_type].partition(":")
+                self.__classes[section_type] = getattr(import_module(module_name), class_name)
+
+            return self.__classes[section_type]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over known section types."""
+        with self.__lock:
+            self.__load_entry_points()
+            return iter(list(self.targets))
+
+    def __len__(self) -> int:
+        """Count known section types."""
+        with self.__lock:
+            self.__load_entry_points()
+            return len(self.targets)
+
+
+# Classes to call, mapping to configuration section types.
+hcloud_functions = SectionRegistry(
+    {
+        "ip_floating": "hcloud_reassign.reassign.ip_floating:HCloudFloatingIPSection",
+        "ip_floating_group": "hcloud_reassign.reassign.ip_floating_group:HCloudFloatingIPGroupSection",
+        "ip_public": "hcloud_reassign.reassign.ip_public:HCloudPrimaryIPSection",
+        "routes": "hcloud_reassign.reassign.routes:HCloudRoutesSection",
+    }
+)
 
 # Enum for error messages.
 status_message = {
@@ -20,3 +115,27 @@ status_message = {
     STATUS_ERROR: "error",
     STATUS_RUNNING: "running",
 }
+
+
+def server_names(value: object) -> list[str]:
+    """Split a source or destination option into server names.
+
+    Parameters
+    ----------
+    value : object
+            Option value, comma separated names for routes sections.
+
+    Returns
+    -------
+    list[str]: Stripped server names, without empty entries and gateway IP addresses.
+    """
+    names = []
+    for name in str(value or "").split(","):
+        name = name.strip()
+        try:
+            ip_address(name)
+        except ValueError:
+            if name:
+                names.append(name)
+
+    return names
@@ -7,5 +7,8 @@ from typing import TypeAlias, Literal
 
 HcloudMetric_t: TypeAlias = Literal["cpu", "disk", "network"]
 HcloudSectionFloatingIp_t: TypeAlias = dict[str, str, str, str, bool]
+HcloudSectionFloatingIpGroup_t: TypeAlias = dict[str, str]
+HcloudSectionPrimaryIp_t: TypeAlias = dict[str, str]
+HcloudSectionRoutes_t: TypeAlias = dict[str, str]
 
 TimeNow_t: TypeAlias = Literal["now"]
@@ -0,0 +1,407 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides a local stand-in for the Hetzner Cloud API.
+
+The stand-in serves the servers, floating_ips, primary_ips, networks and
+actions endpoints used by hcloud-reassign from memory. Latency, the time actions need to finish,
+a rate limit and injected errors can be configured, and every request is
+counted by method and endpoint.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from math import ceil
+from urllib.parse import parse_qs, urlparse
+
+# Timestamp used for created, started and finished fields
+TIMESTAMP = "2025-01-01T00:00:00+00:00"
+
+
+class HcloudStandIn:
+    """This class serves a fake Hetzner Cloud project on a local port."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        action_delay: float = 0.0,
+        rate_limit: int = 3600,
+        rate_period: float = 3600.0,
+    ) -> None:
+        """Initialize an empty project.
+
+        Parameters
+        ----------
+        latency : float, optional
+                  Seconds every request is delayed.
+        action_delay : float, optional
+                       Seconds until an action is reported as finished.
+        rate_limit : int, optional
+                     Requests allowed per rate_period, answered with 429 beyond.
+        rate_period : float, optional
+                      Seconds until the whole rate limit is refilled.
+        """
+        self.latency = latency
+        self.action_delay = action_delay
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+
+        self.servers: dict[int, dict] = {}
+        self.floating_ips: dict[int, dict] = {}
+        self.primary_ips: dict[int, dict] = {}
+        self.networks: dict[int, dict] = {}
+        self.actions: dict[int, dict] = {}
+        self.calls: Counter = Counter()
+        # Errors to answer with, by method and endpoint, see fail
+        self.errors: dict[tuple[str, str], list[tuple[int, str]]] = {}
+
+        self.__lock = threading.Lock()
+        self.__next_id = 1
+        self.__tokens = float(rate_limit)
+        self.__refilled = time.monotonic()
+        self.__server: ThreadingHTTPServer | None = None
+
+    @property
+    def url(self) -> str:
+        """Get the API URL of the running stand-in."""
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __new_id(self) -> int:
+        """Get a new resource ID."""
+        with self.__lock:
+            self.__next_id += 1
+            return self.__next_id
+
+    def add_server(self, name: str, status: str = "running") -> dict:
+        """Add a server and return its JSON object."""
+        server = {"id": self.__new_id(), "name": name, "status": status, "created": TIMESTAMP, "labels": {}}
+        self.servers[server["id"]] = server
+        return server
+
+    def add_floating_ip(self, name: str, server: str | None = None, labels: dict | None = None) -> dict:
+        """Add a floating IP, optionally assigned to a server by name, and return its JSON object."""
+        flip_id = self.__new_id()
+        flip = {
+            "id": flip_id,
+            "name": name,
+            "ip": f"198.51.{flip_id // 256 % 256}.{flip_id % 256}",
+            "type": "ipv4",
+            "server": self.server_id(server) if server else None,
+            "description": None,
+            "dns_ptr": [],
+            "blocked": False,
+            "created": TIMESTAMP,
+            "labels": dict(labels or {}),
+            "protection": {"delete": False},
+        }
+        self.floating_ips[flip_id] = flip
+        return flip
+
+    def add_primary_ip(self, name: str, server: str | None = None, ip_type: str = "ipv4") -> dict:
+        """Add a primary IP, optionally assigned to a server by name, and return its JSON object."""
+        primary_id = self.__new_id()
+        primary_ip = {
+            "id": primary_id,
+            "name": name,
+            "ip": f"203.0.{primary_id // 256 % 256}.{primary_id % 256}",
+            "type": ip_type,
+            "assignee_id": self.server_id(server) if server else None,
+            "assignee_type": "server",
+            "auto_delete": False,
+            "dns_ptr": [],
+            "blocked": False,
+            "created": TIMESTAMP,
+            "labels": {},
+            "protection": {"delete": False},
+        }
+        self.primary_ips[primary_id] = primary_ip
+        return primary_ip
+
+    def add_network(self, name: str, ip_range: str = "10.0.0.0/16") -> dict:
+        """Add a network without routes and return its JSON object."""
+        network = {
+            "id": self.__new_id(),
+            "name": name,
+            "ip_range": ip_range,
+            "subnets": [],
+            "routes": [],
+            "servers": [],
+            "expose_routes_to_vswitch": False,
+            "protection": {"delete": False},
+            "created": TIMESTAMP,
+            "labels": {},
+            "_busy": 0.0,
+        }
+        self.networks[network["id"]] = network
+        return network
+
+    def attach_server(self, server: str, network: str, ip: str) -> None:
+        """Attach a server to a network by name with a private IP."""
+        network = next(item for item in self.networks.values() if item["name"] == network)
+        server_id = self.server_id(server)
+        self.servers[server_id].setdefault("private_net", []).append(
+            {"network": network["id"], "ip": ip, "alias_ips": [], "mac_address": "86:00:00:00:00:01"}
+        )
+        network["servers"].append(server_id)
+
+    def server_id(self, name: str) -> int:
+        """Get the ID of a server by name."""
+        return next(server["id"] for server in self.servers.values() if server["name"] == name)
+
+    def fail(self, method: str, endpoint: str, status: int = 423, code: str = "locked", times: int = 1) -> None:
+        """Answer the next requests to an endpoint with an error.
+
+        Parameters
+        ----------
+        method : str
+                 HTTP method, e.g. 'POST'.
+        endpoint : str
+                   Path with IDs replaced by '{id}', e.g. '/floating_ips/{id}/actions/assign'.
+        status : int, optional
+                 HTTP status code.
+        code : str, optional
+               Error code of the API, e.g. 'locked' or 'not_found'.
+        times : int, optional
+                Number of requests to fail.
+        """
+        self.errors.setdefault((method.upper(), endpoint), []).extend([(status, code)] * times)
+
+    def api_calls(self, method: str | None = None, endpoint: str | None = None) -> int:
+        """Count requests, optionally filtered by method and endpoint."""
+        return sum(
+            count
+            for (call_method, call_endpoint), count in self.calls.items()
+            if method in (None, call_method) and endpoint in (None, call_endpoint)
+        )
+
+    def _take_token(self) -> float | None:
+        """Take a rate limit token, return the remaining tokens or None if exhausted."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(
+                self.rate_limit, self.__tokens + (now - self.__refilled) * self.rate_limit / self.rate_period
+            )
+            self.__refilled = now
+            if self.__tokens < 1:
+                return None
+            self.__tokens -= 1
+            return self.__tokens
+
+    def __action(self, command: str, resources: list[dict]) -> dict:
+        """Create an action finishing after the action delay."""
+        action = {
+            "id": self.__new_id(),
+            "command": command,
+            "status": "running",
+            "progress": 0,
+            "started": TIMESTAMP,
+            "finished": None,
+            "resources": resources,
+            "error": None,
+            "_done": time.monotonic() + self.action_delay,
+        }
+        self.actions[action["id"]] = action
+        return action
+
+    def __action_json(self, action: dict) -> dict:
+        """Get the JSON object of an action in its current state."""
+        data = {key: value for key, value in action.items() if not key.startswith("_")}
+        if time.monotonic() >= action["_done"]:
+            data.update(status="success", progress=100, finished=TIMESTAMP)
+        return data
+
+    def __primary_ip_action(self, primary_ip: dict, command: str, body: dict) -> tuple[int, dict]:
+        """Assign or unassign a primary IP, an assigned IP must be unassigned first."""
+        if command == "assign":
+            if primary_ip["assignee_id"] is not None:
+                return 422, {"error": {"code": "already_assigned", "message": "still assigned", "details": None}}
+            if body.get("assignee_id") not in self.servers:
+                return 404, {"error": {"code": "not_found", "message": "server not found", "details": None}}
+            primary_ip["assignee_id"] = body["assignee_id"]
+        else:
+            primary_ip["assignee_id"] = None
+
+        action = self.__action(f"{command}_primary_ip", [{"id": primary_ip["id"], "type": "primary_ip"}])
+        return 201, {"action": self.__action_json(action)}
+
+    def __route_action(self, network: dict, command: str, route: dict) -> tuple[int, dict]:
+        """Change a route of a network, answering 423 while its last action is running."""
+        if time.monotonic() < network["_busy"]:
+            return 423, {"error": {"code": "locked", "message": "network is locked", "details": None}}
+
+        exists = route in network["routes"]
+        if exists == (command == "add_route"):
+            code = "uniqueness_error" if exists else "not_found"
+            return 422 if exists else 404, {"error": {"code": code, "message": "invalid route", "details": None}}
+
+        if command == "add_route":
+            network["routes"].append(route)
+        else:
+            network["routes"].remove(route)
+        network["_busy"] = time.monotonic() + self.action_delay
+        action = self.__action(command, [{"id": network["id"], "type": "network"}])
+        return 201, {"action": self.__action_json(action)}
+
+    @staticmethod
+    def __public(item: dict) -> dict:
+        """Get a JSON object without private keys."""
+        return {key: value for key, value in item.items() if not key.startswith("_")}
+
+    @staticmethod
+    def __page(key: str, items: list[dict], query: dict[str, list[str]]) -> dict:
+        """Get one page of a list response."""
+        if "name" in query:
+            items = [item for item in items if item["name"] == query["name"][0]]
+        # Only 'key=value' and 'key' terms of label selectors
+        for term in query.get("label_selector", [""])[0].split(","):
+            label, _, value = term.partition("=")
+            if label:
+                items = [item for item in items if label in item["labels"] and value in ("", item["labels"][label])]
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", ["25"])[0])
+        last_page = max(1, -(-len(items) // per_page))
+        return {
+            key: items[(page - 1) * per_page : page * per_page],
+            "meta": {
+                "pagination": {
+                    "page": page,
+                    "per_page": per_page,
+                    "previous_page": page - 1 if page > 1 else None,
+                    "next_page": page + 1 if page < last_page else None,
+                    "last_page": last_page,
+                    "total_entries": len(items),
+                }
+            },
+        }
+
+    def handle(self, method: str, path: str, query: dict[str, list[str]], body: dict) -> tuple[int, dict]:
+        """Answer one request.
+
+        Parameters
+        ----------
+        method : str
+                 HTTP method.
+        path : str
+               Request path.
+        query : dict[str, list[str]]
+                Parsed query string.
+        body : dict
+               Parsed JSON body.
+
+        Returns
+        -------
+        tuple[int, dict]: HTTP status code and JSON response.
+        """
+        endpoint = re.sub(r"/\d+(?=/|$)", "/{id}", path.rstrip("/"))
+        ids = [int(part) for part in path.split("/") if part.isdigit()]
+        self.calls[(method, endpoint)] += 1
+
+        errors = self.errors.get((method, endpoint))
+        if errors:
+            status, code = errors.pop(0)
+            return status, {"error": {"code": code, "message": f"injected {code}", "details": None}}
+
+        if (method, endpoint) == ("GET", "/servers"):
+            return 200, self.__page("servers", list(self.servers.values()), query)
+        if (method, endpoint) == ("GET", "/servers/{id}") and ids[0] in self.servers:
+            return 200, {"server": self.servers[ids[0]]}
+        if (method, endpoint) == ("GET", "/floating_ips"):
+            return 200, self.__page("floating_ips", list(self.floating_ips.values()), query)
+        if (method, endpoint) == ("GET", "/floating_ips/{id}") and ids[0] in self.floating_ips:
+            return 200, {"floating_ip": self.floating_ips[ids[0]]}
+        if (method, endpoint) == ("POST", "/floating_ips/{id}/actions/assign") and ids[0] in self.floating_ips:
+            if body.get("server") not in self.servers:
+                return 404, {"error": {"code": "not_found", "message": "server not found", "details": None}}
+            self.floating_ips[ids[0]]["server"] = body["server"]
+            resources = [{"id": ids[0], "type": "floating_ip"}, {"id": body["server"], "type": "server"}]
+            return 201, {"action": self.__action_json(self.__action("assign_floating_ip", resources))}
+        if (method, endpoint) == ("GET", "/primary_ips"):
+            return 200, self.__page("primary_ips", list(self.primary_ips.values()), query)
+        if (method, endpoint) == ("GET", "/primary_ips/{id}") and ids[0] in self.primary_ips:
+            return 200, {"primary_ip": self.primary_ips[ids[0]]}
+        if method == "POST" and endpoint in ("/primary_ips/{id}/actions/assign", "/primary_ips/{id}/actions/unassign"):
+            if ids[0] in self.primary_ips:
+                return self.__primary_ip_action(self.primary_ips[ids[0]], endpoint.rsplit("/", 1)[1], body)
+        if (method, endpoint) == ("GET", "/networks"):
+            return 200, self.__page("networks", [self.__public(item) for item in self.networks.values()], query)
+        if (method, endpoint) == ("GET", "/networks/{id}") and ids[0] in self.networks:
+            return 200, {"network": self.__public(self.networks[ids[0]])}
+        if method == "POST" and endpoint in (
+            "/networks/{id}/actions/add_route",
+            "/networks/{id}/actions/delete_route",
+        ):
+            if ids[0] in self.networks:
+                route = {"destination": body.get("destination"), "gateway": body.get("gateway")}
+                return self.__route_action(self.networks[ids[0]], endpoint.rsplit("/", 1)[1], route)
+        if (method, endpoint) == ("GET", "/actions"):
+            actions = [self.actions[int(i)] for i in query.get("id", []) if int(i) in self.actions]
+            return 200, self.__page("actions", [self.__action_json(action) for action in actions], {})
+        if (method, endpoint) == ("GET", "/actions/{id}") and ids[0] in self.actions:
+            return 200, {"action": self.__action_json(self.actions[ids[0]])}
+
+        return 404, {"error": {"code": "not_found", "message": f"{method} {path} not found", "details": None}}
+
+    def start(self) -> "HcloudStandIn":
+        """Serve the API on a free local port in a background thread."""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Pass requests to the stand-in."""
+
+            protocol_version = "HTTP/1.1"
+
+            def __answer(self) -> None:
+                """Answer a request with JSON and rate limit headers."""
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+                time.sleep(standin.latency)
+                remaining = standin._take_token()
+                if remaining is None:
+                    status = 429
+                    data = {"error": {"code": "rate_limit_exceeded", "message": "limit reached", "details": None}}
+                else:
+                    status, data = standin.handle(self.command, url.path, parse_qs(url.query), body)
+
+                payload = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("RateLimit-Limit", str(standin.rate_limit))
+                self.send_header("RateLimit-Remaining", str(int(remaining or 0)))
+                # Unix time the bucket is full again
+                refill = (standin.rate_limit - (remaining or 0)) * standin.rate_period / standin.rate_limit
+                self.send_header("RateLimit-Reset", str(ceil(time.time() + refill)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = __answer
+
+            def log_message(self, format: str, *args) -> None:
+                """Do not log every request."""
+
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.__server.daemon_threads = True
+        threading.Thread(target=self.__server.serve_forever, name="standin", daemon=True).start()
+
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self.__server:
+            self.__server.shutdown()
+            self.__server.server_close()
+
+    def __enter__(self) -> "HcloudStandIn":
+        """Start serving."""
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop serving."""
+        self.stop()
@@ -0,0 +1,67 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Floating IP reassignments against the API stand-in.
+
+This module checks how reassignments react to slow actions and injected errors.
+"""
+
+import pytest
+
+from hcloud_reassign.core.base import HcloudAPIException, make_client
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+from hcloud_reassign.utils import constants
+
+from .standin import HcloudStandIn
+
+
+class TestFloatingIPStandIn:
+    """Test group for hcloud_reassign.reassign.ip_floating against the stand-in."""
+
+    section = {
+        "type": "ip_floating",
+        "resource": "flip",
+        "source": "srv-a",
+        "destination": "srv-b",
+        "metrics": False,
+    }
+
+    @staticmethod
+    def make_section(api: HcloudStandIn) -> HCloudFloatingIPSection:
+        """Create a project with two servers and a floating IP and a section pointing at it."""
+        api.add_server("srv-a")
+        api.add_server("srv-b")
+        api.add_floating_ip("flip", server="srv-a")
+        client = {"api_token": "1", "api_url": api.url}
+        return HCloudFloatingIPSection(
+            TestFloatingIPStandIn.section, client, hclient=make_client(token="1", url=api.url)
+        )
+
+    def test_slow_action(self) -> None:
+        """Check that a running action is polled until it finishes."""
+        with HcloudStandIn(action_delay=0.3) as api:
+            section = self.make_section(api)
+
+            assert section.reassign(direction="dest") == constants.STATUS_SUCCESS
+            assert api.api_calls("GET", "/actions") >= 2
+
+    def test_stale_resource(self) -> None:
+        """Check that a not_found answer to assign looks the resources up again once."""
+        with HcloudStandIn() as api:
+            section = self.make_section(api)
+            api.fail("POST", "/floating_ips/{id}/actions/assign", status=404, code="not_found")
+
+            assert section.reassign(direction="dest") == constants.STATUS_SUCCESS
+            assert api.api_calls("POST") == 2
+            assert api.api_calls("GET", "/floating_ips") == 2
+
+    def test_locked(self) -> None:
+        """Check that other errors are raised to the caller."""
+        with HcloudStandIn() as api:
+            section = self.make_section(api)
+            api.fail("POST", "/floating_ips/{id}/actions/assign", status=423, code="locked")
+
+            with pytest.raises(HcloudAPIException) as err:
+                section.reassign(direction="dest")
+
+            assert err.value.code == "locked"
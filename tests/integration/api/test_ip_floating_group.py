@@ -0,0 +1,116 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Floating IP group reassignments against the API stand-in.
+
+This module checks that a group of any size is listed with one call and moved together.
+"""
+
+from hcloud_reassign.core import deadline
+from hcloud_reassign.core.base import make_client
+from hcloud_reassign.reassign.ip_floating_group import HCloudFloatingIPGroupSection
+from hcloud_reassign.utils import constants
+
+from .standin import HcloudStandIn
+
+
+class TestFloatingIPGroupStandIn:
+    """Test group for hcloud_reassign.reassign.ip_floating_group against the stand-in."""
+
+    def test_fleet(self) -> None:
+        """Check that all selected floating IPs move with a constant number of lookups."""
+        with HcloudStandIn() as api:
+            api.add_server("srv-a")
+            api.add_server("srv-b")
+            for i in range(12):
+                api.add_floating_ip(f"web-{i}", server="srv-a", labels={"role": "web", "env": "prod"})
+            api.add_floating_ip("web-staging", server="srv-a", labels={"role": "web", "env": "staging"})
+            api.add_floating_ip("db", server="srv-a", labels={"role": "db"})
+            section = HCloudFloatingIPGroupSection(
+                {
+                    "type": "ip_floating_group",
+                    "selector": "role=web,env=prod",
+                    "source": "srv-a",
+                    "destination": "srv-b",
+                },
+                {"api_token": "1", "api_url": api.url},
+                hclient=make_client(token="1", url=api.url),
+            )
+
+            item = section.plan(direction="dest")
+            assert item.action_calls == 12
+            assert section.reassign(direction="dest") == constants.STATUS_SUCCESS
+
+            servers = {flip["name"]: flip["server"] for flip in api.floating_ips.values()}
+            assert {servers[f"web-{i}"] for i in range(12)} == {api.server_id("srv-b")}
+            assert servers["web-staging"] == servers["db"] == api.server_id("srv-a")
+            # Planning and reassigning share one list of the group
+            assert api.api_calls("GET", "/floating_ips") == 1
+            assert api.api_calls("GET", "/servers") == 1
+            assert api.api_calls("POST", "/floating_ips/{id}/actions/assign") == 12
+            assert len(section.action_ids) == 12
+
+            assert not section.plan(direction="dest").changed
+            assert api.api_calls("GET", "/floating_ips") == 2
+
+    def test_rejected_assign(self) -> None:
+        """Check that a rejected assign is an error while the other floating IPs still move."""
+        with HcloudStandIn() as api:
+            api.add_server("srv-a")
+            api.add_server("srv-b")
+            for i in range(3):
+                api.add_floating_ip(f"web-{i}", server="srv-a", labels={"role": "web"})
+            api.fail("POST", "/floating_ips/{id}/actions/assign", status=422, code="invalid_input")
+            section = HCloudFloatingIPGroupSection(
+                {"type": "ip_floating_group", "selector": "role=web", "source": "srv-a", "destination": "srv-b"},
+                {"api_token": "1", "api_url": api.url},
+                hclient=make_client(token="1", url=api.url),
+            )
+
+            assert section.reassign(direction="dest") == constants.STATUS_ERROR
+
+            servers = [flip["server"] for flip in api.floating_ips.values()]
+            assert servers.count(api.server_id("srv-b")) == 2
+            assert len(section.action_ids) == 2
+
+    def test_deadline_in_one_assign(self, monkeypatch) -> None:
+        """Check that a floating IP hitting the deadline times out while the assigned ones are waited for."""
+        with HcloudStandIn() as api:
+            api.add_server("srv-a")
+            api.add_server("srv-b")
+            for i in range(3):
+                api.add_floating_ip(f"web-{i}", server="srv-a", labels={"role": "web"})
+            section = HCloudFloatingIPGroupSection(
+                {"type": "ip_floating_group", "selector": "role=web", "source": "srv-a", "destination": "srv-b"},
+                {"api_token": "1", "api_url": api.url},
+                hclient=make_client(token="1", url=api.url),
+            )
+            assign = section.hclient.floating_ips.assign
+            phases = []
+
+            def bound_assign(floating_ip, server):
+                phases.append(deadline.current().seconds)
+                if floating_ip.name == "web-1":
+                    raise deadline.DeadlineExceeded("deadline passed")
+                return assign(floating_ip=floating_ip, server=server)
+
+            monkeypatch.setattr(section.hclient.floating_ips, "assign", bound_assign)
+
+            assert section.reassign_within(direction="dest", seconds=10) == constants.STATUS_TIMEOUT
+
+            # Pool threads get the share of the assign phase, not the whole deadline
+            assert phases == [10 * constants.DEADLINE_SHARES["assign"]] * 3
+            assert len(section.action_ids) == 2
+            assert [flip["server"] for flip in api.floating_ips.values()].count(api.server_id("srv-b")) == 2
+
+    def test_empty_selector(self) -> None:
+        """Check that a selector matching nothing is an error."""
+        with HcloudStandIn() as api:
+            api.add_server("srv-a")
+            section = HCloudFloatingIPGroupSection(
+                {"type": "ip_floating_group", "selector": "role=none", "source": "srv-a", "destination": "srv-a"},
+                {"api_token": "1", "api_url": api.url},
+                hclient=make_client(token="1", url=api.url),
+            )
+
+            assert section.reassign(direction="src") == constants.STATUS_ERROR
@@ -0,0 +1,45 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Primary IP reassignments against the API stand-in.
+
+This module checks that the actions of several primary IPs are waited for together.
+"""
+
+from time import perf_counter
+
+from hcloud_reassign.core import actions
+from hcloud_reassign.core.base import make_client
+from hcloud_reassign.reassign.ip_public import HCloudPrimaryIPSection
+from hcloud_reassign.utils import constants
+
+from .standin import HcloudStandIn
+
+
+class TestPrimaryIPStandIn:
+    """Test group for hcloud_reassign.reassign.ip_public against the stand-in."""
+
+    def test_pipelined(self, monkeypatch) -> None:
+        """Check that moving two primary IPs takes two action waits, not four."""
+        # Poll at a fixed interval, jittered backoff would blur the waits
+        monkeypatch.setattr(actions, "backoff", lambda attempt, base, cap: 0.05)
+        with HcloudStandIn(action_delay=0.3) as api:
+            api.add_server("srv-a", status="off")
+            api.add_server("srv-b", status="off")
+            api.add_primary_ip("ip-4", server="srv-a")
+            api.add_primary_ip("ip-6", server="srv-a", ip_type="ipv6")
+            section = HCloudPrimaryIPSection(
+                {"type": "ip_public", "resource": "ip-4,ip-6", "source": "srv-a", "destination": "srv-b"},
+                {"api_token": "1", "api_url": api.url},
+                hclient=make_client(token="1", url=api.url),
+            )
+
+            begin = perf_counter()
+            assert section.reassign(direction="dest") == constants.STATUS_SUCCESS
+            seconds = perf_counter() - begin
+
+            assert seconds < 4 * 0.3
+            assert api.api_calls("POST", "/primary_ips/{id}/actions/unassign") == 2
+            assert api.api_calls("POST", "/primary_ips/{id}/actions/assign") == 2
+            assert {ip["assignee_id"] for ip in api.primary_ips.values()} == {api.server_id("srv-b")}
+            assert set(section.timings) == {"ip-4", "ip-6"}
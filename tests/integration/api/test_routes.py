@@ -0,0 +1,90 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Route reassignments against the API stand-in.
+
+This module checks route diffs, locked networks and restoring routes after failures.
+"""
+
+import pytest
+
+from hcloud_reassign.core.base import HcloudAPIException, make_client
+from hcloud_reassign.reassign.routes import HCloudRoutesSection
+from hcloud_reassign.utils import constants
+
+from .standin import HcloudStandIn
+
+
+class TestRoutesStandIn:
+    """Test group for hcloud_reassign.reassign.routes against the stand-in."""
+
+    section = {
+        "type": "routes",
+        "resource": "net",
+        "source": "srv-a",
+        "destination": "srv-b",
+        "routes": "10.100.0.0/24, 10.101.0.0/24, 10.102.0.0/24",
+    }
+
+    @staticmethod
+    def make_section(api: HcloudStandIn) -> HCloudRoutesSection:
+        """Create a network with two attached servers and a section pointing at it."""
+        api.add_server("srv-a")
+        api.add_server("srv-b")
+        network = api.add_network("net")
+        api.attach_server("srv-a", "net", "10.0.0.2")
+        api.attach_server("srv-b", "net", "10.0.0.3")
+        network["routes"] = [
+            {"destination": "10.100.0.0/24", "gateway": "10.0.0.2"},
+            {"destination": "10.101.0.0/24", "gateway": "10.0.0.3"},
+        ]
+        client = {"api_token": "1", "api_url": api.url}
+        return HCloudRoutesSection(TestRoutesStandIn.section, client, hclient=make_client(token="1", url=api.url))
+
+    def test_minimal_diff(self) -> None:
+        """Check that only routes on another gateway are changed."""
+        with HcloudStandIn() as api:
+            section = self.make_section(api)
+
+            assert section.reassign(direction="dest") == constants.STATUS_SUCCESS
+            assert api.api_calls("POST", "/networks/{id}/actions/delete_route") == 1
+            assert api.api_calls("POST", "/networks/{id}/actions/add_route") == 2
+            assert sorted(route["gateway"] for route in next(iter(api.networks.values()))["routes"]) == ["10.0.0.3"] * 3
+
+    def test_locked_network(self) -> None:
+        """Check that changes submitted while the network is locked are retried."""
+        with HcloudStandIn(action_delay=0.1) as api:
+            section = self.make_section(api)
+
+            assert section.reassign(direction="dest") == constants.STATUS_SUCCESS
+            assert api.api_calls("POST", "/networks/{id}/actions/add_route") > 2
+            assert len(next(iter(api.networks.values()))["routes"]) == 3
+
+    @staticmethod
+    def routed(api: HcloudStandIn) -> dict[str, str]:
+        """Get the gateway by destination of the network."""
+        return {route["destination"]: route["gateway"] for route in next(iter(api.networks.values()))["routes"]}
+
+    def test_slow_actions(self) -> None:
+        """Check that changes wait for multi-second actions locking the network instead of giving up."""
+        with HcloudStandIn(action_delay=2.0) as api:
+            section = self.make_section(api)
+
+            assert section.reassign(direction="dest") == constants.STATUS_SUCCESS
+            assert self.routed(api) == {
+                "10.100.0.0/24": "10.0.0.3",
+                "10.101.0.0/24": "10.0.0.3",
+                "10.102.0.0/24": "10.0.0.3",
+            }
+
+    def test_restore_after_failure(self) -> None:
+        """Check that a failing add leaves no destination without a route."""
+        with HcloudStandIn(action_delay=0.2) as api:
+            section = self.make_section(api)
+            api.fail("POST", "/networks/{id}/actions/add_route", status=422, code="invalid_input")
+
+            with pytest.raises(HcloudAPIException):
+                section.reassign(direction="dest")
+
+            # The deleted route is back on its old gateway
+            assert self.routed(api) == {"10.100.0.0/24": "10.0.0.2", "10.101.0.0/24": "10.0.0.3"}
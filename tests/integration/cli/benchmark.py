@@ -0,0 +1,163 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module measures hcloud-reassign end-to-end against the API stand-in.
+
+Run it directly to print a table of wall-clock times and API calls:
+
+    python -m tests.integration.cli.benchmark --latency 0.02 --action-delay 0.5
+"""
+
+import sys
+import tempfile
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+
+from hcloud_reassign.cli import main_cli
+
+from ..api.standin import HcloudStandIn
+
+# Numbers of resources measured by default
+BENCHMARK_SIZES = (1, 10, 100)
+
+
+@dataclass
+class BenchmarkResult:
+    """This class holds the measurements of one hcloud-reassign run."""
+
+    resources: int
+    run: str
+    status: int
+    seconds: float
+    calls: dict[tuple[str, str], int] = field(default_factory=dict)
+
+    @property
+    def api_calls(self) -> int:
+        """Get the number of all requests."""
+        return sum(self.calls.values())
+
+    def count(self, method: str, endpoint: str) -> int:
+        """Get the number of requests to one endpoint."""
+        return self.calls.get((method, endpoint), 0)
+
+    def describe(self) -> str:
+        """Describe this run in one table row."""
+        return (
+            f"{self.resources:>9} {self.run:>5} {self.status:>6} {self.seconds * 1000:>10.1f} "
+            f"{self.api_calls:>9} {self.count('GET', '/servers') + self.count('GET', '/floating_ips'):>7} "
+            f"{self.count('POST', '/floating_ips/{id}/actions/assign'):>7} {self.count('GET', '/actions'):>6}"
+        )
+
+
+# Header of the rows of BenchmarkResult.describe
+BENCHMARK_HEADER = f"{'resources':>9} {'run':>5} {'status':>6} {'ms':>10} {'api_calls':>9} {'lookups':>7} " + (
+    f"{'assigns':>7} {'polls':>6}"
+)
+
+
+def write_config(path: Path, api: HcloudStandIn, count: int) -> Path:
+    """Write a configuration with `count` floating IPs moving from srv-a to srv-b.
+
+    Parameters
+    ----------
+    path : Path
+           Directory for the configuration, the cache and the rate limit state.
+    api : HcloudStandIn
+          Running stand-in to point the client at.
+    count : int
+            Number of floating IP sections.
+
+    Returns
+    -------
+    Path: Path of the configuration file.
+    """
+    lines = ["[client]", f"api_url={api.url}", "api_token=benchmark", f"cache_path={path}"]
+    for i in range(count):
+        lines += [
+            f"[floating.{i}]",
+            "type=ip_floating",
+            f"resource=flip-{i}",
+            "source=srv-a",
+            "destination=srv-b",
+            "metrics=false",
+        ]
+
+    config = path / "benchmark.ini"
+    config.write_text("\n".join(lines))
+
+    return config
+
+
+def run_benchmark(api: HcloudStandIn, path: Path, count: int, runs: tuple[str, ...] = ("cold", "warm")) -> list:
+    """Reassign `count` floating IPs with hcloud-reassign and measure every run.
+
+    The first run starts with an empty cache, later runs reuse it.
+
+    Parameters
+    ----------
+    api : HcloudStandIn
+          Running stand-in without resources.
+    path : Path
+           Empty directory for configuration and cache.
+    count : int
+            Number of floating IPs.
+    runs : tuple[str, ...], optional
+           Names of the runs.
+
+    Returns
+    -------
+    list[BenchmarkResult]
+    """
+    api.add_server("srv-a")
+    api.add_server("srv-b")
+    for i in range(count):
+        api.add_floating_ip(f"flip-{i}", server="srv-a")
+    config = write_config(path, api, count)
+
+    results = []
+    argv = sys.argv
+    for run in runs:
+        api.calls.clear()
+        sys.argv = ["hcloud-reassign", "--config", str(config), "--direction", "dest"]
+        try:
+            begin = perf_counter()
+            status = main_cli.main()
+            seconds = perf_counter() - begin
+        finally:
+            sys.argv = argv
+        results.append(BenchmarkResult(resources=count, run=run, status=status, seconds=seconds, calls=dict(api.calls)))
+
+    return results
+
+
+def main():
+    """Print a benchmark table."""
+    parser = ArgumentParser(description="Benchmark hcloud-reassign against a local API stand-in.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(BENCHMARK_SIZES), help="Numbers of resources.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request.")
+    parser.add_argument("--action-delay", type=float, default=0.0, help="Seconds until actions finish.")
+    parser.add_argument("--rate-limit", type=int, default=3600, help="Requests allowed per --rate-period.")
+    parser.add_argument("--rate-period", type=float, default=3600.0, help="Seconds of the rate limit period.")
+    args = parser.parse_args()
+
+    print(BENCHMARK_HEADER)
+    for count in args.sizes:
+        with tempfile.TemporaryDirectory() as path, HcloudStandIn(
+            latency=args.latency,
+            action_delay=args.action_delay,
+            rate_limit=args.rate_limit,
+            rate_period=args.rate_period,
+        ) as api:
+            # Keep the status lines of hcloud-reassign out of the table
+            with redirect_stdout(StringIO()):
+                results = run_benchmark(api, Path(path), count)
+            for result in results:
+                print(result.describe())
+
+
+if __name__ == "__main__":
+    main()
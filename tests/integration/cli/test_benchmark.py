@@ -0,0 +1,43 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign end-to-end benchmark.
+
+This module runs hcloud-reassign against the API stand-in and checks wall-clock
+times and API call counts for 1, 10 and 100 resources.
+"""
+
+from math import ceil
+
+import pytest
+
+from ..api.standin import HcloudStandIn
+from .benchmark import BENCHMARK_SIZES, run_benchmark
+
+
+class TestBenchmark:
+    """Test group for end-to-end reassignments."""
+
+    @pytest.mark.parametrize("count", BENCHMARK_SIZES)
+    def test_reassign(self, count: int, tmp_path, record_property) -> None:
+        """Check that all floating IPs move, lookups are listed once and a warm run assigns nothing."""
+        with HcloudStandIn(latency=0.002, action_delay=0.01) as api:
+            cold, warm = run_benchmark(api, tmp_path, count)
+
+            assert {flip["server"] for flip in api.floating_ips.values()} == {api.server_id("srv-b")}
+
+        for result in (cold, warm):
+            record_property(f"{result.run}_ms", round(result.seconds * 1000, 1))
+            record_property(f"{result.run}_api_calls", result.api_calls)
+            assert result.status == 0
+
+        # All floating IPs move once, the warm run finds them on srv-b already
+        assert cold.count("POST", "/floating_ips/{id}/actions/assign") == count
+        assert warm.count("POST", "/floating_ips/{id}/actions/assign") == 0
+
+        # A single resource is looked up by name, more are listed page by page
+        assert cold.count("GET", "/servers") <= 2
+        assert cold.count("GET", "/floating_ips") <= max(1, ceil(count / 50))
+        # Servers come from the cache, floating IPs are fetched for their current server
+        assert warm.count("GET", "/servers") == 0
+        assert warm.count("GET", "/floating_ips") <= max(1, ceil(count / 50))
@@ -0,0 +1,46 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign deadlines end-to-end.
+
+This module runs 'hcloud-reassign --deadline' against an API stand-in whose rate limit is used up.
+"""
+
+import json
+import sys
+from time import perf_counter
+
+from hcloud_reassign.cli import main_cli
+from hcloud_reassign.utils import constants
+
+from ..api.standin import HcloudStandIn
+
+
+class TestDeadline:
+    """Test group for deadlines bounding rate limit waits and retries."""
+
+    def test_rate_limited(self, monkeypatch, tmp_path, capsys) -> None:
+        """Check that an empty rate limit bucket times out at the deadline instead of waiting for a refill."""
+        with HcloudStandIn(rate_limit=1, rate_period=3600) as api:
+            api.add_server("srv-a")
+            api.add_server("srv-b")
+            api.add_floating_ip("flip-0", server="srv-a")
+            # Another client used the only request of the next hour
+            api._take_token()
+            config = tmp_path / "deadline.ini"
+            config.write_text(
+                f"[client]\napi_url={api.url}\napi_token=deadline\ncache_path={tmp_path}\n"
+                "[floating.0]\ntype=ip_floating\nresource=flip-0\nsource=srv-a\ndestination=srv-b\nmetrics=false\n"
+            )
+            monkeypatch.setattr(
+                sys, "argv", ["hcloud-reassign", "--config", str(config), "--format", "ndjson", "--deadline", "1"]
+            )
+
+            begin = perf_counter()
+            assert main_cli.main() == constants.STATUS_TIMEOUT
+            seconds = perf_counter() - begin
+
+        record = json.loads(capsys.readouterr().out.splitlines()[0])
+        assert record["status"] == "timeout"
+        assert seconds < 2
+        assert api.api_calls("POST", "/floating_ips/{id}/actions/assign") == 0
@@ -0,0 +1,44 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign drain and rebalance end-to-end.
+
+This module runs 'hcloud-reassign --drain' and '--rebalance' against the API stand-in.
+"""
+
+import sys
+from collections import Counter
+
+from hcloud_reassign.cli import main_cli
+
+from ..api.standin import HcloudStandIn
+
+
+def run(monkeypatch, *args: str) -> int:
+    """Run hcloud-reassign with arguments."""
+    monkeypatch.setattr(sys, "argv", ["hcloud-reassign", *args])
+    return main_cli.main()
+
+
+class TestDrain:
+    """Test group for moving floating IPs without sections."""
+
+    def test_drain_and_rebalance(self, monkeypatch, tmp_path) -> None:
+        """Check that a drain empties a server in one list query and a rebalance evens counts out."""
+        with HcloudStandIn() as api:
+            for name in ("srv-a", "srv-b", "srv-c"):
+                api.add_server(name)
+            for i in range(6):
+                api.add_floating_ip(f"flip-{i}", server="srv-a")
+            config = tmp_path / "drain.ini"
+            config.write_text(f"[client]\napi_url={api.url}\napi_token=drain\ncache_path={tmp_path}\n")
+
+            peers = ["--peers", "srv-a", "srv-b", "srv-c"]
+            assert run(monkeypatch, "--config", str(config), "--drain", "srv-a", *peers) == 0
+            counts = Counter(flip["server"] for flip in api.floating_ips.values())
+            assert counts == {api.server_id("srv-b"): 3, api.server_id("srv-c"): 3}
+            assert api.api_calls("GET", "/floating_ips") == 1
+
+            assert run(monkeypatch, "--config", str(config), "--rebalance", *peers) == 0
+            counts = Counter(flip["server"] for flip in api.floating_ips.values())
+            assert sorted(counts.values()) == [2, 2, 2]
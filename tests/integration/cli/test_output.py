@@ -0,0 +1,110 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign machine-readable output end-to-end.
+
+This module runs 'hcloud-reassign --format ndjson' and '--format json' against the API stand-in.
+"""
+
+import json
+import sys
+
+import requests
+from hcloud_reassign.cli import main_cli
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+
+from ..api.standin import HcloudStandIn
+
+
+def run(monkeypatch, *args: str) -> int:
+    """Run hcloud-reassign with arguments."""
+    monkeypatch.setattr(sys, "argv", ["hcloud-reassign", *args])
+    return main_cli.main()
+
+
+class TestOutput:
+    """Test group for streamed results."""
+
+    def test_ndjson(self, monkeypatch, tmp_path, capsys) -> None:
+        """Check that every resource gets a record with action, target and phases, then a summary."""
+        with HcloudStandIn() as api:
+            api.add_server("srv-a")
+            api.add_server("srv-b")
+            api.add_floating_ip("flip-0", server="srv-a")
+            api.add_floating_ip("flip-1", server="srv-b")
+            config = tmp_path / "output.ini"
+            config.write_text(
+                f"[client]\napi_url={api.url}\napi_token=output\ncache_path={tmp_path}\n"
+                + "".join(
+                    f"[floating.{i}]\ntype=ip_floating\nresource=flip-{i}\nsource=srv-a\ndestination=srv-b\n"
+                    "metrics=false\n"
+                    for i in range(2)
+                )
+                + "[floating.missing]\ntype=ip_floating\nresource=flip-9\nsource=srv-a\ndestination=srv-b\n"
+                "metrics=false\n"
+            )
+
+            assert run(monkeypatch, "--config", str(config), "--format", "ndjson") == 2
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        records = {record["section"]: record for record in lines[:-1]}
+
+        assert len(records["floating.0"]["action_ids"]) == 1
+        assert records["floating.0"]["target"] == "srv-b"
+        assert set(records["floating.0"]["phases"]) == {"resolve", "assign", "action_wait"}
+        assert records["floating.1"]["unchanged"] is True
+        assert records["floating.missing"]["status"] == "error"
+        assert lines[-1]["summary"] == {
+            "status": "error",
+            "code": 2,
+            "resources": 3,
+            "statuses": {"success": 2, "error": 1},
+        }
+
+    def test_json(self, monkeypatch, tmp_path, capsys) -> None:
+        """Check that one document holds all results and messages stay out of it."""
+        with HcloudStandIn() as api:
+            api.add_server("srv-a")
+            config = tmp_path / "output.ini"
+            config.write_text(
+                f"[client]\napi_url={api.url}\napi_token=output\ncache_path={tmp_path}\n"
+                "[floating.0]\ntype=ip_floating\nresource=flip-0\nsource=srv-a\ndestination=srv-b\nmetrics=false\n"
+            )
+
+            assert run(monkeypatch, "--config", str(config), "--format", "json") == 2
+
+        captured = capsys.readouterr()
+        document = json.loads(captured.out)
+
+        assert document["results"][0]["section"] == "floating.0"
+        assert document["summary"]["code"] == 2
+        assert "not found" in captured.err
+
+    def test_json_connection_error(self, monkeypatch, tmp_path, capsys) -> None:
+        """Check that a resource failing with a connection error still gets a record in a complete document."""
+        reassign = HCloudFloatingIPSection.reassign
+
+        def failing_reassign(self, direction: str) -> int:
+            if self.resource == "flip-1":
+                raise requests.ConnectionError("connection reset")
+            return reassign(self, direction)
+
+        monkeypatch.setattr(HCloudFloatingIPSection, "reassign", failing_reassign)
+        with HcloudStandIn() as api:
+            api.add_server("srv-a")
+            api.add_server("srv-b")
+            config = tmp_path / "output.ini"
+            sections = ""
+            for i in range(3):
+                api.add_floating_ip(f"flip-{i}", server="srv-a")
+                sections += f"[floating.{i}]\ntype=ip_floating\nresource=flip-{i}\nsource=srv-a\ndestination=srv-b\n"
+                sections += "metrics=false\n"
+            config.write_text(f"[client]\napi_url={api.url}\napi_token=output\ncache_path={tmp_path}\n" + sections)
+
+            assert run(monkeypatch, "--config", str(config), "--format", "json") == 2
+
+        document = json.loads(capsys.readouterr().out)
+        statuses = {record["section"]: record["status"] for record in document["results"]}
+
+        assert statuses == {"floating.0": "success", "floating.1": "error", "floating.2": "success"}
+        assert document["summary"]["resources"] == 3
@@ -7,3 +7,38 @@
 
 This module contains unit tests for the hcloud-reassign command line tool.
 """
+
+import subprocess
+import sys
+from time import perf_counter
+
+
+class TestMainCli:
+    """Test group for hcloud_reassign.cli.main_cli."""
+
+    def test_import_is_light(self) -> None:
+        """Check that importing the command line module does not load the hcloud SDK."""
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, hcloud_reassign.cli.main_cli; print('hcloud' in sys.modules)"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_startup_time(self, record_property) -> None:
+        """Measure the cold start of 'hcloud-reassign --version'.
+
+        The median is recorded as 'startup_ms' in the JUnit report, so it can be tracked over time.
+        """
+        durations = []
+        for _ in range(5):
+            start = perf_counter()
+            subprocess.run(
+                [sys.executable, "-m", "hcloud_reassign.cli.main_cli", "--version"], capture_output=True, check=True
+            )
+            durations.append((perf_counter() - start) * 1000)
+
+        median = sorted(durations)[len(durations) // 2]
+        record_property("startup_ms", round(median, 1))
+        print(f"startup: {median:.1f} ms")
@@ -7,3 +7,87 @@
 
 This module contains unit tests for the hcloud-metrics command line tool.
 """
+
+import json
+import sys
+from io import BytesIO
+
+from hcloud_reassign.cli import metrics_cli
+from hcloud_reassign.core.base import HcloudReassignIni
+from hcloud_reassign.monitor.collector import MetricsCollector, MetricsResult
+from hcloud_reassign.monitor.export import read_columnar
+
+
+class TestMetricsCli:
+    """Test group for hcloud_reassign.cli.metrics_cli."""
+
+    @staticmethod
+    def mock_config(write_config) -> str:
+        """Write a configuration file with one metrics enabled section and two disabled ones."""
+        sections = {
+            "floating.a": {"resource": "flip-a", "metrics": "true"},
+            "floating.b": {"resource": "flip-b", "source": "srv-b", "destination": "srv-c"},
+            "routes.a": {
+                "type": "routes",
+                "resource": "net-a",
+                "destination": " srv-d, 10.0.0.3",
+                "routes": "10.1.0.0/24",
+            },
+        }
+        return write_config(sections=sections, rate_limit="false")
+
+    @staticmethod
+    def mock_collect(servers, metrics_type, interval="now", step=10, resolved=None):
+        """Return two cpu samples per server and an error for unknown servers."""
+        for server in servers:
+            if server == "missing":
+                yield MetricsResult(server=server, error=LookupError("missing"))
+            else:
+                yield MetricsResult(server=server, time_series={"cpu": {"values": [[1, "0.5"], [2, "0.75"]]}})
+
+    def test_section_servers(self, write_config) -> None:
+        """Test that servers are taken from metrics enabled sections unless sections are named, without gateway IPs."""
+        config = HcloudReassignIni(path=self.mock_config(write_config))
+
+        assert metrics_cli.section_servers(config) == ["srv-a", "srv-b"]
+        assert metrics_cli.section_servers(config, ["floating.a", "floating.b"]) == ["srv-a", "srv-b", "srv-c"]
+        assert metrics_cli.section_servers(config, ["routes.a"]) == ["srv-a", "srv-d"]
+
+    def test_ndjson(self, write_config, monkeypatch, capsys) -> None:
+        """Test that samples are streamed as NDJSON and errors set the return code."""
+        monkeypatch.setattr(MetricsCollector, "collect", lambda _, *args, **kwargs: self.mock_collect(*args, **kwargs))
+        monkeypatch.setattr(
+            sys, "argv", ["hcloud-metrics", "-c", self.mock_config(write_config), "-s", "srv-a", "missing"]
+        )
+
+        assert metrics_cli.main() == 2
+
+        out, err = capsys.readouterr()
+        lines = [json.loads(line) for line in out.splitlines()]
+        assert lines[0] == {"server": "srv-a", "series": "cpu", "timestamp": 1.0, "value": 0.5}
+        assert len(lines) == 2
+        assert "missing" in err
+
+    def test_csv_and_columnar(self, tmp_path, write_config, monkeypatch) -> None:
+        """Test that CSV and columnar files hold all samples."""
+        monkeypatch.setattr(MetricsCollector, "collect", lambda _, *args, **kwargs: self.mock_collect(*args, **kwargs))
+        config = self.mock_config(write_config)
+
+        csv_path = tmp_path / "out.csv"
+        monkeypatch.setattr(sys, "argv", ["hcloud-metrics", "-c", config, "-f", "csv", "-o", str(csv_path)])
+        assert metrics_cli.main() == 0
+        assert csv_path.read_text().splitlines() == [
+            "server,series,timestamp,value",
+            "srv-a,cpu,1.0,0.5",
+            "srv-a,cpu,2.0,0.75",
+            "srv-b,cpu,1.0,0.5",
+            "srv-b,cpu,2.0,0.75",
+        ]
+
+        bin_path = tmp_path / "out.bin"
+        monkeypatch.setattr(sys, "argv", ["hcloud-metrics", "-c", config, "-f", "columnar", "-o", str(bin_path)])
+        assert metrics_cli.main() == 0
+        frames = list(read_columnar(BytesIO(bin_path.read_bytes())))
+        assert [header["server"] for header, _, _ in frames] == ["srv-a", "srv-b"]
+        assert list(frames[0][1]) == [1.0, 2.0]
+        assert list(frames[0][2]) == [0.5, 0.75]
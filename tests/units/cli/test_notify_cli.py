@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign notify client unit tests.
+
+This module contains unit tests for the hcloud-reassign-notify command line tool.
+"""
+
+import sys
+
+import pytest
+
+from hcloud_reassign.cli import notify_cli
+
+
+class TestNotifyCli:
+    """Test group for hcloud_reassign.cli.notify_cli."""
+
+    def test_missing_daemon(self, tmp_path, monkeypatch) -> None:
+        """Test that an unreachable daemon results in an error code."""
+        monkeypatch.setattr(sys, "argv", ["hcloud-reassign-notify", "-s", str(tmp_path / "none.sock"), "a", "dest"])
+        assert notify_cli.main() == 2
+
+    def test_relay_needs_node(self, monkeypatch) -> None:
+        """Test that relay requests need a node name and a secret."""
+        monkeypatch.setattr(sys, "argv", ["hcloud-reassign-notify", "--relay", "http://127.0.0.1:1", "a", "dest"])
+        with pytest.raises(SystemExit):
+            notify_cli.main()
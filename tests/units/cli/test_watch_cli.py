@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign Script unit tests.
+
+This module contains unit tests for the hcloud-reassign-watch command line tool.
+"""
+
+import sys
+
+import pytest
+
+from hcloud_reassign.cli import watch_cli
+
+
+class TestWatchCli:
+    """Test group for hcloud_reassign.cli.watch_cli."""
+
+    def test_invalid_section_rule(self, write_config, monkeypatch, capsys) -> None:
+        """Test that an invalid watch option is reported with its section instead of a traceback."""
+        path = write_config(sections={"floating.a": {"resource": "flip-a", "watch": "cpu >> 90"}})
+        monkeypatch.setattr(sys, "argv", ["hcloud-reassign-watch", "-c", path, "--once"])
+
+        with pytest.raises(SystemExit) as exit_info:
+            watch_cli.main()
+
+        assert exit_info.value.code == 2
+        assert "Section 'floating.a'" in capsys.readouterr().err
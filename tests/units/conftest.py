@@ -0,0 +1,52 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides fixtures shared by the unit tests."""
+
+from collections.abc import Callable
+
+import pytest
+
+# Options of sections written by write_config unless overridden
+FLOATING_SECTION = {
+    "type": "ip_floating",
+    "source": "srv-a",
+    "destination": "srv-b",
+    "metrics": "false",
+}
+
+
+@pytest.fixture
+def write_config(tmp_path) -> Callable[..., str]:
+    """Get a function writing configuration files against the mock server.
+
+    The function takes the number of numbered floating ip sections `count`,
+    further `sections` by name with options over FLOATING_SECTION, the file
+    `name` and `directory`, and client options as keyword arguments. It
+    returns the path of the written file.
+    """
+
+    def write(
+        count: int = 0,
+        sections: dict[str, dict[str, str]] | None = None,
+        name: str = "config",
+        directory=None,
+        **client: str,
+    ) -> str:
+        directory = directory or tmp_path
+        options = {
+            "client": {"api_url": "http://mock_server", "api_token": "1", "cache_path": str(directory), **client}
+        }
+        for i in range(count):
+            options[f"floating.{i}"] = {**FLOATING_SECTION, "resource": f"flip-{i}"}
+        for section, section_options in (sections or {}).items():
+            options[section] = {**FLOATING_SECTION, **section_options}
+
+        lines = []
+        for section, section_options in options.items():
+            lines += [f"[{section}]", *(f"{option}={value}" for option, value in section_options.items())]
+        path = directory / f"{name}.ini"
+        path.write_text("\n".join(lines))
+        return str(path)
+
+    return write
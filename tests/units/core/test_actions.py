@@ -0,0 +1,66 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.actions."""
+
+from types import SimpleNamespace
+
+from hcloud_reassign.core.actions import backoff, wait_for_actions
+from hcloud_reassign.utils import constants
+
+
+class TestActions:
+    """This class groups unit tests for hcloud_reassign.core.actions."""
+
+    @staticmethod
+    def mock_hclient(finish_after: int, failed: tuple = ()) -> SimpleNamespace:
+        """Create a client whose actions finish after `finish_after` polls."""
+        requests = []
+
+        def request(method, url, params):
+            requests.append(params["id"])
+            state = "running" if len(requests) < finish_after else "success"
+            return {
+                "actions": [
+                    {"id": action_id, "status": "error" if action_id in failed else state} for action_id in params["id"]
+                ]
+            }
+
+        return SimpleNamespace(request=request, requests=requests)
+
+    def test_backoff(self) -> None:
+        """Test that backoff grows and is capped."""
+        assert 0.1 <= backoff(0, base=0.1, cap=1) <= 0.1
+        assert all(0.1 <= backoff(10, base=0.1, cap=1) <= 1 for _ in range(100))
+
+    def test_batched_polling(self) -> None:
+        """Test that many actions are polled with one request per round."""
+        hclient = self.mock_hclient(finish_after=3, failed=(5,))
+        actions = [SimpleNamespace(id=i, status="running") for i in range(20)]
+
+        statuses = wait_for_actions(hclient, actions, timeout=5, base=0.001, cap=0.002)
+
+        assert len(hclient.requests) == 3
+        assert statuses[0] == constants.STATUS_SUCCESS
+        assert statuses[5] == constants.STATUS_ERROR
+        assert len(statuses) == 20
+
+    def test_finished_actions_are_not_polled(self) -> None:
+        """Test that finished actions need no request."""
+        hclient = self.mock_hclient(finish_after=1)
+
+        statuses = wait_for_actions(hclient, [SimpleNamespace(id=1, status="success")])
+
+        assert hclient.requests == []
+        assert statuses == {1: constants.STATUS_SUCCESS}
+
+    def test_timeout(self) -> None:
+        """Test that unfinished actions time out at the deadline."""
+        hclient = self.mock_hclient(finish_after=1000)
+
+        statuses = wait_for_actions(
+            hclient, [SimpleNamespace(id=1, status="running")], timeout=0.05, base=0.01, cap=0.01
+        )
+
+        assert statuses == {1: constants.STATUS_TIMEOUT}
+        assert 1 <= len(hclient.requests) <= 5
@@ -3,9 +3,11 @@
 
 """This module provides unit tests for hcloud_reassign.core.base."""
 
-from hcloud_reassign.core.base import make_client, HcloudClient
+from hcloud_reassign.core.base import make_client, HcloudClient, HcloudReassignIni
 from secrets import token_urlsafe
 
+import pytest
+
 
 class TestHcloudReassignCoreBase:
     """This class groups unit tests for hcloud_reassign.core.base."""
@@ -15,3 +17,37 @@ class TestHcloudReassignCoreBase:
     def test_make_client_instance_type(self) -> None:
         """Tests if the make_client function indeed creates an instance of HcloudClient."""
         assert isinstance(self.client, HcloudClient)
+
+    @staticmethod
+    def mock_config(tmp_path) -> HcloudReassignIni:
+        """Write a configuration with tagged sections and one that cannot be converted."""
+        path = tmp_path / "config.ini"
+        path.write_text(
+            "[client]\napi_token=1\n"
+            "[floating.web-1]\ntype=ip_floating\ntags=web, prod\n"
+            "[floating.web-2]\ntype=ip_floating\ntags=web\n"
+            "[floating.db]\ntype=ip_floating\ntags=db,prod\n"
+            "[broken]\ntype=ip_floating\nmetrics=maybe\n"
+        )
+        return HcloudReassignIni(path=str(path))
+
+    def test_select(self, tmp_path) -> None:
+        """Tests that sections are selected by name pattern and tag in configured order."""
+        config = self.mock_config(tmp_path)
+
+        assert config.select() == ["floating.web-1", "floating.web-2", "floating.db", "broken"]
+        assert config.select(patterns=["floating.web-*"]) == ["floating.web-1", "floating.web-2"]
+        assert config.select(tags=["prod"]) == ["floating.web-1", "floating.db"]
+        assert config.select(patterns=["floating.*"], tags=["db"]) == ["floating.db"]
+        assert config.select(patterns=["missing"]) == []
+        with pytest.raises(LookupError):
+            config.select(patterns=["missing"], strict=True)
+
+    def test_lazy_sections(self, tmp_path) -> None:
+        """Tests that sections are only converted when they are used."""
+        config = self.mock_config(tmp_path)
+
+        assert config.resource_section_dict["floating.db"]["tags"] == "db,prod"
+        assert len(config.resource_section_dict) == 4
+        with pytest.raises(ValueError):
+            config.resource_section_dict["broken"]
@@ -0,0 +1,80 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.cache."""
+
+from types import SimpleNamespace
+
+from hcloud_reassign.core import cache as cache_module
+from hcloud_reassign.core.cache import ResolutionCache, project_key
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+
+
+class TestResolutionCache:
+    """This class groups unit tests for hcloud_reassign.core.cache."""
+
+    mock_section = {
+        "type": "ip_floating",
+        "resource": "mock_floating_ip",
+        "source": "mock_server_a",
+        "destination": "mock_server_b",
+        "metrics": False,
+    }
+
+    def test_persistence(self, tmp_path) -> None:
+        """Test that IDs survive a new cache object."""
+        path = str(tmp_path / "cache.json")
+        ResolutionCache(path=path).set("servers", "srv", 42)
+
+        cache = ResolutionCache(path=path)
+        assert cache.get("servers", "srv") == 42
+        assert cache.get("servers", "other") is None
+
+        cache.invalidate("servers", "srv")
+        assert ResolutionCache(path=path).get("servers", "srv") is None
+
+    def test_expiry(self, tmp_path, monkeypatch) -> None:
+        """Test that entries older than ttl are ignored."""
+        cache = ResolutionCache(path=str(tmp_path / "cache.json"), ttl=10)
+        monkeypatch.setattr(cache_module, "time", lambda: 1000.0)
+        cache.set("servers", "srv", 42)
+
+        monkeypatch.setattr(cache_module, "time", lambda: 1005.0)
+        assert cache.get("servers", "srv") == 42
+        monkeypatch.setattr(cache_module, "time", lambda: 1011.0)
+        assert cache.get("servers", "srv") is None
+
+    def test_from_client_section(self, tmp_path) -> None:
+        """Test that the file is keyed by project and url, and that a ttl of 0 disables the cache."""
+        client = {"api_token": "1", "api_url": "http://mock_server", "cache_path": str(tmp_path)}
+        cache = ResolutionCache.from_client_section(client)
+
+        assert cache.path == str(tmp_path / f"{project_key('1', 'http://mock_server')}.json")
+        assert project_key("1", "http://mock_server") != project_key("2", "http://mock_server")
+        assert ResolutionCache.from_client_section({**client, "cache_ttl": "0"}) is None
+
+    def test_section_resolves_from_cache(self, tmp_path, monkeypatch) -> None:
+        """Test that a section assigns with cached IDs and without lookups."""
+        cache = ResolutionCache(path=str(tmp_path / "cache.json"))
+        cache.set("servers", "mock_server_b", 2)
+        cache.set("floating_ips", "mock_floating_ip", 3)
+
+        section = HCloudFloatingIPSection(
+            self.mock_section, {"api_token": "1", "api_url": "http://mock_server"}, cache=cache
+        )
+        assigned = []
+
+        def get_by_name(name):
+            raise AssertionError(f"Unexpected lookup of {name}")
+
+        monkeypatch.setattr(section.hclient.servers, "get_by_name", get_by_name)
+        monkeypatch.setattr(section.hclient.floating_ips, "get_by_name", get_by_name)
+        monkeypatch.setattr(
+            section.hclient.floating_ips,
+            "assign",
+            lambda floating_ip, server: assigned.append((floating_ip.id, server.id)) or SimpleNamespace(id=1),
+        )
+        monkeypatch.setattr(section, "__check_action_status__", lambda response: section.status_success)
+
+        assert section.reassign(direction="dest") == section.status_success
+        assert assigned == [(3, 2)]
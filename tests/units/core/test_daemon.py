@@ -0,0 +1,79 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.daemon."""
+
+import os
+from tempfile import mkdtemp
+from threading import Thread
+from time import sleep
+
+from hcloud_reassign.cli.notify_cli import send_command
+from hcloud_reassign.core.base import HcloudReassignIni
+from hcloud_reassign.core.daemon import ReassignDaemon
+from hcloud_reassign.core.snapshot import ProjectSnapshot
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+from hcloud_reassign.utils import constants
+
+
+class TestReassignDaemon:
+    """This class groups unit tests for hcloud_reassign.core.daemon."""
+
+    @staticmethod
+    def mock_daemon(write_config, monkeypatch) -> ReassignDaemon:
+        """Create a daemon with one floating ip section and no API access."""
+        config_path = write_config(sections={"floating.a": {"resource": "flip-a"}})
+        prefetched = []
+        monkeypatch.setattr(ProjectSnapshot, "refresh", lambda self: self)
+        monkeypatch.setattr(HCloudFloatingIPSection, "prefetch", lambda self: prefetched.append(self.resource))
+        monkeypatch.setattr(
+            HCloudFloatingIPSection,
+            "reassign",
+            lambda self, direction: constants.STATUS_SUCCESS if direction == "dest" else constants.STATUS_ERROR,
+        )
+        # Unix socket paths are limited in length, keep it short
+        socket_path = os.path.join(mkdtemp(prefix="hcr"), "d.sock")
+        daemon = ReassignDaemon(config=HcloudReassignIni(path=config_path), socket_path=socket_path, debounce=0.01)
+        daemon.prefetched = prefetched
+        return daemon
+
+    def test_dispatch(self, write_config, monkeypatch) -> None:
+        """Test command parsing and dispatching."""
+        daemon = self.mock_daemon(write_config, monkeypatch)
+
+        assert daemon.dispatch("ping") == "pong"
+        assert daemon.dispatch("reassign floating.a dest") == "floating.a: success"
+        assert daemon.dispatch("reassign floating.a src") == "floating.a: error"
+        assert daemon.dispatch("reassign floating.b dest").startswith("error:")
+        assert daemon.dispatch("reassign floating.a up").startswith("error:")
+        assert daemon.dispatch("move floating.a dest").startswith("error:")
+
+    def test_superseded(self, write_config, monkeypatch) -> None:
+        """Test that a command overtaken by another direction is answered as superseded."""
+        daemon = self.mock_daemon(write_config, monkeypatch)
+        daemon.events.debounce = 0.1
+
+        flap = daemon.events.submit("floating.a", "src")
+
+        assert daemon.dispatch("reassign floating.a dest") == "floating.a: success"
+        assert flap.result(5) is None
+
+    def test_socket_roundtrip(self, write_config, monkeypatch) -> None:
+        """Test that the notify client reaches a running daemon."""
+        daemon = self.mock_daemon(write_config, monkeypatch)
+        thread = Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+
+        for _ in range(100):
+            if os.path.exists(daemon.socket_path):
+                break
+            sleep(0.01)
+
+        try:
+            assert send_command("reassign floating.a dest", socket_path=daemon.socket_path) == "floating.a: success"
+            assert daemon.prefetched == ["flip-a"]
+        finally:
+            daemon.shutdown()
+            thread.join(timeout=5)
+
+        assert not os.path.exists(daemon.socket_path)
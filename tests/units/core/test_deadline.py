@@ -0,0 +1,80 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.deadline."""
+
+from time import sleep
+
+import pytest
+
+from hcloud_reassign.core import deadline
+from hcloud_reassign.core.base import HcloudReassignIni, client_session, make_client
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+from hcloud_reassign.utils import constants
+
+
+class TestDeadline:
+    """This class groups unit tests for hcloud_reassign.core.deadline."""
+
+    def test_phase_share(self) -> None:
+        """Test that a phase gets its share of the whole budget, bound by the time left."""
+        root = deadline.Deadline(10)
+        resolve = root.phase("resolve")
+        assert 2 < resolve.remaining() <= 10 * constants.DEADLINE_SHARES["resolve"]
+        # Phases of phases are shares of the root, not of the parent phase
+        assert resolve.phase("action_wait").expires == root.expires
+
+    def test_clip(self) -> None:
+        """Test that timeouts are shortened only inside a scope."""
+        assert deadline.clip(30) == 30
+        with deadline.scope(deadline.Deadline(1)):
+            assert deadline.clip(30) <= 1
+            assert deadline.clip(None) <= 1
+            with deadline.phase("assign"):
+                assert deadline.clip(30) <= 1 * constants.DEADLINE_SHARES["assign"]
+        assert deadline.current() is None
+
+    def test_install(self, monkeypatch) -> None:
+        """Test that requests get clipped timeouts and are not sent once the deadline passed."""
+        hclient = make_client(token="1", url="http://mock_server")
+        session = client_session(hclient)
+        timeouts = []
+        monkeypatch.setattr(session, "request", lambda method, url, **kwargs: timeouts.append(kwargs["timeout"]))
+        deadline.install(hclient)
+
+        session.request("GET", "http://mock_server/servers", timeout=(5, 10))
+        with deadline.scope(deadline.Deadline(1)):
+            session.request("GET", "http://mock_server/servers", timeout=(5, 10))
+            session.request("GET", "http://mock_server/servers", timeout=None)
+        with deadline.scope(deadline.Deadline(0.01)):
+            sleep(0.02)
+            with pytest.raises(deadline.DeadlineExceeded):
+                session.request("GET", "http://mock_server/servers", timeout=5)
+
+        assert timeouts[0] == (5, 10)
+        assert all(part <= 1 for part in timeouts[1])
+        assert timeouts[2] <= 1
+        assert len(timeouts) == 3
+
+    def test_reassign_within(self, write_config, monkeypatch) -> None:
+        """Test that a reassignment running past its deadline times out."""
+        config = HcloudReassignIni(path=write_config(sections={"floating": {"resource": "flip"}}, deadline="0.05"))
+
+        hclient = make_client(token="1", url="http://mock_server")
+        monkeypatch.setattr(client_session(hclient), "request", lambda method, url, **kwargs: None)
+        deadline.install(hclient)
+
+        def mock_reassign(self, direction: str) -> int:
+            with self.phase("action_wait"):
+                sleep(0.1)
+                client_session(self.hclient).request("GET", "http://mock_server/actions")
+            return constants.STATUS_SUCCESS
+
+        monkeypatch.setattr(HCloudFloatingIPSection, "reassign", mock_reassign)
+        section = HCloudFloatingIPSection(
+            section=config.resource_section_dict["floating"], client=config.client_section_dict, hclient=hclient
+        )
+
+        assert section.deadline_seconds == 0.05
+        assert section.reassign_within("dest") == constants.STATUS_TIMEOUT
+        assert section.reassign_within("dest", seconds=1) == constants.STATUS_SUCCESS
@@ -0,0 +1,94 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.drain."""
+
+from types import SimpleNamespace
+
+import pytest
+from hcloud_reassign.core.base import HcloudAPIException
+from hcloud_reassign.core.drain import apply_moves, configured_servers, plan_drain, plan_rebalance
+from hcloud_reassign.core.snapshot import ProjectSnapshot
+from hcloud_reassign.utils import constants
+
+
+def mock_snapshot(servers: dict[str, tuple[str, int]]) -> ProjectSnapshot:
+    """Create a snapshot of servers given by name as status and number of floating IPs."""
+    server_list = []
+    flips = []
+    for server_id, (name, (status, count)) in enumerate(servers.items(), start=1):
+        server = SimpleNamespace(id=server_id, name=name, status=status)
+        server_list.append(server)
+        flips += [SimpleNamespace(id=100 * server_id + i, name=f"{name}-flip-{i}", server=server) for i in range(count)]
+
+    hclient = SimpleNamespace(
+        servers=SimpleNamespace(get_all=lambda: server_list), floating_ips=SimpleNamespace(get_all=lambda: flips)
+    )
+    return ProjectSnapshot(hclient=hclient).refresh()
+
+
+class TestDrain:
+    """This class groups unit tests for hcloud_reassign.core.drain."""
+
+    def test_configured_servers(self) -> None:
+        """Check that sources and destinations are collected once, without gateway IPs."""
+        config = SimpleNamespace(
+            resource_section_dict={
+                "floating": {"source": "srv-a", "destination": "srv-b, srv-c"},
+                "routes": {"source": "srv-a", "destination": "10.0.0.3"},
+            }
+        )
+
+        assert configured_servers(config) == ["srv-a", "srv-b", "srv-c"]
+
+    def test_plan_drain(self) -> None:
+        """Check that floating IPs go to the running peers with the fewest floating IPs."""
+        snapshot = mock_snapshot(
+            {"srv-a": ("running", 4), "srv-b": ("running", 1), "srv-c": ("running", 0), "srv-d": ("off", 0)}
+        )
+
+        moves = plan_drain(snapshot, "srv-a", ["srv-a", "srv-b", "srv-c", "srv-d"])
+
+        assert [move.destination for move in moves] == ["srv-c", "srv-b", "srv-c", "srv-b"]
+        assert {move.source for move in moves} == {"srv-a"}
+
+    def test_plan_drain_without_peers(self) -> None:
+        """Check that draining fails without running peers and for unknown servers."""
+        snapshot = mock_snapshot({"srv-a": ("running", 1), "srv-b": ("off", 0)})
+
+        with pytest.raises(ValueError):
+            plan_drain(snapshot, "srv-a", ["srv-b"])
+        with pytest.raises(LookupError):
+            plan_drain(snapshot, "srv-x", ["srv-b"])
+
+    def test_plan_rebalance(self) -> None:
+        """Check that counts of running servers differ by at most one afterwards."""
+        snapshot = mock_snapshot({"srv-a": ("running", 5), "srv-b": ("running", 0), "srv-c": ("off", 3)})
+
+        moves = plan_rebalance(snapshot, ["srv-a", "srv-b", "srv-c"])
+
+        assert len(moves) == 2
+        assert {(move.source, move.destination) for move in moves} == {("srv-a", "srv-b")}
+
+    def test_apply_moves(self) -> None:
+        """Check that all assigns are sent before the actions are polled together."""
+        snapshot = mock_snapshot({"srv-a": ("running", 3), "srv-b": ("running", 0)})
+        moves = plan_drain(snapshot, "srv-a", ["srv-b"])
+        assigned = []
+
+        def assign(floating_ip, server):
+            assigned.append((floating_ip.name, server.name))
+            if len(assigned) == 2:
+                raise HcloudAPIException(code="locked", message="locked", details=None)
+            return SimpleNamespace(id=len(assigned), status="success")
+
+        hclient = SimpleNamespace(floating_ips=SimpleNamespace(assign=assign))
+
+        results = list(apply_moves(hclient=hclient, snapshot=snapshot, moves=moves, workers=1))
+
+        assert sorted(status for _, status in results) == [
+            constants.STATUS_SUCCESS,
+            constants.STATUS_SUCCESS,
+            constants.STATUS_ERROR,
+        ]
+        assert len(assigned) == 3
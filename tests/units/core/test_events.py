@@ -0,0 +1,88 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.events."""
+
+from threading import Event
+from time import sleep
+
+from hcloud_reassign.core.events import CoalescingQueue
+from hcloud_reassign.utils import constants
+
+
+class TestCoalescingQueue:
+    """This class groups unit tests for hcloud_reassign.core.events."""
+
+    @staticmethod
+    def blocking_queue(debounce: float = 0.01) -> tuple[CoalescingQueue, list, Event, Event]:
+        """Create a queue whose reassignments wait for a release event."""
+        calls = []
+        started = Event()
+        release = Event()
+
+        def apply(resource, direction):
+            calls.append((resource, direction))
+            started.set()
+            release.wait(5)
+            return constants.STATUS_SUCCESS
+
+        return CoalescingQueue(apply=apply, debounce=debounce), calls, started, release
+
+    def test_burst(self) -> None:
+        """Check that a burst of transitions is applied once in the latest direction."""
+        calls = []
+        queue = CoalescingQueue(apply=lambda resource, direction: calls.append(direction) or 0, debounce=0.05)
+
+        futures = [queue.submit("a", direction) for direction in ("dest", "src", "src", "dest")]
+
+        assert [future.result(5) for future in futures] == [None, None, None, constants.STATUS_SUCCESS]
+        assert calls == ["dest"]
+        queue.close()
+
+    def test_queued_after_running(self) -> None:
+        """Check that a transition during a reassignment is applied after it."""
+        queue, calls, started, release = self.blocking_queue()
+
+        first = queue.submit("a", "dest")
+        assert started.wait(5)
+        second = queue.submit("a", "src")
+        release.set()
+
+        assert first.result(5) == constants.STATUS_SUCCESS
+        assert second.result(5) == constants.STATUS_SUCCESS
+        assert calls == [("a", "dest"), ("a", "src")]
+        queue.close()
+
+    def test_covered_by_running(self) -> None:
+        """Check that a flap back to the running direction is answered by the running reassignment."""
+        queue, calls, started, release = self.blocking_queue()
+
+        first = queue.submit("a", "dest")
+        assert started.wait(5)
+        flap = queue.submit("a", "src")
+        back = queue.submit("a", "dest")
+        release.set()
+
+        assert flap.result(5) is None
+        assert first.result(5) == back.result(5) == constants.STATUS_SUCCESS
+        assert calls == [("a", "dest")]
+        queue.close()
+
+    def test_resources_concurrent(self) -> None:
+        """Check that a blocked resource does not delay another one."""
+        queue, calls, started, release = self.blocking_queue()
+
+        blocked = queue.submit("a", "dest")
+        assert started.wait(5)
+        other = queue.submit("b", "dest")
+
+        for _ in range(500):
+            if len(calls) == 2:
+                break
+            sleep(0.01)
+        release.set()
+
+        assert sorted(calls) == [("a", "dest"), ("b", "dest")]
+
+        assert blocked.result(5) == other.result(5) == constants.STATUS_SUCCESS
+        queue.close()
@@ -0,0 +1,76 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.executor."""
+
+from time import perf_counter, sleep
+
+from hcloud_reassign.core.base import HcloudReassignIni
+from hcloud_reassign.core.executor import reassign_resources
+from hcloud_reassign.core.snapshot import ProjectSnapshot
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+from hcloud_reassign.utils import constants
+import requests
+
+
+class TestHcloudReassignCoreExecutor:
+    """This class groups unit tests for hcloud_reassign.core.executor."""
+
+    def test_reassign_resources_concurrent(self, write_config, monkeypatch) -> None:
+        """Test that wall-clock time follows the slowest resource and sections share one client."""
+        clients = set()
+
+        def mock_reassign(self, direction: str) -> int:
+            clients.add(id(self.hclient))
+            sleep(0.2)
+            return constants.STATUS_SUCCESS
+
+        monkeypatch.setattr(HCloudFloatingIPSection, "reassign", mock_reassign)
+        monkeypatch.setattr(ProjectSnapshot, "refresh", lambda self: self)
+        monkeypatch.setattr(HCloudFloatingIPSection, "plan", lambda self, direction: None)
+        config = HcloudReassignIni(path=write_config(count=8))
+
+        start = perf_counter()
+        results = dict(reassign_resources(config=config, resources=config.resource_sections, direction="dest"))
+        elapsed = perf_counter() - start
+
+        assert len(results) == 8
+        assert set(results.values()) == {constants.STATUS_SUCCESS}
+        assert len(clients) == 1
+        assert elapsed < 0.2 * 4
+
+    def test_reassign_resources_serial(self, write_config, monkeypatch) -> None:
+        """Test that a single worker keeps the configured order."""
+        monkeypatch.setattr(HCloudFloatingIPSection, "reassign", lambda self, direction: constants.STATUS_SUCCESS)
+        monkeypatch.setattr(ProjectSnapshot, "refresh", lambda self: self)
+        monkeypatch.setattr(HCloudFloatingIPSection, "plan", lambda self, direction: None)
+        config = HcloudReassignIni(path=write_config(count=3))
+
+        results = list(
+            reassign_resources(config=config, resources=config.resource_sections, direction="src", workers=1)
+        )
+
+        assert [resource for resource, _ in results] == config.resource_sections
+
+    def test_reassign_resources_request_errors(self, write_config, monkeypatch) -> None:
+        """Test that connection errors and timeouts of one resource do not stop the others."""
+
+        def mock_reassign(self, direction: str) -> int:
+            if self.resource == "flip-0":
+                raise requests.ReadTimeout("read timed out")
+            if self.resource == "flip-1":
+                raise requests.ConnectionError("connection refused")
+            return constants.STATUS_SUCCESS
+
+        monkeypatch.setattr(HCloudFloatingIPSection, "reassign", mock_reassign)
+        monkeypatch.setattr(ProjectSnapshot, "refresh", lambda self: self)
+        monkeypatch.setattr(HCloudFloatingIPSection, "plan", lambda self, direction: None)
+        config = HcloudReassignIni(path=write_config(count=3))
+
+        results = dict(reassign_resources(config=config, resources=config.resource_sections, direction="dest"))
+
+        assert results == {
+            "floating.0": constants.STATUS_ERROR,
+            "floating.1": constants.STATUS_ERROR,
+            "floating.2": constants.STATUS_SUCCESS,
+        }
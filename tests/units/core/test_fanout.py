@@ -0,0 +1,79 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.fanout."""
+
+from time import perf_counter, sleep
+
+import pytest
+
+from hcloud_reassign.core import fanout
+from hcloud_reassign.core.snapshot import ProjectSnapshot
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+from hcloud_reassign.utils import constants
+
+
+class TestFanout:
+    """This class groups unit tests for hcloud_reassign.core.fanout."""
+
+    def test_config_paths(self, tmp_path, write_config) -> None:
+        """Test that directories expand to their configuration files in name order."""
+        projects = tmp_path / "projects"
+        projects.mkdir()
+        second = write_config(count=2, name="b", directory=projects, api_token="2")
+        first = write_config(count=2, name="a", directory=projects, api_token="1")
+        (projects / "notes.txt").write_text("")
+        single = write_config(count=2, name="c", api_token="3")
+
+        assert fanout.config_paths([str(projects), single, first]) == [first, second, single]
+        with pytest.raises(FileNotFoundError):
+            fanout.config_paths([str(tmp_path / "missing.ini")])
+
+    def test_project_names(self) -> None:
+        """Test that projects are named by file name unless two files share it."""
+        names = fanout.project_names(["/etc/a/web.ini", "/etc/a/db.ini", "/etc/b/db.ini"])
+
+        assert list(names) == ["web", "/etc/a/db.ini", "/etc/b/db.ini"]
+
+    def test_reassign_projects(self, tmp_path, write_config, monkeypatch) -> None:
+        """Test that projects run concurrently with a client each and results are reported together."""
+        clients = {}
+
+        def mock_reassign(self, direction: str) -> int:
+            clients.setdefault(self.client["api_token"], set()).add(id(self.hclient))
+            sleep(0.2)
+            return constants.STATUS_SUCCESS
+
+        monkeypatch.setattr(HCloudFloatingIPSection, "reassign", mock_reassign)
+        monkeypatch.setattr(HCloudFloatingIPSection, "plan", lambda self, direction: None)
+        monkeypatch.setattr(ProjectSnapshot, "refresh", lambda self: self)
+        paths = [write_config(count=2, name=f"project-{i}", api_token=str(i)) for i in range(4)]
+        broken = tmp_path / "broken.ini"
+        broken.write_text("[client]\napi_token=9\n[floating.0]\ntype=unknown\n")
+
+        report = fanout.FanoutReport()
+        begin = perf_counter()
+        results = list(fanout.reassign_projects(paths=[*paths, str(broken)], direction="dest", report=report))
+        elapsed = perf_counter() - begin
+
+        assert len([result for result in results if result.section]) == 8
+        assert elapsed < 0.2 * 4
+        # One client per project, shared by its sections
+        assert {token: len(ids) for token, ids in clients.items()} == {"0": 1, "1": 1, "2": 1, "3": 1}
+        assert report.project("project-0").status == constants.STATUS_SUCCESS
+        assert report.project("broken").error is not None
+        assert report.status == constants.STATUS_ERROR
+        assert report.describe().splitlines()[-1] == "projects: 5, failed: 1, resources: 8"
+
+    def test_selected_resources(self, write_config, monkeypatch) -> None:
+        """Test that selected sections are reassigned in every project that has them."""
+        monkeypatch.setattr(HCloudFloatingIPSection, "reassign", lambda self, direction: constants.STATUS_SUCCESS)
+        monkeypatch.setattr(HCloudFloatingIPSection, "plan", lambda self, direction: None)
+        monkeypatch.setattr(ProjectSnapshot, "refresh", lambda self: self)
+        paths = [write_config(count=1, name="small", api_token="1"), write_config(count=2, name="big", api_token="2")]
+
+        results = fanout.reassign_projects(paths=paths, direction="src", resources=["floating.1"])
+
+        assert [(result.project, result.section, result.status) for result in results] == [
+            ("big", "floating.1", constants.STATUS_SUCCESS)
+        ]
@@ -0,0 +1,66 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.hedging."""
+
+from itertools import count
+from time import perf_counter, sleep
+
+from hcloud_reassign.core.base import client_session, make_client
+from hcloud_reassign.core.hedging import LatencyTracker, install
+
+
+class TestHedging:
+    """This class groups unit tests for hcloud_reassign.core.hedging."""
+
+    def test_percentile(self) -> None:
+        """Test that percentiles are known only with enough latencies."""
+        tracker = LatencyTracker(window=100, min_samples=10)
+        for i in range(9):
+            tracker.observe("/servers", i / 100)
+        assert tracker.percentile("/servers") is None
+
+        for i in range(9, 100):
+            tracker.observe("/servers", i / 100)
+        assert tracker.percentile("/servers", 0.95) == 0.95
+        assert tracker.percentile("/actions") is None
+
+    def test_hedge_slow_get(self, monkeypatch) -> None:
+        """Test that a slow GET is sent again and the faster attempt is used."""
+        hclient = make_client(token="1", url="http://mock_server")
+        session = client_session(hclient)
+        attempts = count()
+
+        def mock_request(method, url, **kwargs):
+            attempt = next(attempts)
+            # The first attempt of each request hangs
+            sleep(1 if attempt == 0 else 0.01)
+            return attempt
+
+        monkeypatch.setattr(session, "request", mock_request)
+        tracker = LatencyTracker(min_samples=1)
+        tracker.observe("/servers", 0.05)
+        install(hclient, tracker=tracker)
+
+        begin = perf_counter()
+        assert session.request("GET", "http://mock_server/servers") == 1
+        assert perf_counter() - begin < 0.5
+
+    def test_no_hedge_post(self, monkeypatch) -> None:
+        """Test that changes are never sent twice."""
+        hclient = make_client(token="1", url="http://mock_server")
+        session = client_session(hclient)
+        calls = []
+
+        def mock_request(method, url, **kwargs):
+            calls.append(method)
+            sleep(0.1)
+
+        monkeypatch.setattr(session, "request", mock_request)
+        tracker = LatencyTracker(min_samples=1)
+        tracker.observe("/floating_ips/{id}/actions/assign", 0.01)
+        install(hclient, tracker=tracker)
+
+        session.request("POST", "http://mock_server/floating_ips/1/actions/assign")
+
+        assert calls == ["POST"]
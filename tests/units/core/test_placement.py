@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign Script placement unit tests.
+
+This module contains unit tests for the hcloud_reassign.core.placement module.
+"""
+
+from hcloud_reassign.core.placement import Candidate, load_from_time_series, score_candidates
+
+
+class TestPlacement:
+    """Test group for hcloud_reassign.core.placement."""
+
+    def test_load_from_time_series(self) -> None:
+        """Check that means are taken per series and bandwidths are summed per type."""
+        load = load_from_time_series(
+            {
+                "cpu": {"values": [[0, "10"], [1, "30"], [2, "NaN"]]},
+                "network.0.bandwidth.in": {"values": [[0, "100"]]},
+                "network.0.bandwidth.out": {"values": [[0, "50"]]},
+                "network.0.pps.in": {"values": [[0, "9999"]]},
+                "disk.0.bandwidth.read": {"values": []},
+            }
+        )
+
+        assert load == {"cpu": 20.0, "network": 150.0}
+
+    def test_score_candidates(self) -> None:
+        """Check that unhealthy candidates are dropped and the least loaded one ranks first."""
+        candidates = [
+            Candidate("busy", floating_ips=2, load={"cpu": 80.0, "network": 100.0, "disk": 10.0}),
+            Candidate("idle", floating_ips=1, load={"cpu": 10.0, "network": 50.0, "disk": 10.0}),
+            Candidate("down", healthy=False),
+        ]
+
+        ranked = score_candidates(candidates)
+
+        assert [candidate.name for candidate in ranked] == ["idle", "busy"]
+        assert ranked[0].score < ranked[1].score
+
+    def test_unknown_load_counts_as_highest(self) -> None:
+        """Check that candidates without metrics do not win over measured ones."""
+        candidates = [Candidate("unknown"), Candidate("high", load={"cpu": 10.0}), Candidate("low", load={"cpu": 5.0})]
+
+        assert score_candidates(candidates)[0].name == "low"
+        assert score_candidates(candidates, use_metrics=False)[0].name == "unknown"
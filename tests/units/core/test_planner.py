@@ -0,0 +1,82 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.planner."""
+
+from types import SimpleNamespace
+
+from hcloud_reassign.core.executor import reassign_one
+from hcloud_reassign.core.planner import Plan, PlanItem
+from hcloud_reassign.core.snapshot import ProjectSnapshot
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+from hcloud_reassign.utils import constants
+
+
+class TestPlanner:
+    """This class groups unit tests for hcloud_reassign.core.planner."""
+
+    mock_client = {"api_token": "1", "api_url": "http://mock_server"}
+
+    @staticmethod
+    def mock_snapshot() -> ProjectSnapshot:
+        """Create a snapshot with flip-0 on srv-b and flip-1 on srv-a."""
+        srv_a = SimpleNamespace(id=1, name="srv-a")
+        srv_b = SimpleNamespace(id=2, name="srv-b")
+        hclient = SimpleNamespace(
+            servers=SimpleNamespace(get_all=lambda: [srv_a, srv_b]),
+            floating_ips=SimpleNamespace(
+                get_all=lambda: [
+                    SimpleNamespace(id=10, name="flip-0", server=srv_b),
+                    SimpleNamespace(id=11, name="flip-1", server=srv_a),
+                ]
+            ),
+        )
+        return ProjectSnapshot(hclient).refresh()
+
+    def mock_section(self, resource: str, snapshot: ProjectSnapshot) -> HCloudFloatingIPSection:
+        """Create a floating ip section from srv-a to srv-b."""
+        section = {"type": "ip_floating", "resource": resource, "source": "srv-a", "destination": "srv-b"}
+        return HCloudFloatingIPSection({**section, "metrics": False}, self.mock_client, snapshot=snapshot)
+
+    def test_plan_items(self, monkeypatch) -> None:
+        """Test that only floating ips on another server are changed."""
+        snapshot = self.mock_snapshot()
+
+        unchanged = self.mock_section("flip-0", snapshot).plan(direction="dest")
+        changed = self.mock_section("flip-1", snapshot).plan(direction="dest")
+
+        assert not unchanged.changed
+        assert changed.changed
+        assert changed.current == "srv-a"
+
+        # Resources missing in the snapshot are looked up by name
+        missing = self.mock_section("flip-9", snapshot)
+        monkeypatch.setattr(missing.hclient.floating_ips, "get_by_name", lambda name: None)
+        assert missing.plan(direction="dest") is None
+
+    def test_unknown_assignment_is_changed(self) -> None:
+        """Test that items without assignment information are applied."""
+        assert PlanItem(resource="flip", desired="srv", current="srv", known=False).changed
+
+    def test_describe(self) -> None:
+        """Test the plan description and call estimate."""
+        plan = Plan(
+            items=[
+                PlanItem(resource="flip-0", desired="srv-b", current="srv-b", section="a"),
+                PlanItem(resource="flip-1", desired="srv-b", current="srv-a", section="b"),
+            ],
+            lookup_calls=2,
+        )
+
+        lines = plan.describe().splitlines()
+        assert lines[0] == "a: flip-0 on srv-b (unchanged)"
+        assert lines[1] == "b: flip-1 srv-a -> srv-b (1 calls)"
+        assert lines[2] == "API calls: 2 lookups, 1 changes, at least 1 action polls"
+
+    def test_unchanged_sections_are_skipped(self, monkeypatch) -> None:
+        """Test that reassigning an unchanged section issues no call."""
+        section = self.mock_section("flip-0", self.mock_snapshot())
+        monkeypatch.setattr(section, "reassign", lambda direction: constants.STATUS_ERROR)
+
+        assert reassign_one(section, "a", "dest") == constants.STATUS_SUCCESS
+        assert reassign_one(section, "a", "dest", skip_unchanged=False) == constants.STATUS_ERROR
@@ -0,0 +1,74 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.ratelimit."""
+
+from time import time
+from types import SimpleNamespace
+
+from hcloud_reassign.core.base import client_session, make_client
+from hcloud_reassign.core.ratelimit import RateLimiter, request_priority
+from hcloud_reassign.utils import constants
+
+
+class TestRateLimiter:
+    """This class groups unit tests for hcloud_reassign.core.ratelimit."""
+
+    def test_request_priority(self) -> None:
+        """Test that assign calls come before polls, lookups and metrics."""
+        api = "https://api.hetzner.cloud/v1"
+        assert request_priority("POST", f"{api}/floating_ips/1/actions/assign") == constants.PRIORITY_ACTION
+        assert request_priority("GET", f"{api}/actions?id=1") == constants.PRIORITY_POLL
+        assert request_priority("GET", f"{api}/floating_ips?name=a") == constants.PRIORITY_LOOKUP
+        assert request_priority("GET", f"{api}/servers/1/metrics") == constants.PRIORITY_METRICS
+
+    def test_reserve(self) -> None:
+        """Test that lower priorities leave tokens for changes."""
+        limiter = RateLimiter(limit=100, period=100)
+        limiter.update({"RateLimit-Limit": "100", "RateLimit-Remaining": "20"})
+
+        assert limiter.try_acquire(constants.PRIORITY_METRICS) > 0
+        assert limiter.try_acquire(constants.PRIORITY_ACTION) == 0
+
+        limiter.update({"RateLimit-Remaining": "0"})
+        assert 0 < limiter.try_acquire(constants.PRIORITY_ACTION) <= 1
+
+    def test_reset(self) -> None:
+        """Test that the bucket is full at the reset time and a 429 empties it until then."""
+        limiter = RateLimiter(limit=100, period=100)
+        limiter.update({"RateLimit-Limit": "100", "RateLimit-Remaining": "50", "RateLimit-Reset": str(time() + 500)})
+
+        # 50 tokens in 500 seconds, not the 1 per second of the period
+        assert 9 < limiter.try_acquire(constants.PRIORITY_LOOKUP) <= 10
+
+        limiter.update({"RateLimit-Limit": "100", "RateLimit-Reset": str(time() + 1000)}, status=429)
+        assert limiter.state["tokens"] < 0.01
+        assert 9 < limiter.try_acquire(constants.PRIORITY_ACTION) <= 10
+
+    def test_shared_state(self, tmp_path) -> None:
+        """Test that processes share the bucket through the state file."""
+        path = str(tmp_path / "state")
+        first = RateLimiter(limit=100, period=1000, state_path=path)
+        second = RateLimiter(limit=100, period=1000, state_path=path)
+
+        first.update({"RateLimit-Limit": "100", "RateLimit-Remaining": "30"})
+
+        assert second.try_acquire(constants.PRIORITY_LOOKUP) > 0
+        assert second.try_acquire(constants.PRIORITY_POLL) == 0
+        assert 28.9 < second.state["tokens"] < 29.2
+
+    def test_install(self, monkeypatch) -> None:
+        """Test that an installed limiter sees requests and response headers."""
+        hclient = make_client(token="1", url="http://mock_server")
+        session = client_session(hclient)
+        monkeypatch.setattr(
+            session,
+            "request",
+            lambda method, url, **kwargs: SimpleNamespace(headers={"RateLimit-Remaining": "7"}, status_code=200),
+        )
+        limiter = RateLimiter(limit=100)
+        limiter.install(hclient)
+
+        session.request("GET", "http://mock_server/servers")
+
+        assert 7 <= limiter.state["tokens"] < 7.1
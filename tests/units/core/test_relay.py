@@ -0,0 +1,138 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.relay."""
+
+import json
+import time
+from http.client import HTTPConnection
+from threading import Thread
+from types import SimpleNamespace
+
+import pytest
+from hcloud_reassign.cli.notify_cli import send_relay
+from hcloud_reassign.core.events import CoalescingQueue
+from hcloud_reassign.core.relay import ReassignRelay, RelayError, RelayNode, load_nodes
+from hcloud_reassign.utils import constants
+from hcloud_reassign.utils.signing import normalize_secret, relay_request, signature
+
+SECRET = b"node-secret"
+
+
+class TestReassignRelay:
+    """This class groups unit tests for hcloud_reassign.core.relay."""
+
+    @staticmethod
+    def mock_relay() -> tuple[ReassignRelay, list]:
+        """Create a relay with one node and a daemon reassigning without API access."""
+        calls = []
+        events = CoalescingQueue(apply=lambda section, direction: calls.append((section, direction)) or 0, debounce=0)
+        daemon = SimpleNamespace(sections={"floating.web": None, "floating.db": None}, events=events)
+        nodes = {"lb-01": RelayNode(name="lb-01", secret=SECRET, sections=("floating.w*",))}
+        return ReassignRelay(daemon=daemon, nodes=nodes), calls
+
+    def test_load_nodes(self, tmp_path) -> None:
+        """Check that nodes are read with their section patterns and incomplete nodes are rejected."""
+        path = tmp_path / "nodes.ini"
+        path.write_text("[lb-01]\nsecret=abc\nsections=floating.web, floating.db-*\n")
+
+        assert load_nodes(str(path)) == {
+            "lb-01": RelayNode(name="lb-01", secret=b"abc", sections=("floating.web", "floating.db-*"))
+        }
+
+        path.write_text("[lb-01]\nsections=floating.web\n")
+        with pytest.raises(ValueError):
+            load_nodes(str(path))
+
+    @pytest.mark.parametrize("raw", [b"abc", b"abc\n", b" \tabc \r\n", b"\n\nabc\nignored\n"])
+    def test_normalize_secret(self, raw: bytes, tmp_path) -> None:
+        """Check that secret files and nodes files give the same key regardless of surrounding whitespace."""
+        path = tmp_path / "nodes.ini"
+        path.write_text("[lb-01]\nsecret= abc\t\nsections=floating.web\n")
+
+        assert normalize_secret(raw) == load_nodes(str(path))["lb-01"].secret == b"abc"
+
+    def test_authorize(self) -> None:
+        """Check that a signed request of a permitted node is accepted once."""
+        relay, _ = self.mock_relay()
+        body, signed = relay_request(node="lb-01", section="floating.web", direction="dest", secret=SECRET)
+
+        assert relay.authorize(body, signed) == ("lb-01", "floating.web", "dest")
+        with pytest.raises(RelayError, match="replayed"):
+            relay.authorize(body, signed)
+
+    @pytest.mark.parametrize(
+        "request_fields, secret, status",
+        [
+            ({"node": "lb-02"}, SECRET, 403),
+            ({}, b"wrong", 403),
+            ({"timestamp": 0}, SECRET, 403),
+            ({"section": "floating.db"}, SECRET, 403),
+            ({"section": "floating.www"}, SECRET, 404),
+            ({"direction": "up"}, SECRET, 400),
+        ],
+    )
+    def test_rejected(self, request_fields: dict, secret: bytes, status: int) -> None:
+        """Check that unknown nodes, wrong signatures, old requests and foreign sections are rejected."""
+        relay, calls = self.mock_relay()
+        request = {"node": "lb-01", "section": "floating.web", "direction": "dest", "nonce": "n"}
+        request = {**request, "timestamp": int(time.time()), **request_fields}
+        body = json.dumps(request).encode()
+
+        code, answer = relay.handle(body, signature(secret, body))
+
+        assert code == status
+        assert "error" in answer
+        assert calls == []
+
+    def test_non_ascii_signature(self) -> None:
+        """Check that a signature header with non-ASCII characters is rejected as invalid."""
+        relay, calls = self.mock_relay()
+        body, _ = relay_request(node="lb-01", section="floating.web", direction="dest", secret=SECRET)
+
+        code, answer = relay.handle(body, "sig\u00e9")
+
+        assert code == 403
+        assert answer == {"error": "invalid signature"}
+        assert calls == []
+
+    def test_roundtrip(self) -> None:
+        """Check that the notify client reaches a serving relay."""
+        relay, calls = self.mock_relay()
+        server = relay.serve(port=0, address="127.0.0.1")
+        Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        try:
+            assert send_relay(url, "lb-01", SECRET, "floating.web", "dest") == "floating.web: success"
+            assert send_relay(url, "lb-01", b"wrong", "floating.web", "dest") == "error: invalid signature"
+        finally:
+            server.shutdown()
+            server.server_close()
+            relay.daemon.events.close()
+
+        assert calls == [("floating.web", "dest")]
+
+    def test_body_too_large(self) -> None:
+        """Check that oversized bodies are answered with 413 before they are read."""
+        relay, calls = self.mock_relay()
+        server = relay.serve(port=0, address="127.0.0.1")
+        Thread(target=server.serve_forever, daemon=True).start()
+
+        try:
+            connection = HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+            # Only the headers are sent, the relay must answer without waiting for the body
+            connection.putrequest("POST", constants.RELAY_PATH)
+            connection.putheader("Content-Length", str(constants.RELAY_MAX_BODY + 1))
+            connection.endheaders()
+            response = connection.getresponse()
+
+            assert response.status == 413
+            assert json.loads(response.read()) == {"error": "request too large"}
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+            relay.daemon.events.close()
+
+        assert calls == []
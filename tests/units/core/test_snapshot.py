@@ -0,0 +1,110 @@
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""This module provides unit tests for hcloud_reassign.core.snapshot."""
+
+from types import SimpleNamespace
+
+from hcloud_reassign.core.cache import ResolutionCache
+from hcloud_reassign.core.executor import attach_snapshot
+from hcloud_reassign.core.snapshot import ProjectSnapshot
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+
+
+class TestProjectSnapshot:
+    """This class groups unit tests for hcloud_reassign.core.snapshot."""
+
+    mock_client = {"api_token": "1", "api_url": "http://mock_server"}
+
+    @staticmethod
+    def mock_hclient() -> SimpleNamespace:
+        """Create a client listing two servers and three floating ips."""
+        srv_a = SimpleNamespace(id=1, name="srv-a")
+        srv_b = SimpleNamespace(id=2, name="srv-b")
+        flips = [
+            SimpleNamespace(id=10, name="flip-0", server=srv_a),
+            SimpleNamespace(id=11, name="flip-1", server=srv_a),
+            SimpleNamespace(id=12, name="flip-2", server=None),
+        ]
+        calls = []
+
+        def lister(kind, resources):
+            return lambda: calls.append(kind) or resources
+
+        return SimpleNamespace(
+            calls=calls,
+            servers=SimpleNamespace(get_all=lister("servers", [srv_a, srv_b])),
+            floating_ips=SimpleNamespace(get_all=lister("floating_ips", flips)),
+        )
+
+    def mock_sections(self, hclient, count: int, cache=None) -> dict:
+        """Create floating ip sections using the mock client."""
+        return {
+            f"floating.{i}": HCloudFloatingIPSection(
+                {
+                    "type": "ip_floating",
+                    "resource": f"flip-{i}",
+                    "source": "srv-a",
+                    "destination": "srv-b",
+                    "metrics": False,
+                },
+                self.mock_client,
+                hclient=hclient,
+                cache=cache,
+            )
+            for i in range(count)
+        }
+
+    def test_indexes(self) -> None:
+        """Test indexes by name, by id and by assigned server."""
+        snapshot = ProjectSnapshot(self.mock_hclient()).refresh()
+
+        assert snapshot.get("servers", "srv-b").id == 2
+        assert snapshot.get("servers", "srv-c") is None
+        assert snapshot.get_by_id("floating_ips", 12).name == "flip-2"
+        assert [flip.id for flip in snapshot.server_floating_ips(1)] == [10, 11]
+        assert snapshot.server_floating_ips(2) == []
+
+    def test_sections_resolve_through_snapshot(self, tmp_path) -> None:
+        """Test that many sections cost one list call per resource type."""
+        hclient = self.mock_hclient()
+        cache = ResolutionCache(path=str(tmp_path / "cache.json"))
+        sections = self.mock_sections(hclient, count=3, cache=cache)
+
+        assert attach_snapshot(sections=sections, hclient=hclient, cache=cache) is not None
+        for section in sections.values():
+            section.prefetch()
+
+        assert sorted(hclient.calls) == ["floating_ips", "servers"]
+        assert sections["floating.2"].resolve("floating_ips", "flip-2").id == 12
+        assert cache.get("servers", "srv-b") == 2
+
+    def test_snapshot_miss(self, tmp_path) -> None:
+        """Test that a resource missing in the snapshot is looked up by name."""
+        hclient = self.mock_hclient()
+        flip = SimpleNamespace(id=13, name="flip-3", server=None)
+        hclient.floating_ips.get_by_name = lambda name: hclient.calls.append(name) or (
+            flip if name == "flip-3" else None
+        )
+        cache = ResolutionCache(path=str(tmp_path / "cache.json"))
+        cache.set("floating_ips", "flip-3", 99)
+        section = self.mock_sections(hclient, count=1, cache=cache)["floating.0"]
+        section.snapshot = ProjectSnapshot(hclient).refresh()
+
+        assert section.resolve("floating_ips", "flip-3") is flip
+        assert section.resolve("floating_ips", "flip-4") is None
+        assert hclient.calls[-2:] == ["flip-3", "flip-4"]
+        assert cache.get("floating_ips", "flip-3") == 13
+
+    def test_no_snapshot_for_cached_sections(self, tmp_path) -> None:
+        """Test that a warm cache makes the snapshot unnecessary."""
+        hclient = self.mock_hclient()
+        cache = ResolutionCache(path=str(tmp_path / "cache.json"))
+        cache.set_many("servers", {"srv-a": 1, "srv-b": 2})
+        cache.set_many("floating_ips", {"flip-0": 10, "flip-1": 11})
+
+        assert (
+            attach_snapshot(sections=self.mock_sections(hclient, count=2, cache=cache), hclient=hclient, cache=cache)
+            is None
+        )
+        assert hclient.calls == []
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign Script telemetry unit tests.
+
+This module contains unit tests for the hcloud_reassign.core.telemetry module.
+"""
+
+from types import SimpleNamespace
+from urllib.request import urlopen
+
+import pytest
+
+from hcloud_reassign.core import telemetry
+from hcloud_reassign.core.base import client_session, make_client
+from hcloud_reassign.core.telemetry import OPENMETRICS_CONTENT_TYPE, Registry
+
+
+class TestTelemetry:
+    """Test group for hcloud_reassign.core.telemetry."""
+
+    def test_expose(self) -> None:
+        """Check the OpenMetrics text of counters and histograms."""
+        registry = Registry()
+        retries = registry.counter("test_retries", "Retries.", ("reason",))
+        latency = registry.histogram("test_seconds", "Latency.", ("phase",), buckets=(0.1, 1.0))
+        retries.inc(reason='not "found"')
+        latency.observe(0.05, phase="assign")
+        latency.observe(0.5, phase="assign")
+
+        assert registry.counter("test_retries", "Retries.", ("reason",)) is retries
+        assert registry.expose().splitlines() == [
+            "# TYPE test_retries counter",
+            "# HELP test_retries Retries.",
+            'test_retries_total{reason="not \\"found\\""} 1.0',
+            "# TYPE test_seconds histogram",
+            "# HELP test_seconds Latency.",
+            'test_seconds_bucket{phase="assign",le="0.1"} 1.0',
+            'test_seconds_bucket{phase="assign",le="1.0"} 2.0',
+            'test_seconds_bucket{phase="assign",le="+Inf"} 2.0',
+            'test_seconds_count{phase="assign"} 2.0',
+            'test_seconds_sum{phase="assign"} 0.55',
+            "# EOF",
+        ]
+
+    def test_wrong_labels(self) -> None:
+        """Check that label names must match."""
+        with pytest.raises(ValueError):
+            Registry().counter("test", "Test.", ("reason",)).inc(phase="x")
+
+    def test_endpoint(self) -> None:
+        """Check that IDs are removed from endpoints."""
+        assert telemetry.endpoint("https://api.hetzner.cloud/v1/floating_ips/42/actions/assign") == (
+            "/v1/floating_ips/{id}/actions/assign"
+        )
+        assert telemetry.endpoint("http://mock_server/actions/7?id=1") == "/actions/{id}"
+
+    def test_instrument(self, monkeypatch) -> None:
+        """Check that requests of an instrumented client are timed by endpoint and code."""
+        hclient = make_client(token="1", url="http://mock_server")
+        session = client_session(hclient)
+        monkeypatch.setattr(session, "request", lambda method, url, **kwargs: SimpleNamespace(status_code=201))
+        labels = {"method": "POST", "endpoint": "/floating_ips/{id}/actions/assign", "code": "201"}
+        before = telemetry.api_request_seconds.count(**labels)
+
+        telemetry.instrument(hclient)
+        session.request("post", "http://mock_server/floating_ips/3/actions/assign")
+
+        assert telemetry.api_request_seconds.count(**labels) == before + 1
+
+    def test_textfile_and_serve(self, tmp_path) -> None:
+        """Check that metrics are written to a file and served over HTTP."""
+        registry = Registry()
+        registry.counter("test_total_reassignments", "Test.").inc()
+        path = tmp_path / "hcloud_reassign.prom"
+
+        registry.write_textfile(str(path))
+        server = registry.serve(port=0, address="127.0.0.1")
+        try:
+            with urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+
+        assert path.read_text() == body == registry.expose()
+        assert content_type == OPENMETRICS_CONTENT_TYPE
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign Script metrics collector unit tests.
+
+This module contains unit tests for the hcloud_reassign.monitor.collector module.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from hcloud_reassign.core.base import HcloudAPIException
+from hcloud_reassign.monitor.collector import MetricsCollector
+from requests import ReadTimeout
+
+
+class TestMetricsCollector:
+    """Test group for hcloud_reassign.monitor.collector."""
+
+    interval = ("2025-01-01T00:00:00", "2025-01-01T01:00:00")
+
+    @staticmethod
+    def mock_hclient(
+        names: list[str], delay: float = 0.0, failing: str = "", error: Exception | None = None
+    ) -> SimpleNamespace:
+        """Create a client listing servers and returning one cpu sample per request.
+
+        Requests for the failing server raise error, an API error if omitted.
+        """
+        servers = [SimpleNamespace(id=i, name=name) for i, name in enumerate(names)]
+        calls = {"get_all": 0, "get_metrics": 0, "active": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def get_all():
+            calls["get_all"] += 1
+            return servers
+
+        def get_metrics(server, type, start, end, step):
+            with lock:
+                calls["get_metrics"] += 1
+                calls["active"] += 1
+                calls["peak"] = max(calls["peak"], calls["active"])
+            time.sleep(delay)
+            with lock:
+                calls["active"] -= 1
+            if server.name == failing:
+                raise error or HcloudAPIException(code="server_error", message="boom", details=None)
+            return SimpleNamespace(
+                metrics=SimpleNamespace(time_series={"cpu": {"values": [[0, str(server.id)]]}, "network.0": {}})
+            )
+
+        return SimpleNamespace(servers=SimpleNamespace(get_all=get_all, get_metrics=get_metrics), calls=calls)
+
+    def test_collect_resolves_once_and_runs_concurrently(self) -> None:
+        """Check that servers are listed once and fetched by a bounded pool."""
+        names = [f"srv{i}" for i in range(8)]
+        hclient = self.mock_hclient(names, delay=0.05)
+
+        results = list(MetricsCollector(hclient, workers=4).collect(names, "cpu", interval=self.interval))
+
+        assert hclient.calls["get_all"] == 1
+        assert hclient.calls["get_metrics"] == 8
+        assert 1 < hclient.calls["peak"] <= 4
+        assert sorted(result.server for result in results) == names
+        assert all(
+            result.ok and result.data == [{"values": [[0, name[3:]]]}]
+            for result, name in zip(sorted(results, key=lambda r: r.server), names)
+        )
+
+    def test_collect_reports_errors(self) -> None:
+        """Check that unknown servers and API errors are reported per server."""
+        hclient = self.mock_hclient(["srv0", "srv1"], failing="srv1")
+
+        results = {
+            result.server: result
+            for result in MetricsCollector(hclient).collect(["srv0", "srv1", "missing"], ["cpu"], self.interval)
+        }
+
+        assert results["srv0"].ok
+        assert isinstance(results["srv1"].error, HcloudAPIException)
+        assert isinstance(results["missing"].error, LookupError)
+
+    def test_collect_reports_connection_errors(self) -> None:
+        """Check that a server whose request times out does not stop the others."""
+        hclient = self.mock_hclient(["srv0", "srv1"], failing="srv1", error=ReadTimeout("timed out"))
+
+        results = {
+            result.server: result
+            for result in MetricsCollector(hclient).collect(["srv0", "srv1"], ["cpu"], self.interval)
+        }
+
+        assert results["srv0"].ok
+        assert isinstance(results["srv1"].error, ReadTimeout)
+
+    def test_follow_yields_new_samples(self) -> None:
+        """Check that follow resolves once and only yields samples not seen before."""
+        samples = [[[1, "0.1"]], [[1, "0.1"], [2, "0.2"]], [[1, "0.1"], [2, "0.2"]]]
+        servers = [SimpleNamespace(id=1, name="srv")]
+        calls = {"get_all": 0}
+
+        def get_all():
+            calls["get_all"] += 1
+            return servers
+
+        def get_metrics(server, type, start, end, step):
+            return SimpleNamespace(metrics=SimpleNamespace(time_series={"cpu": {"values": samples.pop(0)}}))
+
+        hclient = SimpleNamespace(servers=SimpleNamespace(get_all=get_all, get_metrics=get_metrics))
+        sleeps = []
+
+        results = list(MetricsCollector(hclient).follow(["srv"], "cpu", step=5, polls=3, sleep=sleeps.append))
+
+        assert calls["get_all"] == 1
+        assert sleeps == [5, 5]
+        assert [result.time_series["cpu"]["values"] for result in results] == [[[1, "0.1"]], [[2, "0.2"]], []]
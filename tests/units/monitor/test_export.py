@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign Script metrics export unit tests.
+
+This module contains unit tests for the hcloud_reassign.monitor.export module.
+"""
+
+import math
+from io import BytesIO
+
+import pytest
+
+from hcloud_reassign.monitor.collector import MetricsResult
+from hcloud_reassign.monitor.export import ColumnarWriter, read_columnar
+
+
+class TestColumnar:
+    """Test group for the columnar format of hcloud_reassign.monitor.export."""
+
+    def test_round_trip(self) -> None:
+        """Check that frames are written per series and read back unchanged."""
+        stream = BytesIO()
+        writer = ColumnarWriter(stream)
+        writer.write(
+            MetricsResult(
+                server="srv",
+                time_series={"cpu": {"values": [[1, "0.5"], [2, "nan"]]}, "disk.0.iops.read": {"values": []}},
+            )
+        )
+        stream.seek(0)
+
+        frames = list(read_columnar(stream))
+
+        assert [header["series"] for header, _, _ in frames] == ["cpu", "disk.0.iops.read"]
+        assert list(frames[0][1]) == [1.0, 2.0]
+        assert frames[0][2][0] == 0.5 and math.isnan(frames[0][2][1])
+        assert len(frames[1][1]) == 0
+
+    def test_bad_magic(self) -> None:
+        """Check that other streams are rejected."""
+        with pytest.raises(ValueError):
+            list(read_columnar(BytesIO(b"no metrics")))
@@ -7,3 +7,62 @@
 
 This module contains unit tests for the hcloud_reassign.monitor.metrics module.
 """
+
+from types import SimpleNamespace
+
+import pytest
+from hcloud_reassign.monitor.metrics import HCloudMetricsServer
+
+
+class TestHCloudMetricsServer:
+    """Test group for hcloud_reassign.monitor.metrics."""
+
+    mock_section = {
+        "type": "ip_floating",
+        "resource": "mock_floating_ip",
+        "source": "mock_server_a",
+        "destination": "mock_server_b",
+        "metrics": True,
+    }
+    mock_client = {"api_token": "1", "api_url": "http://mock_server"}
+
+    time_series = {
+        "cpu": {"values": [[1.0, "0.5"], [2.0, "0.7"]]},
+        "disk.0.iops.read": {"values": [[1.0, "10"]]},
+        "network.0.pps.in": {"values": [[1.0, "3"]]},
+    }
+
+    def mock_metrics(self, monkeypatch) -> tuple:
+        """Create a metrics object with a mocked API."""
+        metrics = HCloudMetricsServer(self.mock_section, self.mock_client)
+        requested = []
+
+        monkeypatch.setattr(metrics.hclient.servers, "get_by_name", lambda name: SimpleNamespace(id=1, name=name))
+
+        def get_metrics(server, type, start, end, step):
+            requested.append((server.name, type))
+            return SimpleNamespace(metrics=SimpleNamespace(time_series=self.time_series))
+
+        monkeypatch.setattr(metrics.hclient.servers, "get_metrics", get_metrics)
+        return metrics, requested
+
+    def test_get_source_and_dest(self, monkeypatch) -> None:
+        """Check that source and destination metrics query their own server."""
+        metrics, requested = self.mock_metrics(monkeypatch)
+
+        assert metrics.get_source("cpu", "now") == [self.time_series["cpu"]]
+        assert metrics.get_dest(["disk", "network"], "now") == [
+            self.time_series["disk.0.iops.read"],
+            self.time_series["network.0.pps.in"],
+        ]
+        assert [server for server, _ in requested] == ["mock_server_a", "mock_server_b"]
+
+    def test_columnar(self, monkeypatch) -> None:
+        """Check that columnar results contain float64 series."""
+        pytest.importorskip("numpy")
+        metrics, _ = self.mock_metrics(monkeypatch)
+
+        frame = metrics.get_dest("cpu", "now", columnar=True)
+
+        assert list(frame) == ["cpu"]
+        assert list(frame["cpu"].values) == [0.5, 0.7]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign Script columnar metrics unit tests.
+
+This module contains unit tests for the hcloud_reassign.monitor.series module.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hcloud_reassign.monitor.series import MetricsFrame, MetricsSeries  # noqa: E402
+
+
+class TestMetricsSeries:
+    """Test group for hcloud_reassign.monitor.series."""
+
+    pairs = [[float(t), str(t % 7)] for t in range(0, 100, 10)]
+
+    def test_from_pairs(self) -> None:
+        """Check that string values are parsed into float64 arrays."""
+        series = MetricsSeries.from_pairs("cpu", self.pairs)
+
+        assert series.timestamps.dtype == np.float64
+        assert series.values.dtype == np.float64
+        assert series.values[3] == 30 % 7
+        assert len(MetricsSeries.from_pairs("cpu", [])) == 0
+
+    def test_slicing_is_zero_copy(self) -> None:
+        """Check that slices share memory with the series."""
+        series = MetricsSeries.from_pairs("cpu", self.pairs)
+        window = series.between(20, 50)
+
+        assert list(window.timestamps) == [20, 30, 40]
+        assert np.shares_memory(window.values, series.values)
+        assert np.shares_memory(series[2:4].timestamps, series.timestamps)
+
+    def test_resample(self) -> None:
+        """Check aggregation into fixed steps."""
+        series = MetricsSeries("cpu", np.arange(0, 60, 10), np.array([1, 3, 5, np.nan, 2, 4]))
+
+        mean = series.resample(30)
+        assert list(mean.timestamps) == [0, 30]
+        assert list(mean.values) == [3, 3]
+        assert list(series.resample(30, how="max").values) == [5, 4]
+        assert list(series.resample(30, how="sum").values) == [9, 6]
+
+    def test_percentile_and_rolling(self) -> None:
+        """Check percentiles and rolling windows."""
+        series = MetricsSeries("cpu", np.arange(5), np.array([1, 2, 3, 4, 5]))
+
+        assert series.percentile(50) == 3
+        rolling = series.rolling(3)
+        assert list(rolling.timestamps) == [2, 3, 4]
+        assert list(rolling.values) == [2, 3, 4]
+        assert len(series.rolling(10)) == 0
+
+    def test_frame(self) -> None:
+        """Check parsing of an API time_series dictionary."""
+        frame = MetricsFrame.from_time_series({"cpu": {"values": self.pairs}, "disk.0.iops.read": {"values": []}})
+
+        assert set(frame) == {"cpu", "disk.0.iops.read"}
+        assert len(frame.between(0, 20)["cpu"]) == 2
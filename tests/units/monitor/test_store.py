@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign Script metrics store unit tests.
+
+This module contains unit tests for the hcloud_reassign.monitor.store module.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from hcloud_reassign.monitor.store import MetricsStore
+
+
+class TestMetricsStore:
+    """Test group for hcloud_reassign.monitor.store."""
+
+    server = SimpleNamespace(id=1, name="srv")
+
+    @staticmethod
+    def mock_hclient(lag: float = 0) -> SimpleNamespace:
+        """Create a client returning one sample per step and remembering requests.
+
+        Samples of the last `lag` seconds are not available yet.
+        """
+        requests = []
+
+        def get_metrics(server, type, start, end, step):
+            t0 = datetime.fromisoformat(start).timestamp()
+            t1 = datetime.fromisoformat(end).timestamp() - lag
+            requests.append((tuple(type), t0, t1 + lag))
+            samples = [[float(ts), str(ts)] for ts in range(int(t0), int(t1) + 1, int(step))]
+            series = {"cpu": {"values": samples}, "disk.0.iops.read": {"values": samples}}
+            return SimpleNamespace(
+                metrics=SimpleNamespace(time_series={k: series[k] for k in series if k.split(".")[0] in type})
+            )
+
+        return SimpleNamespace(servers=SimpleNamespace(get_metrics=get_metrics), requests=requests)
+
+    def test_incremental_fetch(self, tmp_path) -> None:
+        """Check that repeated queries only fetch the missing tail."""
+        store = MetricsStore(str(tmp_path / "metrics.sqlite"))
+        hclient = self.mock_hclient()
+
+        first = store.fetch(hclient, self.server, ["cpu"], start=1000, end=2000, step=10)
+        second = store.fetch(hclient, self.server, ["cpu"], start=1000, end=2060, step=10)
+        third = store.fetch(hclient, self.server, ["cpu"], start=1500, end=2000, step=10)
+
+        assert hclient.requests == [(("cpu",), 1000, 2000), (("cpu",), 1990, 2060)]
+        assert len(first["cpu"]["values"]) == 101
+        assert len(second["cpu"]["values"]) == 107
+        assert third["cpu"]["values"][0] == [1500.0, "1500"]
+
+    def test_lagging_api(self, tmp_path) -> None:
+        """Check that samples the API returns late are fetched by the next query."""
+        store = MetricsStore(str(tmp_path / "metrics.sqlite"))
+        hclient = self.mock_hclient(lag=30)
+
+        store.fetch(hclient, self.server, ["cpu"], start=0, end=100, step=10)
+        time_series = store.fetch(hclient, self.server, ["cpu"], start=0, end=160, step=10)
+
+        assert store.coverage(1, "cpu", 10) == (0, 130)
+        assert hclient.requests[1] == (("cpu",), 60, 160)
+        assert [ts for ts, _ in time_series["cpu"]["values"]] == [float(ts) for ts in range(0, 131, 10)]
+
+    def test_grouped_types_and_persistence(self, tmp_path) -> None:
+        """Check that types missing the same interval share one request and survive reopening."""
+        path = str(tmp_path / "metrics.sqlite")
+        hclient = self.mock_hclient()
+
+        MetricsStore(path).fetch(hclient, self.server, ["cpu", "disk"], start=0, end=100, step=10)
+        time_series = MetricsStore(path).fetch(hclient, self.server, ["cpu", "disk"], start=0, end=100, step=10)
+
+        assert hclient.requests == [(("cpu", "disk"), 0, 100)]
+        assert set(time_series) == {"cpu", "disk.0.iops.read"}
+
+    def test_prune(self) -> None:
+        """Check that old samples are removed."""
+        store = MetricsStore(":memory:")
+        store.fetch(self.mock_hclient(), self.server, ["cpu"], start=0, end=100, step=10)
+
+        store.prune(before=50)
+
+        assert store.coverage(1, "cpu", 10) == (50, 100)
+        assert store.read(1, "cpu", 10, 0, 100)["cpu"]["values"][0][0] == 50
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign Script watch unit tests.
+
+This module contains unit tests for the hcloud_reassign.monitor.watch module.
+"""
+
+from threading import Event
+from types import SimpleNamespace
+
+import pytest
+
+from hcloud_reassign.core.base import HcloudReassignIni
+from hcloud_reassign.monitor.watch import PollScheduler, Rule, Watcher, parse_rules
+from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+from hcloud_reassign.utils import constants
+
+
+class TestRule:
+    """Test group for watch rules."""
+
+    def test_parse(self) -> None:
+        """Check that thresholds, rates and sample counts are parsed."""
+        rules = parse_rules("cpu > 95 for 3; network.0.bandwidth.in rate < -1000")
+
+        assert rules == [
+            Rule(series="cpu", operator=">", limit=95.0, samples=3),
+            Rule(series="network.0.bandwidth.in", operator="<", limit=-1000.0, rate=True),
+        ]
+        assert rules[1].metrics_type == "network"
+        assert Rule.parse(str(rules[0])) == rules[0]
+
+    @pytest.mark.parametrize("text", ["cpu 95", "cpu => 95", "cpu > high", "cpu > 95 for 0"])
+    def test_parse_invalid(self, text: str) -> None:
+        """Check that malformed rules raise ValueError."""
+        with pytest.raises(ValueError):
+            Rule.parse(text)
+
+    def test_breached(self) -> None:
+        """Check that all of the last samples must breach, missing samples are skipped."""
+        series = {"cpu": {"values": [[0, "10"], [60, "97"], [120, "NaN"], [180, "99"]]}}
+
+        assert Rule.parse("cpu > 95 for 2").breached(series)
+        assert not Rule.parse("cpu > 95 for 3").breached(series)
+        assert not Rule.parse("cpu > 95 for 5").breached(series)
+        assert Rule.parse("cpu rate > 0.01 for 1").breached(series)
+        assert not Rule.parse("cpu rate > 0.1 for 2").breached(series)
+        assert not Rule.parse("disk.0.iops.read > 1").breached(series)
+
+
+class TestPollScheduler:
+    """Test group for the poll scheduler."""
+
+    def test_staggered_batches(self) -> None:
+        """Check that batches are spread over the interval and rescheduled."""
+        scheduler = PollScheduler([f"srv{i}" for i in range(6)], interval=30, batch_size=2, start=0)
+
+        assert scheduler.due(0) == ["srv0", "srv1"]
+        assert scheduler.due(9) == []
+        assert scheduler.due(10) == ["srv2", "srv3"]
+        assert scheduler.next_due() == 20
+        assert scheduler.due(30) == ["srv4", "srv5", "srv0", "srv1"]
+
+    def test_missed_rounds_are_skipped(self) -> None:
+        """Check that a late poll does not burst through missed rounds."""
+        scheduler = PollScheduler(["srv"], interval=10, start=0)
+
+        assert scheduler.due(95) == ["srv"]
+        assert scheduler.due(99) == []
+        assert scheduler.next_due() == 100
+
+    def test_min_interval(self) -> None:
+        """Check that 200 servers polled with half of 3600 requests per hour need 400 seconds."""
+        assert PollScheduler.min_interval(200) == 400
+
+
+class TestWatcher:
+    """Test group for hcloud_reassign.monitor.watch.Watcher."""
+
+    @staticmethod
+    def mock_config(write_config, watch: str = "cpu > 99") -> HcloudReassignIni:
+        """Write a configuration file with a default rule, an own rule and a section on another source."""
+        sections = {
+            "floating.a": {"resource": "flip-a"},
+            "floating.b": {"resource": "flip-b", "watch": watch},
+            "floating.c": {"resource": "flip-c", "source": "srv-c"},
+        }
+        return HcloudReassignIni(path=write_config(sections=sections, watch="cpu > 90 for 2"))
+
+    def test_check_reassigns_once(self, write_config, monkeypatch) -> None:
+        """Check that breached sections are reassigned once until their source recovers."""
+        cpu = {"srv-a": ["95", "95"], "srv-c": ["10", "10"]}
+        servers = [SimpleNamespace(id=i, name=name) for i, name in enumerate(cpu)]
+
+        def get_metrics(server, type, start, end, step):
+            values = [[i * 60, value] for i, value in enumerate(cpu[server.name])]
+            return SimpleNamespace(metrics=SimpleNamespace(time_series={"cpu": {"values": values}}))
+
+        hclient = SimpleNamespace(servers=SimpleNamespace(get_all=lambda: servers, get_metrics=get_metrics))
+        reassigned = []
+        monkeypatch.setattr(
+            HCloudFloatingIPSection,
+            "reassign",
+            lambda self, direction: reassigned.append((self.resource, direction)) or constants.STATUS_SUCCESS,
+        )
+        watcher = Watcher(self.mock_config(write_config), hclient=hclient, interval=3600)
+
+        assert watcher.sources == {"srv-a": ["floating.a", "floating.b"], "srv-c": ["floating.c"]}
+        assert watcher.rules["floating.b"] == [Rule.parse("cpu > 99")]
+
+        events = [*watcher.check(watcher.sources), *watcher.finish()]
+        assert [(event.section, event.server, event.status) for event in events] == [("floating.a", "srv-a", 0)]
+        assert reassigned == [("flip-a", "dest")]
+
+        assert list(watcher.check(["srv-a"])) == []
+
+        cpu["srv-a"] = ["95", "10"]
+        assert list(watcher.check(["srv-a"])) == []
+        cpu["srv-a"] = ["95", "95"]
+        assert len([*watcher.check(["srv-a"]), *watcher.finish()]) == 1
+
+    def test_check_continues_during_reassign(self, write_config, monkeypatch) -> None:
+        """Check that polls go on while a reassignment runs and its event follows once it completes."""
+        cpu = {"srv-a": ["95", "95"], "srv-c": ["10", "10"]}
+        servers = [SimpleNamespace(id=i, name=name) for i, name in enumerate(cpu)]
+        polled = []
+
+        def get_metrics(server, type, start, end, step):
+            polled.append(server.name)
+            values = [[i * 60, value] for i, value in enumerate(cpu[server.name])]
+            return SimpleNamespace(metrics=SimpleNamespace(time_series={"cpu": {"values": values}}))
+
+        hclient = SimpleNamespace(servers=SimpleNamespace(get_all=lambda: servers, get_metrics=get_metrics))
+        release = Event()
+        monkeypatch.setattr(
+            HCloudFloatingIPSection,
+            "reassign",
+            lambda self, direction: release.wait(5) and constants.STATUS_SUCCESS,
+        )
+        watcher = Watcher(self.mock_config(write_config), hclient=hclient, interval=3600)
+
+        assert list(watcher.check(["srv-a"])) == []
+        assert list(watcher.check(["srv-c"])) == []
+        assert polled == ["srv-a", "srv-c"]
+        assert len(watcher.pending) == 1
+
+        release.set()
+        events = list(watcher.finish())
+        assert [(event.section, event.server, event.status) for event in events] == [("floating.a", "srv-a", 0)]
+        assert not watcher.pending
+
+    def test_invalid_section_rule(self, write_config) -> None:
+        """Check that an invalid watch option names its section."""
+        with pytest.raises(ValueError, match="Section 'floating.b'"):
+            Watcher(self.mock_config(write_config, watch="cpu >> 99"), hclient=SimpleNamespace())
+
+    def test_check_resolves_again(self, write_config) -> None:
+        """Check that servers are resolved again once a watched server is not found."""
+        servers = [SimpleNamespace(id=1, name="srv-c")]
+        listed = []
+
+        def get_all():
+            listed.append(len(servers))
+            return list(servers)
+
+        def get_metrics(server, type, start, end, step):
+            return SimpleNamespace(metrics=SimpleNamespace(time_series={"cpu": {"values": [[0, "10"], [60, "10"]]}}))
+
+        hclient = SimpleNamespace(servers=SimpleNamespace(get_all=get_all, get_metrics=get_metrics))
+        watcher = Watcher(self.mock_config(write_config), hclient=hclient, interval=3600)
+
+        assert list(watcher.check(["srv-a"])) == []
+        assert watcher.resolved is None
+
+        servers.append(SimpleNamespace(id=2, name="srv-a"))
+        assert list(watcher.check(["srv-a"])) == []
+        assert listed == [1, 2]
+        assert "srv-a" in watcher.resolved
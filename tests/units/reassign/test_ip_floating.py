@@ -8,7 +8,11 @@
 This module contains unit tests for hcloud_reassign.reassign.ip_floating.
 """
 
+from types import SimpleNamespace
+
 import pytest
+from hcloud_reassign.core import telemetry
+from hcloud_reassign.core.base import HcloudAPIException
 from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
 
 
@@ -30,12 +34,140 @@ class TestHCloudFloatingIPSection:
     # Initialize the mock floating ip
     MockFloatingIP = HCloudFloatingIPSection(mock_section, mock_client)
 
-    def test_reassign_server(self) -> None:
-        """Test the reassign server method."""
-        print("test")
+    def test_reassign_server(self, monkeypatch) -> None:
+        """Test that the floating IP is assigned to the named server and the action is checked."""
+        section = HCloudFloatingIPSection(self.mock_section, self.mock_client)
+        assigned = []
+
+        def assign(floating_ip, server):
+            assigned.append((floating_ip.name, server.name))
+            return SimpleNamespace(id=1, status="running")
+
+        monkeypatch.setattr(section.hclient.servers, "get_by_name", lambda name: SimpleNamespace(id=2, name=name))
+        monkeypatch.setattr(section.hclient.floating_ips, "get_by_name", lambda name: SimpleNamespace(id=3, name=name))
+        monkeypatch.setattr(section.hclient.floating_ips, "assign", assign)
+        monkeypatch.setattr(section, "__check_action_status__", lambda response: section.status_timeout)
+
+        assert section.reassign_server(dest="mock_server_a") == section.status_timeout
+        assert assigned == [("mock_floating_ip", "mock_server_a")]
 
     def test_reassign_raise(self) -> None:
         """Check that invalid inputs to description raise ValueError."""
         with pytest.raises(ValueError):
             # %TODO: We need a mockup configuration
             self.MockFloatingIP.reassign(direction="invalid")
+
+    @pytest.mark.parametrize("destination", ["", " , ,"])
+    def test_empty_destination(self, destination: str) -> None:
+        """Test that a destination without server names raises KeyError."""
+        with pytest.raises(KeyError, match="destination"):
+            HCloudFloatingIPSection({**self.mock_section, "destination": destination}, self.mock_client)
+
+    def test_reassign_server_stale_prefetch(self, monkeypatch) -> None:
+        """Check that a not found error on assign resolves the resources again."""
+        section = HCloudFloatingIPSection(self.mock_section, self.mock_client)
+        lookups = []
+        assigned = []
+
+        def get_by_name(name):
+            lookups.append(name)
+            return SimpleNamespace(id=len(lookups), name=name)
+
+        def assign(floating_ip, server):
+            if floating_ip.id == 1:
+                raise HcloudAPIException(code="not_found", message="not found", details=None)
+            assigned.append((floating_ip.name, server.name))
+            return SimpleNamespace(id=1, status="success")
+
+        monkeypatch.setattr(section.hclient.servers, "get_by_name", get_by_name)
+        monkeypatch.setattr(section.hclient.floating_ips, "get_by_name", get_by_name)
+        monkeypatch.setattr(section.hclient.floating_ips, "assign", assign)
+        monkeypatch.setattr(section, "__check_action_status__", lambda response: section.status_success)
+
+        section.resolved[("floating_ips", "mock_floating_ip")] = SimpleNamespace(id=1, name="mock_floating_ip")
+        retries = telemetry.retries.value(reason="not_found")
+        resolves = telemetry.phase_seconds.count(type="ip_floating", phase="resolve")
+
+        assert section.reassign(direction="dest") == section.status_success
+        assert assigned == [("mock_floating_ip", "mock_server_b")]
+        assert telemetry.retries.value(reason="not_found") == retries + 1
+        assert telemetry.phase_seconds.count(type="ip_floating", phase="resolve") == resolves + 2
+
+    @staticmethod
+    def mock_candidates(section: HCloudFloatingIPSection, monkeypatch, on: int | None = None) -> list:
+        """Let the section see three candidate servers, one stopped, and floating IPs spread over them."""
+        servers = {
+            "mock_server_a": SimpleNamespace(id=1, name="mock_server_a", status="off"),
+            "mock_server_b": SimpleNamespace(id=2, name="mock_server_b", status="running"),
+            "mock_server_c": SimpleNamespace(id=3, name="mock_server_c", status="running"),
+            "mock_server_d": SimpleNamespace(id=4, name="mock_server_d", status="off"),
+        }
+        flips = [
+            SimpleNamespace(name="other_1", server=servers["mock_server_b"]),
+            SimpleNamespace(name="mock_floating_ip", server=servers["mock_server_c"] if on == 3 else None),
+        ]
+        assigned = []
+
+        def assign(floating_ip, server):
+            assigned.append(server.name)
+            return SimpleNamespace(id=1, status="success")
+
+        monkeypatch.setattr(section.hclient.servers, "get_by_name", servers.get)
+        monkeypatch.setattr(section.hclient.floating_ips, "get_by_name", lambda name: flips[1])
+        monkeypatch.setattr(section.hclient.floating_ips, "get_all", lambda: flips)
+        monkeypatch.setattr(section.hclient.floating_ips, "assign", assign)
+        monkeypatch.setattr(section, "__check_action_status__", lambda response: section.status_success)
+
+        return assigned
+
+    def test_select_least_loaded_destination(self, monkeypatch) -> None:
+        """Check that the healthy candidate with the fewest floating IPs is chosen."""
+        section = HCloudFloatingIPSection(
+            {**self.mock_section, "destination": "mock_server_b, mock_server_c, mock_server_d"}, self.mock_client
+        )
+        assigned = self.mock_candidates(section, monkeypatch)
+
+        assert section.destinations == ["mock_server_b", "mock_server_c", "mock_server_d"]
+        assert [candidate.healthy for candidate in section.candidates()] == [True, True, False]
+        assert section.select_destination() == "mock_server_c"
+        assert section.plan(direction="dest").desired == "mock_server_c"
+        assert section.reassign(direction="dest") == section.status_success
+        assert assigned == ["mock_server_c"]
+
+    def test_keep_current_candidate(self, monkeypatch) -> None:
+        """Check that a floating IP already on a healthy candidate stays there."""
+        section = HCloudFloatingIPSection(
+            {**self.mock_section, "destination": "mock_server_b,mock_server_c"}, self.mock_client
+        )
+        self.mock_candidates(section, monkeypatch, on=3)
+        monkeypatch.setattr(section, "select_destination", lambda: "mock_server_b")
+
+        assert not section.plan(direction="dest").changed
+
+    def test_no_healthy_destination(self, monkeypatch) -> None:
+        """Check that reassigning fails if no candidate is running."""
+        section = HCloudFloatingIPSection(
+            {**self.mock_section, "destination": "mock_server_a,mock_server_d"}, self.mock_client
+        )
+        assigned = self.mock_candidates(section, monkeypatch)
+        section.source = "mock_server_x"
+
+        assert section.reassign(direction="dest") == section.status_error
+        assert assigned == []
+
+    def test_select_by_metrics(self, monkeypatch) -> None:
+        """Check that recent CPU and network usage outweigh the floating IP count when metrics are enabled."""
+        section = HCloudFloatingIPSection(
+            {**self.mock_section, "destination": "mock_server_b,mock_server_c", "metrics": True}, self.mock_client
+        )
+        self.mock_candidates(section, monkeypatch)
+        load = {2: ("1", "10"), 3: ("90", "100")}
+
+        def get_metrics(server, type, start, end, step):
+            cpu, network = load[server.id]
+            series = {"cpu": {"values": [[0, cpu]]}, "network.0.bandwidth.in": {"values": [[0, network]]}}
+            return SimpleNamespace(metrics=SimpleNamespace(time_series=series))
+
+        monkeypatch.setattr(section.hclient.servers, "get_metrics", get_metrics)
+
+        assert section.select_destination() == "mock_server_b"
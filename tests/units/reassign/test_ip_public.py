@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Test primary ip reassignments.
+
+This module contains unit tests for hcloud_reassign.reassign.ip_public.
+"""
+
+from time import sleep
+from types import SimpleNamespace
+
+import pytest
+from hcloud_reassign.core import deadline
+from hcloud_reassign.core.base import HcloudAPIException
+from hcloud_reassign.reassign.ip_public import HCloudPrimaryIPSection
+
+
+class TestHCloudPrimaryIPSection:
+    """Test group for hcloud_reassign.reassign.ip_public."""
+
+    mock_section = {
+        "type": "ip_public",
+        "resource": "mock_ipv4, mock_ipv6",
+        "source": "mock_server_a",
+        "destination": "mock_server_b",
+    }
+
+    mock_client = {"api_token": "1", "api_url": "http://mock_server"}
+
+    def make_section(
+        self,
+        monkeypatch,
+        assignees: dict,
+        failing: tuple = (),
+        failing_assign: tuple = (),
+        raising: tuple = (),
+        status: str = "off",
+    ) -> tuple[HCloudPrimaryIPSection, list]:
+        """Create a section with mocked servers a (1) and b (2) and record calls and action waits.
+
+        Actions of primary IPs in failing always fail, in failing_assign their first assign fails. Unassigns of
+        primary IPs in raising are rejected.
+        """
+        section = HCloudPrimaryIPSection(self.mock_section, self.mock_client)
+        servers = {"mock_server_a": 1, "mock_server_b": 2}
+        calls = []
+        failed = []
+
+        def unassign(primary_ip):
+            calls.append(("unassign", primary_ip.name))
+            if primary_ip.name in raising:
+                raise HcloudAPIException(code="server_not_stopped", message="server must be stopped", details=None)
+            return SimpleNamespace(id=len(calls), name=primary_ip.name, step="unassign")
+
+        def assign(primary_ip, assignee_id):
+            calls.append(("assign", primary_ip.name, assignee_id))
+            return SimpleNamespace(id=len(calls), name=primary_ip.name, step="assign")
+
+        def fails(response) -> bool:
+            if response.name in failing:
+                return True
+            if response.step == "assign" and response.name in failing_assign and response.name not in failed:
+                failed.append(response.name)
+                return True
+            return False
+
+        def wait(responses):
+            calls.append(("wait", len(responses)))
+            return {
+                response.id: section.status_error if fails(response) else section.status_success
+                for response in responses
+            }
+
+        monkeypatch.setattr(
+            section.hclient.servers,
+            "get_by_name",
+            lambda name: SimpleNamespace(id=servers[name], name=name, status=status),
+        )
+        monkeypatch.setattr(
+            section.hclient.primary_ips,
+            "get_by_name",
+            lambda name: SimpleNamespace(id=10, name=name, assignee_id=assignees[name]),
+        )
+        monkeypatch.setattr(section.hclient.primary_ips, "unassign", unassign)
+        monkeypatch.setattr(section.hclient.primary_ips, "assign", assign)
+        monkeypatch.setattr(section, "__check_actions_status__", wait)
+        return section, calls
+
+    def test_resources(self) -> None:
+        """Check that several primary IPs are split on commas."""
+        section = HCloudPrimaryIPSection(self.mock_section, self.mock_client)
+
+        assert section.resources == ["mock_ipv4", "mock_ipv6"]
+
+    def test_reassign_batched(self, monkeypatch) -> None:
+        """Check that all unassigns are waited for together before all assigns."""
+        section, calls = self.make_section(monkeypatch, {"mock_ipv4": 1, "mock_ipv6": 1})
+
+        assert section.reassign(direction="dest") == section.status_success
+        assert calls == [
+            ("unassign", "mock_ipv4"),
+            ("unassign", "mock_ipv6"),
+            ("wait", 2),
+            ("assign", "mock_ipv4", 2),
+            ("assign", "mock_ipv6", 2),
+            ("wait", 2),
+        ]
+        assert set(section.timings["mock_ipv4"]) == {"unassign", "assign"}
+
+    def test_reassign_partial(self, monkeypatch) -> None:
+        """Check that addresses on the destination are kept and unassigned ones only assigned."""
+        section, calls = self.make_section(monkeypatch, {"mock_ipv4": 2, "mock_ipv6": None})
+
+        assert section.reassign(direction="dest") == section.status_success
+        assert calls == [("assign", "mock_ipv6", 2), ("wait", 1)]
+
+    def test_failed_unassign(self, monkeypatch) -> None:
+        """Check that an address is not assigned if its unassign failed."""
+        section, calls = self.make_section(monkeypatch, {"mock_ipv4": 1, "mock_ipv6": 1}, failing=("mock_ipv4",))
+
+        assert section.reassign(direction="dest") == section.status_error
+        assert ("assign", "mock_ipv4", 2) not in calls
+        assert ("assign", "mock_ipv6", 2) in calls
+
+    def test_raising_unassign(self, monkeypatch) -> None:
+        """Check that a rejected unassign is an error of its address only."""
+        section, calls = self.make_section(monkeypatch, {"mock_ipv4": 1, "mock_ipv6": 1}, raising=("mock_ipv4",))
+
+        assert section.reassign(direction="dest") == section.status_error
+        assert ("assign", "mock_ipv4", 2) not in calls
+        assert ("assign", "mock_ipv6", 2) in calls
+
+    def test_failed_assign(self, monkeypatch) -> None:
+        """Check that an address whose assign failed is assigned back to its previous server."""
+        section, calls = self.make_section(
+            monkeypatch, {"mock_ipv4": 1, "mock_ipv6": None}, failing_assign=("mock_ipv4", "mock_ipv6")
+        )
+
+        assert section.reassign(direction="dest") == section.status_error
+        assert calls[-2:] == [("assign", "mock_ipv4", 1), ("wait", 1)]
+        assert set(section.timings["mock_ipv4"]) == {"unassign", "assign", "restore"}
+
+    def test_deadline_between_steps(self, monkeypatch) -> None:
+        """Check that addresses are restored if the deadline passes after they were unassigned."""
+        section, calls = self.make_section(monkeypatch, {"mock_ipv4": 1, "mock_ipv6": 1})
+        wait = section.__check_actions_status__
+        assign = section.hclient.primary_ips.assign
+
+        def slow_wait(responses):
+            # The unassign actions take longer than the whole deadline
+            if ("wait", 2) not in calls:
+                sleep(0.2)
+            return wait(responses)
+
+        def bound_assign(primary_ip, assignee_id):
+            # An installed client sends no request once the deadline passed
+            if deadline.current() is not None and deadline.current().expired:
+                calls.append(("expired", primary_ip.name))
+                raise deadline.DeadlineExceeded("deadline passed")
+            return assign(primary_ip, assignee_id)
+
+        monkeypatch.setattr(section, "__check_actions_status__", slow_wait)
+        monkeypatch.setattr(section.hclient.primary_ips, "assign", bound_assign)
+
+        assert section.reassign_within(direction="dest", seconds=0.1) == section.status_timeout
+        assert calls[3:] == [
+            ("expired", "mock_ipv4"),
+            ("assign", "mock_ipv4", 1),
+            ("assign", "mock_ipv6", 1),
+            ("wait", 2),
+        ]
+
+    def test_running_server(self, monkeypatch) -> None:
+        """Check that nothing is unassigned while a server is running."""
+        section, calls = self.make_section(monkeypatch, {"mock_ipv4": 1, "mock_ipv6": 1}, status="running")
+
+        assert section.reassign(direction="dest") == section.status_error
+        assert calls == []
+
+    def test_plan(self, monkeypatch) -> None:
+        """Check that the plan counts unassigns and assigns."""
+        section, _ = self.make_section(monkeypatch, {"mock_ipv4": 1, "mock_ipv6": None})
+
+        item = section.plan(direction="dest")
+
+        assert item.current == "2 of 2 IPs elsewhere"
+        assert item.action_calls == 3
+
+    def test_reassign_raise(self) -> None:
+        """Check that invalid directions raise ValueError."""
+        with pytest.raises(ValueError):
+            HCloudPrimaryIPSection(self.mock_section, self.mock_client).reassign(direction="invalid")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Test route reassignments.
+
+This module contains unit tests for hcloud_reassign.reassign.routes.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from hcloud_reassign.core import telemetry
+from hcloud_reassign.core.base import HcloudAPIException
+from hcloud_reassign.reassign.routes import HCloudRoutesSection, diff_routes
+
+
+def route(destination: str, gateway: str) -> SimpleNamespace:
+    """Create a route object."""
+    return SimpleNamespace(destination=destination, gateway=gateway)
+
+
+class TestDiffRoutes:
+    """Test group for hcloud_reassign.reassign.routes.diff_routes."""
+
+    def test_unchanged(self) -> None:
+        """Check that routes on the desired gateway are kept, whatever their notation."""
+        assert diff_routes([route("10.1.0.0/24", "10.0.0.3")], ["10.1.0.1/24"], "10.0.0.3") == ([], [])
+
+    def test_changed_and_missing(self) -> None:
+        """Check that routes elsewhere are replaced and missing routes added."""
+        routes = [route("10.1.0.0/24", "10.0.0.2"), route("10.9.0.0/24", "10.0.0.2")]
+
+        deletes, adds = diff_routes(routes, ["10.1.0.0/24", "10.2.0.0/24"], "10.0.0.3")
+
+        assert deletes == [("10.1.0.0/24", "10.0.0.2")]
+        assert adds == [("10.1.0.0/24", "10.0.0.3"), ("10.2.0.0/24", "10.0.0.3")]
+
+
+class TestHCloudRoutesSection:
+    """Test group for hcloud_reassign.reassign.routes.HCloudRoutesSection."""
+
+    mock_section = {
+        "type": "routes",
+        "resource": "mock_network",
+        "source": "mock_server_a",
+        "destination": "10.0.0.3",
+        "routes": "10.1.0.0/24,10.2.0.0/24",
+    }
+
+    mock_client = {"api_token": "1", "api_url": "http://mock_server"}
+
+    def make_section(self, monkeypatch, routes: list) -> tuple[HCloudRoutesSection, list]:
+        """Create a section on a mocked network with server a at 10.0.0.2 and record route changes."""
+        section = HCloudRoutesSection(self.mock_section, self.mock_client)
+        network = SimpleNamespace(id=7, name="mock_network", routes=routes)
+        server = SimpleNamespace(
+            id=2, name="mock_server_a", private_net=[SimpleNamespace(network=SimpleNamespace(id=7), ip="10.0.0.2")]
+        )
+        calls = []
+
+        def change(command):
+            def call(network, route):
+                calls.append((command, route.destination, route.gateway))
+                return SimpleNamespace(id=len(calls), status="running")
+
+            return call
+
+        monkeypatch.setattr(section.hclient.networks, "get_by_name", lambda name: network)
+        monkeypatch.setattr(section.hclient.servers, "get_by_name", lambda name: server)
+        monkeypatch.setattr(section.hclient.networks, "delete_route", change("delete"))
+        monkeypatch.setattr(section.hclient.networks, "add_route", change("add"))
+        monkeypatch.setattr(
+            section,
+            "__check_actions_status__",
+            lambda responses: {response.id: section.status_success for response in responses},
+        )
+        return section, calls
+
+    def test_invalid_route(self) -> None:
+        """Check that invalid destinations are rejected."""
+        with pytest.raises(ValueError):
+            HCloudRoutesSection({**self.mock_section, "routes": "10.1.0.0/24,nowhere"}, self.mock_client)
+
+    def test_prefetch_resources(self) -> None:
+        """Check that gateways given as IP addresses are not looked up."""
+        section = HCloudRoutesSection(self.mock_section, self.mock_client)
+
+        assert section.prefetch_resources() == [("networks", "mock_network"), ("servers", "mock_server_a")]
+
+    def test_reassign_deletes_before_adds(self, monkeypatch) -> None:
+        """Check that replaced routes are deleted before any route is added."""
+        section, calls = self.make_section(monkeypatch, [route("10.1.0.0/24", "10.0.0.3")])
+
+        assert section.reassign(direction="src") == section.status_success
+        assert calls == [
+            ("delete", "10.1.0.0/24", "10.0.0.3"),
+            ("add", "10.1.0.0/24", "10.0.0.2"),
+            ("add", "10.2.0.0/24", "10.0.0.2"),
+        ]
+
+    def test_plan(self, monkeypatch) -> None:
+        """Check that the plan counts one call per route change."""
+        section, _ = self.make_section(monkeypatch, [route("10.1.0.0/24", "10.0.0.3")])
+
+        item = section.plan(direction="dest")
+
+        assert item.changed
+        assert item.action_calls == 1
+        assert section.plan(direction="src").action_calls == 3
+
+    def test_locked_retry(self, monkeypatch) -> None:
+        """Check that a locked network is retried with backoff."""
+        section, calls = self.make_section(monkeypatch, [])
+        add_route = section.hclient.networks.add_route
+        locked = [HcloudAPIException(code="locked", message="locked", details=None)]
+
+        def flaky(network, route):
+            if locked:
+                raise locked.pop()
+            return add_route(network=network, route=route)
+
+        monkeypatch.setattr(section.hclient.networks, "add_route", flaky)
+        monkeypatch.setattr("hcloud_reassign.reassign.routes.sleep", lambda seconds: None)
+        retries = telemetry.retries.value(reason="locked")
+
+        assert section.reassign(direction="dest") == section.status_success
+        assert len(calls) == 2
+        assert telemetry.retries.value(reason="locked") == retries + 1
+
+    def test_unknown_gateway(self, monkeypatch) -> None:
+        """Check that a server outside the network is an error."""
+        section, calls = self.make_section(monkeypatch, [])
+        monkeypatch.setattr(section.hclient.servers, "get_by_name", lambda name: None)
+
+        assert section.reassign(direction="src") == section.status_error
+        assert calls == []
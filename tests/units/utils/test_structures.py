@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2025, Christian Siegel <molybdaen@mr42.org>
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Hcloud Reassign Script utility unit tests for structures.
+
+This module contains unit tests for hcloud_reassign.utils.structures
+"""
+
+from collections import OrderedDict
+
+import pytest
+from hcloud_reassign.utils.structures import SectionRegistry, hcloud_functions
+
+
+class TestStructures:
+    """Test group for hcloud_reassign.utils.structures."""
+
+    def test_builtin_section_types(self) -> None:
+        """Check that builtin section types resolve to their classes."""
+        from hcloud_reassign.reassign.ip_floating import HCloudFloatingIPSection
+
+        assert hcloud_functions["ip_floating"] is HCloudFloatingIPSection
+        assert "ip_floating" in hcloud_functions
+
+    def test_lazy_import(self) -> None:
+        """Check that classes are imported on first use only."""
+        registry = SectionRegistry({"ordered": "collections:OrderedDict", "broken": "no_such_module:Class"})
+
+        assert registry["ordered"] is OrderedDict
+        with pytest.raises(ImportError):
+            registry["broken"]
+        with pytest.raises(KeyError):
+            registry["unknown"]
+
+    def test_register(self) -> None:
+        """Check that classes can be registered directly."""
+        registry = SectionRegistry({})
+        registry.register("ordered", OrderedDict)
+
+        assert registry["ordered"] is OrderedDict
+        assert registry.targets["ordered"] == "collections:OrderedDict"